@@ -0,0 +1,209 @@
+import re
+
+from instrumentation import timed
+
+# 알라딘 검색/상세 페이지 빠른 파싱
+# - lxml(C 파서)이 설치돼 있으면 사용, 없으면 html.parser
+# - 필요한 노드(제목/저자줄/형태사항, 검색결과 박스)의 HTML 조각만 잘라내 파싱
+#   (조각을 못 찾으면 SoupStrainer로 해당 노드만 트리로 구성)
+# - 정규식은 모듈 로드 시 한 번만 컴파일
+
+_PAGE_SUFFIX_RE = re.compile(r"(쪽|p)\s*$")
+_DIGITS_RE = re.compile(r"\d+")
+_SIZE_RE = re.compile(r"(\d+)\s*[\*x×X]\s*(\d+)")
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_ROLE_RE = re.compile(r"^(.*?)\s*\(([^()]*)\)$")
+
+# 알라딘 API 저자 표기 "이름 (역할)"의 역할 → 상세페이지 표기
+ROLE_NAMES = {"지은이": "지음", "옮긴이": "옮김", "엮은이": "엮음"}
+
+_DETAIL_CLASSES = ["Ere_bo_title", "Ere_sub2_title", "conts_info_list1"]
+_SEARCH_CLASSES = ["ss_book_box"]
+
+_parser_name = None
+
+
+def _get_parser_name():
+    global _parser_name
+    if _parser_name is None:
+        try:
+            import lxml  # noqa: F401
+            _parser_name = "lxml"
+        except ImportError:
+            _parser_name = "html.parser"
+    return _parser_name
+
+
+_element_start_patterns = {}
+_tag_patterns = {}
+
+
+def _element_start_re(class_name):
+    pattern = _element_start_patterns.get(class_name)
+    if pattern is None:
+        pattern = _element_start_patterns[class_name] = re.compile(
+            r"<([a-zA-Z][a-zA-Z0-9]*)\b[^>]*\bclass=[\"'][^\"']*\b" + re.escape(class_name) + r"\b"
+        )
+    return pattern
+
+
+# 🔹 class 이름으로 첫 번째 요소의 HTML 조각만 잘라냄 (같은 태그 중첩까지 고려)
+def extract_element(html, class_name):
+    start_match = _element_start_re(class_name).search(html)
+    if not start_match:
+        return None
+
+    tag = start_match.group(1).lower()
+    tag_re = _tag_patterns.get(tag)
+    if tag_re is None:
+        tag_re = _tag_patterns[tag] = re.compile(r"<(/?)" + tag + r"\b", re.IGNORECASE)
+
+    depth = 0
+    for match in tag_re.finditer(html, start_match.start()):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            end = html.find(">", match.end())
+            return html[start_match.start():end + 1 if end != -1 else len(html)]
+    return html[start_match.start():]
+
+
+def make_soup(html, classes=None):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    if classes:
+        snippets = [extract_element(html, class_name) for class_name in classes]
+        if all(snippets):
+            return BeautifulSoup("".join(snippets), _get_parser_name())
+
+    parse_only = SoupStrainer(class_=classes) if classes else None
+    return BeautifulSoup(html, _get_parser_name(), parse_only=parse_only)
+
+
+# 🔹 검색 결과 페이지 → 첫 번째 도서 상세페이지 링크
+def find_detail_link(html):
+    soup = make_soup(html, _SEARCH_CLASSES)
+    link_tag = soup.select_one("div.ss_book_box a.bo3")
+    if not link_tag or not link_tag.get("href"):
+        return None
+    return link_tag["href"]
+
+
+# 🔹 형태사항 영역 → (쪽수, 가로mm, 세로mm), 없는 값은 0
+def parse_physical_items(form_wrap):
+    pages = width = height = 0
+    if not form_wrap:
+        return pages, width, height
+
+    for item in form_wrap.stripped_strings:
+        if _PAGE_SUFFIX_RE.search(item):
+            page_match = _DIGITS_RE.search(item)
+            if page_match:
+                pages = int(page_match.group())
+        elif "mm" in item:
+            size_match = _SIZE_RE.search(item)
+            if size_match:
+                width = int(size_match.group(1))
+                height = int(size_match.group(2))
+    return pages, width, height
+
+
+# 🔹 상세페이지 → 형태사항만
+@timed("parse")
+def parse_detail_physical(html):
+    soup = make_soup(html, ["conts_info_list1"])
+    return parse_physical_items(soup.select_one("div.conts_info_list1"))
+
+
+# 🔹 상세페이지 → 제목 / 저자 목록 / 출판사 / 발행연도 / 형태사항
+@timed("parse")
+def parse_detail_page(html):
+    soup = make_soup(html, _DETAIL_CLASSES)
+
+    title_tag = soup.select_one("span.Ere_bo_title")
+    title = title_tag.text.strip() if title_tag else ""
+
+    li_tag = soup.select_one("li.Ere_sub2_title")
+    author_list = []
+    publisher = ""
+    pubyear = ""
+
+    if li_tag:
+        children = li_tag.contents
+        last_a_before_date = None
+
+        for i, node in enumerate(children):
+            if getattr(node, "name", None) == "a":
+                name = node.text.strip()
+                next_text = children[i+1].strip() if i+1 < len(children) and isinstance(children[i+1], str) else ""
+                if "지은이" in next_text:
+                    author_list.append(f"{name} 지음")
+                elif "옮긴이" in next_text:
+                    author_list.append(f"{name} 옮김")
+                else:
+                    last_a_before_date = name
+            elif isinstance(node, str):
+                date_match = _DATE_RE.search(node)
+                if date_match:
+                    pubyear = date_match.group().split("-")[0]
+                    if last_a_before_date:
+                        publisher = last_a_before_date
+
+    pages, width, height = parse_physical_items(soup.select_one("div.conts_info_list1"))
+
+    return {
+        "title": title,
+        "authors": author_list,
+        "publisher": publisher,
+        "pubyear": pubyear,
+        "pages": pages,
+        "width": width,
+        "height": height
+    }
+
+
+# 🔹 저자 목록 → "한강 지음 ; 홍길동 옮김" (API의 "한강 (지은이)"와 상세페이지의 "한강 지음"을 같은 모양으로)
+# API·크롤링·hedged 변환 모두 이 함수로 245 $c를 만듦
+def normalize_creator(authors):
+    names = []
+    for author in authors:
+        author = author.strip()
+        match = _ROLE_RE.match(author)
+        if match:
+            name, role = match.group(1).strip(), match.group(2).strip()
+            author = f"{name} {ROLE_NAMES.get(role, role)}".strip()
+        if author:
+            names.append(author)
+    return " ; ".join(names)
+
+
+# 🔹 형태사항 $a / $c 값: 쪽수 + 크기(mm → cm)
+def physical_parts(pages, width, height):
+    a_part = f"{pages} p." if pages else ""
+    c_part = ""
+
+    if width and height:
+        if width == height or width > height or width < height / 2:
+            w_cm = round(width / 10)
+            h_cm = round(height / 10)
+            c_part = f"{w_cm}x{h_cm} cm"
+        else:
+            h_cm = round(height / 10)
+            c_part = f"{h_cm} cm"
+
+    return a_part, c_part
+
+
+# 🔹 형태사항 (300) 문자열 구성
+def format_300(pages, width, height):
+    a_part, c_part = physical_parts(pages, width, height)
+
+    if a_part or c_part:
+        field_300 = "=300  \\\\$a"
+        if a_part:
+            field_300 += a_part
+        if c_part:
+            field_300 += f" ;$c{c_part}."
+    else:
+        field_300 = "=300  \\$a1책."
+
+    return field_300
@@ -1,261 +1,108 @@
 import streamlit as st
-import requests
 import re
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from bs4 import BeautifulSoup
+from batch_runner import DEFAULT_CONCURRENCY
+from country_codes import get_country_code_table
+from hedged_lookup import HEDGE_DELAY, convert_isbn_hedged, describe_sources
+from kormarc_core import convert_isbn, format_text_fields
+from publisher_resolver import get_publisher_resolver
+from response_cache import get_response_cache
+from session_results import (
+    cache_bypass_toggle, collect_results, compact_mode_toggle, get_memo, refresh_button, render_results, run_memoized
+)
+from sheet_db import get_publisher_index
+from trace_panel import quiet_mode_toggle, render_trace_summary
+
+# (변환 로직은 kormarc_core.py — 이 파일은 화면만 담당, 명령행 일괄 변환은 kormarc_cli.py)
+
+# --- ISBN 1건 결과 출력 ---
+def render_isbn(idx, isbn, outcome, quiet=False):
+    st.markdown(f"---\n### 📘 {idx}. ISBN: `{isbn}`")
+
+    result = outcome["result"]
+    if result:
+        # ▶️ 서지정보 묶음 출력
+        with st.container():
+            for field in format_text_fields(outcome):
+                st.code(field, language="text")
+        if outcome.get("field_sources"):
+            st.caption(f"🔀 항목별 출처: {describe_sources(outcome['field_sources'])}")
+
+    # ▶️ 디버깅 메시지 별도 출력 (조용한 모드에서는 생략)
+    if outcome["debug_messages"] and not quiet:
+        with st.expander("🛠️ 디버깅 및 경고 메시지 보기"):
+            for msg in outcome["debug_messages"]:
+                st.write(msg)
 
-# --- 발행국 부호 구하기 (구글 시트 Sheet2 활용) ---
-def get_country_code_by_region(region_name):
-    try:
-        st.write(f"🌍 발행국 부호 찾는 중... 참조 지역: `{region_name}`")
-
-        json_key = dict(st.secrets["gspread"])
-        json_key["private_key"] = json_key["private_key"].replace('\\n', '\n')
-
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(json_key, scope)
-        client = gspread.authorize(creds)
-        sheet = client.open("출판사 DB").worksheet("Sheet2")
-
-        region_col = sheet.col_values(1)[1:]
-        code_col = sheet.col_values(2)[1:]
-
-        def normalize_region(region):
-            region = region.strip()
-            was_teukbyeol = "특별자치도" in region
-            region = re.sub(r"(광역시|특별시|특별자치도)", "", region)
-            if region in ["강원도", "제주도", "경기도"]:
-                return region.replace("도", "")
-            if region.endswith("도") and len(region) >= 4 and not was_teukbyeol:
-                return region[0] + region[2]
-            if region.endswith("시"):
-                return region[:-1]
-            return region
-
-        normalized_input = normalize_region(region_name)
-        st.write(f"🧪 정규화된 참조지역: `{normalized_input}`")
-
-        for sheet_region, country_code in zip(region_col, code_col):
-            if normalize_region(sheet_region) == normalized_input:
-                return country_code.strip() or "xxu"
-
-        return "xxu"
-
-    except Exception:
-        return "xxu"
-
-# --- Google Sheets에서 출판사 지역명 추출 ---
-def get_publisher_location(publisher_name):
-    try:
-        st.write(f"📥 출판사 지역을 구글 시트에서 찾는 중입니다... `{publisher_name}`")
-
-        json_key = dict(st.secrets["gspread"])
-        json_key["private_key"] = json_key["private_key"].replace('\\n', '\n')
-
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(json_key, scope)
-        client = gspread.authorize(creds)
-        sheet = client.open("출판사 DB").worksheet("Sheet1")
-
-        publisher_names = sheet.col_values(2)[1:]
-        regions = sheet.col_values(3)[1:]
-
-        def normalize(name):
-            return re.sub(r"\s|\(.*?\)|주식회사|㈜|도서출판|출판사", "", name).lower()
-
-        target = normalize(publisher_name)
-        st.write(f"🧪 정규화된 입력값: `{target}`")
-
-        for sheet_name, region in zip(publisher_names, regions):
-            if normalize(sheet_name) == target:
-                return region.strip() or "출판지 미상"
-
-        for sheet_name, region in zip(publisher_names, regions):
-            if sheet_name.strip() == publisher_name.strip():
-                return region.strip() or "출판지 미상"
-
-        return "출판지 미상"
-
-    except Exception:
-        return "예외 발생"
-
-# --- API 기반 도서정보 가져오기 ---
-def search_aladin_by_isbn(isbn):
-    try:
-        ttbkey = st.secrets["aladin"]["ttbkey"]
-        url = "https://www.aladin.co.kr/ttb/api/ItemLookUp.aspx"
-        params = {
-            "ttbkey": ttbkey,
-            "itemIdType": "ISBN",
-            "ItemId": isbn,
-            "output": "js",
-            "Version": "20131101"
-        }
-
-        res = requests.get(url, params=params)
-        if res.status_code != 200:
-            return None, f"API 요청 실패 (status: {res.status_code})"
-
-        data = res.json()
-        if "item" not in data or not data["item"]:
-            return None, f"도서 정보를 찾을 수 없습니다. [응답 내용: {data}]"
-
-        book = data["item"][0]
-
-        title = book.get("title", "제목 없음")
-        author = book.get("author", "")
-        publisher = book.get("publisher", "출판사 정보 없음")
-        pubdate = book.get("pubDate", "")
-        pubyear = pubdate[:4] if len(pubdate) >= 4 else "발행년도 없음"
-
-        authors = [a.strip() for a in author.split(",")]
-        creator_str = " ; ".join(authors) if authors else "저자 정보 없음"
-
-        field_245 = f"=245  10$a{title} /$c{creator_str}"
-
-        return {
-            "title": title,
-            "creator": creator_str,
-            "publisher": publisher,
-            "pubyear": pubyear,
-            "245": field_245
-        }, None
 
-    except Exception as e:
-        return None, f"API 예외 발생: {str(e)}"
+# --- Streamlit UI ---
+st.title("📚 ISBN → API + 크롤링 → KORMARC 변환기")
 
-# --- 형태사항 크롤링 추출 ---
-def extract_physical_description_by_crawling(isbn):
+# 여러 출처 동시 조회: 알라딘 API가 늦으면 알라딘 상세·BNK에도 물어 항목별로 먼저 온 값 사용
+hedged = st.sidebar.checkbox("🔀 여러 출처 동시 조회 (알라딘 API · 상세 · BNK)")
+hedge_delay = HEDGE_DELAY
+if hedged:
+    # 대기 시간은 이 세션의 조회에만 적용 (공용 조회기 설정은 바꾸지 않음)
+    hedge_delay = st.sidebar.number_input(
+        "⏱️ 2차 출처 요청까지 대기(초)", min_value=0.0, max_value=10.0, value=HEDGE_DELAY, step=0.1
+    )
+memo_name = "api_results_hedged" if hedged else "api_results"  # 방식별로 결과를 따로 보관
+
+if st.sidebar.button("🔄 출판사 DB 다시 불러오기"):
     try:
-        search_url = f"https://www.aladin.co.kr/search/wsearchresult.aspx?SearchWord={isbn}"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        res = requests.get(search_url, headers=headers)
-        if res.status_code != 200:
-            return "=300  \\$a1책.", f"검색 실패 (status {res.status_code})"
-
-        soup = BeautifulSoup(res.text, "html.parser")
-        link_tag = soup.select_one("div.ss_book_box a.bo3")
-        if not link_tag or not link_tag.get("href"):
-            return "=300  \\$a1책.", "도서 링크를 찾을 수 없습니다."
-
-        detail_url = link_tag["href"]
-        detail_res = requests.get(detail_url, headers=headers)
-        if detail_res.status_code != 200:
-            return "=300  \\$a1책.", f"상세페이지 요청 실패 (status {detail_res.status_code})"
-
-        detail_soup = BeautifulSoup(detail_res.text, "html.parser")
-        form_wrap = detail_soup.select_one("div.conts_info_list1")
-        a_part = ""
-        c_part = ""
-
-        if form_wrap:
-            form_items = [item.strip() for item in form_wrap.stripped_strings]
-            for item in form_items:
-                if re.search(r"(쪽|p)\s*$", item):
-                    page_match = re.search(r"\d+", item)
-                    if page_match:
-                        a_part = f"{page_match.group()} p."
-                elif "mm" in item:
-                    size_match = re.search(r"(\d+)\s*[\*x×X]\s*(\d+)", item)
-                    if size_match:
-                        width = int(size_match.group(1))
-                        height = int(size_match.group(2))
-                        if width == height or width > height or width < height / 2:
-                            w_cm = round(width / 10)
-                            h_cm = round(height / 10)
-                            c_part = f"{w_cm}x{h_cm} cm"
-                        else:
-                            h_cm = round(height / 10)
-                            c_part = f"{h_cm} cm"
-
-        if a_part or c_part:
-            field_300 = "=300  \\\\$a"
-            if a_part:
-                field_300 += a_part
-            if c_part:
-                field_300 += f" ;$c{c_part}."
-        else:
-            field_300 = "=300  \\$a1책."
-
-        return field_300, None
-
+        get_publisher_index().reload()
+        get_country_code_table().load_overrides()
+        get_publisher_resolver().clear_cache()
+        get_memo(memo_name).clear()  # 지역 정보가 바뀌었을 수 있으므로 다시 조회
+        st.sidebar.success(f"출판사 {len(get_publisher_index())}건을 다시 불러왔습니다.")
     except Exception as e:
-        return "=300  \\$a1책.", f"예외 발생: {str(e)}"
-
-
-# --- Streamlit UI ---
-import streamlit as st
-import requests
-import re
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from bs4 import BeautifulSoup
+        st.sidebar.error(f"구글 시트 동기화 실패, 로컬 사본으로 계속 사용합니다: {e}")
 
-# (생략) 기존 함수들은 그대로 유지
+isbn_input = st.text_area("ISBN을 '/'로 구분하여 입력하세요:")
 
-# --- Streamlit UI ---
-st.title("📚 ISBN → API + 크롤링 → KORMARC 변환기")
+cache = get_response_cache()
+use_cache = cache_bypass_toggle()
+if st.sidebar.button("🧹 응답 캐시 비우기"):
+    cache.clear()
+    get_memo(memo_name).clear()
+    st.sidebar.success("응답 캐시를 비웠습니다.")
 
-isbn_input = st.text_area("ISBN을 '/'로 구분하여 입력하세요:")
+concurrency = st.sidebar.number_input("⚡ 동시 처리 ISBN 수 (1 = 순차 처리)", min_value=1, max_value=16, value=DEFAULT_CONCURRENCY)
+quiet = quiet_mode_toggle()
+compact = compact_mode_toggle()
 
 if isbn_input:
     isbn_list = [re.sub(r"[^\d]", "", isbn) for isbn in isbn_input.split("/") if isbn.strip()]
 
-    for idx, isbn in enumerate(isbn_list, 1):
-        st.markdown(f"---\n### 📘 {idx}. ISBN: `{isbn}`")
+    memo = get_memo(memo_name)
 
-        # 디버깅 및 경고 메시지를 담을 리스트 준비
-        debug_messages = []
+    # fresh=True: "이 ISBN 다시 조회"로 누른 건 → 캐시를 거치지 않음
+    def worker(isbn, fresh=False):
+        if hedged:
+            return convert_isbn_hedged(isbn, use_cache=use_cache and not fresh, delay=hedge_delay)
+        return convert_isbn(isbn, use_cache=use_cache and not fresh)
 
+    if compact:
+        rows, traces = collect_results(isbn_list, worker, concurrency, memo)
+        render_results(rows, format_text_fields, lambda *row: render_isbn(*row, quiet), memo)
+    else:
         with st.spinner("🔍 도서 정보 검색 중..."):
-            result, error = search_aladin_by_isbn(isbn)
-        if error:
-            debug_messages.append(f"❌ 오류: {error}")
-
-        # 형태사항 크롤링
-        with st.spinner("📐 형태사항 크롤링 중..."):
-            field_300, err_300 = extract_physical_description_by_crawling(isbn)
-        if err_300:
-            debug_messages.append(f"⚠️ 형태사항 크롤링 경고: {err_300}")
-
-        if result:
-            publisher = result["publisher"]
-            pubyear = result["pubyear"]
-
-            if publisher == "출판사 정보 없음":
-                location = "[출판지 미상]"
-            else:
-                with st.spinner(f"📍 '{publisher}'의 지역정보 검색 중..."):
-                    location = get_publisher_location(publisher)
-
-            if publisher != "출판사 정보 없음":
-                debug_messages.append(f"🏙️ 지역정보 결과: **{location}**")
-
-            country_code = get_country_code_by_region(location)
-
-            # ▶️ 서지정보 묶음 출력
-            with st.container():
-                st.code(f"=008  \\$a{country_code}", language="text")
-                st.code(result["245"], language="text")
-                st.code(f"=260  \\$a{location} :$b{publisher},$c{pubyear}.", language="text")
-                st.code(field_300, language="text")
-                
-
-        else:
-            debug_messages.append("⚠️ 결과 없음")
-
-        # ▶️ 디버깅 메시지 별도 출력
-        if debug_messages:
-            with st.expander("🛠️ 디버깅 및 경고 메시지 보기"):
-                for msg in debug_messages:
-                    st.write(msg)
-
+            traces = []
+            for idx, isbn, outcome, fetched in run_memoized(isbn_list, worker, concurrency, memo):
+                render_isbn(idx, isbn, outcome, quiet)
+                refresh_button(memo, isbn, key=f"refresh-{idx}-{isbn}")
+                if fetched:
+                    traces.append(outcome["trace"])
+
+    # 새로 찾은 출판사 → 지역을 Sheet1에 반영
+    added = get_publisher_resolver().flush()
+    if added:
+        st.info(f"📝 새로 찾은 출판사 {added}건을 출판사 DB(Sheet1)에 추가했습니다.")
+
+    stats = get_publisher_resolver().stats()
+    if stats["total"]:
+        st.sidebar.caption(
+            "🏷️ 출판사 조회 단계별 적중: "
+            + " · ".join(f"{tier} {count}건 ({stats['rates'][tier]:.0%})" for tier, count in stats["counts"].items())
+        )
+
+    render_trace_summary(traces)
@@ -0,0 +1,96 @@
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# ISBN 일괄 처리용 실행기
+# - concurrency > 1 이면 스레드 풀로 ISBN을 나눠 처리하고, 결과는 입력 순서대로 내보냄
+# - concurrency == 1 이면 기존과 같이 한 건씩 순차 처리
+# - 호스트별 동시 요청 수는 host_slot()으로 제한
+# - run_with_requeue(): 호스트 일시 중지 등으로 나중에 다시 해야 할 항목은 한 바퀴 끝난 뒤 재시도
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_HOST_LIMIT = 4
+REQUEUE_ROUNDS = 3
+
+_host_limits = {}
+_host_semaphores = {}
+_host_lock = threading.Lock()
+
+
+def set_host_limit(host, limit):
+    with _host_lock:
+        _host_limits[host] = limit
+        _host_semaphores[host] = threading.BoundedSemaphore(limit)
+
+
+def _semaphore_for(host):
+    with _host_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            limit = _host_limits.get(host, DEFAULT_HOST_LIMIT)
+            semaphore = _host_semaphores[host] = threading.BoundedSemaphore(limit)
+        return semaphore
+
+
+# 🔹 호스트별 동시 요청 제한
+@contextmanager
+def host_slot(host):
+    semaphore = _semaphore_for(host)
+    with semaphore:
+        yield
+
+
+# 🔹 입력 순서를 지키며 (번호, 항목, 결과)를 차례로 반환
+# 입력은 끝까지 미리 읽지 않고, 동시 처리 수의 몇 배만큼만 앞서 제출 (수만 건도 메모리 일정)
+def run_in_order(items, worker, concurrency=DEFAULT_CONCURRENCY, window=None):
+    if concurrency <= 1:
+        for idx, item in enumerate(items, 1):
+            yield idx, item, worker(item)
+        return
+
+    window = window or concurrency * 4
+    pending = deque()
+    items = iter(items)
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="isbn")
+    try:
+        for item in itertools.islice(items, window):
+            pending.append((item, pool.submit(worker, item)))
+
+        idx = 0
+        while pending:
+            item, future = pending.popleft()
+            for next_item in itertools.islice(items, 1):
+                pending.append((next_item, pool.submit(worker, next_item)))
+            idx += 1
+            yield idx, item, future.result()
+    finally:
+        # Streamlit 재실행 등으로 중간에 멈추면 아직 시작 안 한 작업은 취소
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# 🔹 run_in_order + 재시도 대기열: should_requeue(결과)가 참인 항목은 미뤄 두었다가
+# 한 바퀴가 끝나면 before_retry()(예: 멈춘 호스트가 열릴 때까지 대기) 후 다시 처리
+# 번호는 원래 입력 순서 그대로, 마지막 바퀴까지 실패한 항목은 그 결과를 그대로 반환
+def run_with_requeue(items, worker, concurrency=DEFAULT_CONCURRENCY, should_requeue=None,
+                     before_retry=None, rounds=REQUEUE_ROUNDS):
+    should_requeue = should_requeue or (lambda result: False)
+    requeued = []
+    for idx, item, result in run_in_order(items, worker, concurrency):
+        if rounds and should_requeue(result):
+            requeued.append((idx, item))
+            continue
+        yield idx, item, result
+
+    for round_no in range(1, rounds + 1):
+        if not requeued:
+            return
+        if before_retry:
+            before_retry()
+        batch, requeued = requeued, []
+        for _, (idx, item), result in run_in_order(batch, lambda entry: worker(entry[1]), concurrency):
+            if round_no < rounds and should_requeue(result):
+                requeued.append((idx, item))
+                continue
+            yield idx, item, result
@@ -0,0 +1,66 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+# 출판사명 3-gram 유사 검색 속도 측정 (합성 출판사명 사용, 네트워크 없음)
+#   python bench/bench_fuzzy.py [--names 30000] [--queries 2000]
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sheet_db import normalize_publisher  # noqa: E402
+from trigram_index import TrigramIndex  # noqa: E402
+
+# 실제 출판사명처럼 글자 종류가 다양하도록 한글 음절 중 800자를 고정 시드로 뽑아 사용
+SYLLABLES = "".join(random.Random(1).sample([chr(code) for code in range(0xAC00, 0xD7A4)], 800))
+SUFFIXES = ["", "북스", "출판", "미디어", "코리아", "주니어", " books", "(주)"]
+
+
+def make_names(count, rng):
+    names = set()
+    while len(names) < count:
+        stem = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))
+        names.add(normalize_publisher(stem + rng.choice(SUFFIXES)))
+    return list(names)
+
+
+def mutate(name, rng):
+    # 접미사 추가 / 한 글자 삭제 / 문장부호 삽입 중 하나
+    choice = rng.randrange(3)
+    if choice == 0:
+        return name + rng.choice(["북스", "주니어", "/임프린트"])
+    if choice == 1 and len(name) > 3:
+        i = rng.randrange(len(name))
+        return name[:i] + name[i + 1:]
+    return name[:2] + "·" + name[2:]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", type=int, default=30000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    names = make_names(args.names, rng)
+
+    started = time.perf_counter()
+    index = TrigramIndex(names)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    queries = [mutate(rng.choice(names), rng) for _ in range(args.queries)]
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, k=5)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    print(f"이름 {len(index)}개 색인 구성: {build_ms:.0f} ms")
+    print(f"검색 {len(queries)}회: 평균 {sum(timings) / len(timings):.3f} ms, "
+          f"p50 {timings[len(timings) // 2]:.3f} ms, p95 {timings[int(len(timings) * 0.95)]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
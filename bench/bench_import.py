@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+# 공용 모듈 cold import 시간 측정
+# 새 파이썬 프로세스에서 import만 하고, 무거운 의존성(streamlit, gspread, bs4, requests, selenium)이
+# 딸려 올라오지 않는지 함께 확인
+#   python bench/bench_import.py [--budget-ms 80]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["kormarc_core", "kpipa", "publisher_directory", "kormarc_cli"]
+HEAVY = ["streamlit", "gspread", "oauth2client", "bs4", "lxml", "requests", "selenium", "webdriver_manager"]
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - started) * 1000
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(f"{{elapsed:.1f}}|{{','.join(heavy)}}")
+"""
+
+
+def measure(module, repeat=5):
+    timings = []
+    heavy = ""
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        elapsed, heavy = out.split("|")
+        timings.append(float(elapsed))
+    return min(timings), heavy
+
+
+def main():
+    budget = 80.0
+    if "--budget-ms" in sys.argv:
+        budget = float(sys.argv[sys.argv.index("--budget-ms") + 1])
+
+    failed = False
+    print(f"{'module':24} {'import ms':>10}  무거운 의존성")
+    for module in MODULES:
+        elapsed, heavy = measure(module)
+        over = elapsed > budget or heavy
+        failed = failed or over
+        print(f"{module:24} {elapsed:>10.1f}  {heavy or '-'}{'  ⚠️' if over else ''}")
+    print(f"(기준: {budget:.0f}ms 이하, 무거운 의존성 없음)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+# 기존 .mrc 파일 ISBN 색인 벤치마크 (marc_record.index_isbns)
+#   python bench/bench_mrc_index.py [-n 200000] [--mrc 기존.mrc]
+# - --mrc 가 없으면 합성 레코드 n건을 임시 파일에 기록(ISO 2709 출력기와 같은 인코딩)한 뒤 색인
+# - 보고: 파일 크기, 색인 시간, 레코드/초, 최대 RSS (mmap이라 파일 크기와 무관해야 함)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from marc_record import Record, encode_iso2709, index_isbns  # noqa: E402
+
+
+def synth_mrc(path, count):
+    with open(path, "wb") as f:
+        for i in range(count):
+            record = Record()
+            record.add_control("008", f"{'2501015s2024    ulk':<35}kor  ")
+            record.add("020", "  ", [("a", f"979110{i:07d}"), ("c", "₩18000")])
+            record.add("245", "10", [("a", f"합성 도서 {i} /"), ("c", "김지은 지음")])
+            record.add("260", "  ", [("a", "서울 :"), ("b", "합성출판,"), ("c", "2024.")])
+            record.add("300", "  ", [("a", "312 p. ;"), ("c", "21 cm.")])
+            f.write(encode_iso2709(record))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=".mrc ISBN 색인 벤치마크")
+    parser.add_argument("-n", "--records", type=int, default=200_000)
+    parser.add_argument("--mrc", help="색인할 기존 .mrc 파일 (없으면 합성)")
+    args = parser.parse_args(argv)
+
+    path = args.mrc
+    if not path:
+        path = os.path.join(tempfile.mkdtemp(prefix="komarc-mrc-"), "synthetic.mrc")
+        synth_mrc(path, args.records)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    isbns = index_isbns(path)
+    elapsed = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    print(f"{path}: {size_mb:.1f} MB, ISBN {len(isbns)}건")
+    print(f"색인 {elapsed:.2f}초 ({len(isbns) / elapsed:,.0f}건/초, {size_mb / elapsed:.0f} MB/초)")
+    print(f"최대 RSS 증가 {(rss_after - rss_before) / 1024:.1f} MB (ISBN 집합 포함)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+# 알라딘 페이지 파싱 마이크로 벤치마크 (저장된 HTML 파일 기준)
+# 사용법: python bench/bench_parse.py --detail 상세1.html 상세2.html --search 검색1.html
+#   기존 방식(html.parser 전체 트리 + 매번 정규식 컴파일) vs aladin_parse(C 파서 + SoupStrainer)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import aladin_parse  # noqa: E402
+
+
+# 🔹 기존 방식 (크롤링 주소 반영.py parse_aladin_detail_page 의 파싱 부분)
+def legacy_parse_detail(html):
+    soup = BeautifulSoup(html, "html.parser")
+    title_tag = soup.select_one("span.Ere_bo_title")
+    title = title_tag.text.strip() if title_tag else ""
+
+    li_tag = soup.select_one("li.Ere_sub2_title")
+    author_list = []
+    publisher = ""
+    pubyear = ""
+    if li_tag:
+        children = li_tag.contents
+        last_a_before_date = None
+        for i, node in enumerate(children):
+            if getattr(node, "name", None) == "a":
+                name = node.text.strip()
+                next_text = children[i+1].strip() if i+1 < len(children) and isinstance(children[i+1], str) else ""
+                if "지은이" in next_text:
+                    author_list.append(f"{name} 지음")
+                elif "옮긴이" in next_text:
+                    author_list.append(f"{name} 옮김")
+                else:
+                    last_a_before_date = name
+            elif isinstance(node, str):
+                date_match = re.search(r"\d{4}-\d{2}-\d{2}", node)
+                if date_match:
+                    pubyear = date_match.group().split("-")[0]
+                    if last_a_before_date:
+                        publisher = last_a_before_date
+
+    pages = width = height = 0
+    form_wrap = soup.select_one("div.conts_info_list1")
+    if form_wrap:
+        for item in [item.strip() for item in form_wrap.stripped_strings]:
+            if re.search(r"(쪽|p)\s*$", item):
+                page_match = re.search(r"\d+", item)
+                if page_match:
+                    pages = int(page_match.group())
+            elif "mm" in item:
+                size_match = re.search(r"(\d+)\s*[\*x×X]\s*(\d+)", item)
+                if size_match:
+                    width = int(size_match.group(1))
+                    height = int(size_match.group(2))
+
+    return {"title": title, "authors": author_list, "publisher": publisher, "pubyear": pubyear,
+            "pages": pages, "width": width, "height": height}
+
+
+def legacy_find_detail_link(html):
+    soup = BeautifulSoup(html, "html.parser")
+    link_tag = soup.select_one("div.ss_book_box a.bo3")
+    if not link_tag or not link_tag.get("href"):
+        return None
+    return link_tag["href"]
+
+
+def time_per_call(func, html, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func(html)
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def run(label, paths, legacy, fast, repeat):
+    if not paths:
+        return
+    print(f"\n[{label}] parser={aladin_parse._get_parser_name()} repeat={repeat}")
+    print(f"{'file':40} {'size':>8} {'before ms':>10} {'after ms':>10} {'speedup':>8}  same")
+    total_before = total_after = 0.0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        before, legacy_result = time_per_call(legacy, html, repeat)
+        after, fast_result = time_per_call(fast, html, repeat)
+        total_before += before
+        total_after += after
+        name = os.path.basename(path)[:40]
+        print(f"{name:40} {len(html) // 1024:>6}KB {before:>10.2f} {after:>10.2f} {before / after:>7.1f}x  {legacy_result == fast_result}")
+    print(f"{'평균':40} {'':>8} {total_before / len(paths):>10.2f} {total_after / len(paths):>10.2f} {total_before / total_after:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="알라딘 페이지 파싱 시간 비교 (기존 vs aladin_parse)")
+    parser.add_argument("--detail", nargs="*", default=[], help="저장된 상세페이지 HTML")
+    parser.add_argument("--search", nargs="*", default=[], help="저장된 검색결과 페이지 HTML")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if not args.detail and not args.search:
+        parser.error("--detail 또는 --search 로 HTML 파일을 지정하세요.")
+
+    run("상세페이지", args.detail, legacy_parse_detail, aladin_parse.parse_detail_page, args.repeat)
+    run("검색결과", args.search, legacy_find_detail_link, aladin_parse.find_detail_link, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
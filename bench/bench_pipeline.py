@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# 변환 파이프라인 오프라인 벤치마크 (실제 알라딘·BNK·구글 시트에 접속하지 않음)
+#   python bench/bench_pipeline.py [-n 300] [--pipelines api,crawl] [--concurrency 1,4,8] [--cache off,cold,warm]
+#                                  [--latency-ms 80 --jitter-ms 40 --error-rate 0.01] [--sheet-latency-ms 150]
+#                                  [--json 결과.json]
+#
+# - bench/fixtures.py 자료(없으면 합성 자료를 임시 폴더에 생성)를 대역 서버 두 개로 응답
+#   (알라딘 = 127.0.0.1, BNK = localhost → 호스트별 동시 요청 제한도 실제처럼 따로 적용)
+# - 구글 시트는 bench/fake_sheets.py 의 가짜 워크시트 사용
+# - 캐시 설정: off(응답 캐시 끔) / cold(빈 캐시) / warm(같은 ISBN을 한 번 돌린 뒤 측정)
+# - 보고: ISBN/초, ISBN별 지연 p50/p95, 파이썬 힙 최대 사용량(tracemalloc), 실패 건수, 서버 요청 수
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_sheets import FakeSpreadsheet  # noqa: E402
+from fixtures import DEFAULT_DIR, synthesize  # noqa: E402
+from standin_server import StandinServer  # noqa: E402
+
+
+def parse_list(text, cast=str):
+    return [cast(part) for part in text.split(",") if part.strip()]
+
+
+def prepare_fixtures(path, count):
+    if path and os.path.exists(os.path.join(path, "isbns.txt")):
+        return path
+    path = path if path and path != DEFAULT_DIR else tempfile.mkdtemp(prefix="komarc-fixtures-")
+    synthesize(path, count)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="변환 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--fixtures", default=DEFAULT_DIR, help="자료 폴더 (없으면 합성 자료 생성)")
+    parser.add_argument("-n", "--isbns", type=int, default=300, help="측정할 ISBN 수 (합성 시 생성 수)")
+    parser.add_argument("--pipelines", default="api,crawl", help="api (convert_isbn) / crawl (convert_isbn_by_crawling)")
+    parser.add_argument("--concurrency", default="1,4,8")
+    parser.add_argument("--cache", default="off,cold,warm")
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--jitter-ms", type=float, default=40)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--sheet-latency-ms", type=float, default=150, help="가짜 구글 시트 호출당 지연")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    fixtures = prepare_fixtures(args.fixtures, args.isbns)
+    server_options = dict(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate, seed=1)
+    aladin = StandinServer(fixtures, host="127.0.0.1", **server_options).start()
+    kpipa = StandinServer(fixtures, host="localhost", **server_options).start()
+
+    # 프로젝트 모듈을 import하기 전에 주소·키·캐시 위치를 대역으로 지정
+    cache_dir = tempfile.mkdtemp(prefix="komarc-cache-")
+    os.environ.update({
+        "KOMARC_ALADIN_URL": aladin.base_url,
+        "KOMARC_KPIPA_URL": kpipa.base_url,
+        "KOMARC_DIRECTORY_BACKEND": "http",
+        "KOMARC_CACHE_PATH": os.path.join(cache_dir, "responses.sqlite3"),
+        "KOMARC_SNAPSHOT_PATH": os.path.join(cache_dir, "sheets.sqlite3"),
+        "ALADIN_TTBKEY": "bench",
+    })
+
+    import publisher_resolver
+    import sheet_db
+    from batch_runner import run_in_order
+    from country_codes import get_country_code_table
+    from instrumentation import percentile, traced
+    from kormarc_core import convert_isbn, convert_isbn_by_crawling
+    from response_cache import get_response_cache
+    from sheet_snapshot import get_sheet_snapshot
+
+    with open(os.path.join(fixtures, "isbns.txt"), encoding="utf-8") as f:
+        isbns = [line.strip() for line in f if line.strip()][:args.isbns]
+
+    workers = {"api": convert_isbn, "crawl": convert_isbn_by_crawling}
+    cache = get_response_cache()
+    results = []
+
+    def fresh_state():
+        # 시트·출판사 조회 상태를 매 측정마다 처음으로 (가짜 시트도 새로)
+        spreadsheet = FakeSpreadsheet.from_json(os.path.join(fixtures, "sheets.json"), args.sheet_latency_ms)
+        sheet_db.use_worksheet_factory(spreadsheet.worksheet)
+        get_sheet_snapshot().sync(force=True)
+        sheet_db._publisher_index = None
+        publisher_resolver._resolver = None
+        get_country_code_table().load_overrides()
+        return spreadsheet
+
+    def run(worker, concurrency):
+        latencies = []
+        failed = 0
+        started = time.perf_counter()
+        for _, _, outcome in run_in_order(isbns, traced(worker), concurrency):
+            latencies.append(outcome["trace"]["total_ms"])
+            if not outcome["result"]:
+                failed += 1
+        return time.perf_counter() - started, latencies, failed
+
+    print(f"자료 {fixtures} · ISBN {len(isbns)}건 · 지연 {args.latency_ms}±{args.jitter_ms} ms · 오류율 {args.error_rate:.0%}")
+    print(f"{'파이프라인':<8}{'캐시':<6}{'동시':>4}{'ISBN/초':>10}{'p50 ms':>10}{'p95 ms':>10}{'힙 MB':>8}{'실패':>6}{'요청':>7}")
+
+    for pipeline in parse_list(args.pipelines):
+        worker = workers[pipeline]
+        for cache_mode in parse_list(args.cache):
+            for concurrency in parse_list(args.concurrency, int):
+                spreadsheet = fresh_state()
+                cache.clear()
+                cache.enabled = cache_mode != "off"
+                if cache_mode == "warm":
+                    run(worker, concurrency)
+                    fresh_state()
+
+                requests_before = sum(aladin.stats().values()) + sum(kpipa.stats().values())
+                tracemalloc.start()
+                elapsed, latencies, failed = run(worker, concurrency)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                requests = sum(aladin.stats().values()) + sum(kpipa.stats().values()) - requests_before
+
+                row = {
+                    "pipeline": pipeline,
+                    "cache": cache_mode,
+                    "concurrency": concurrency,
+                    "isbns": len(isbns),
+                    "isbns_per_sec": round(len(isbns) / elapsed, 2),
+                    "p50_ms": round(percentile(latencies, 50), 1),
+                    "p95_ms": round(percentile(latencies, 95), 1),
+                    "peak_heap_mb": round(peak / 1024 / 1024, 1),
+                    "failed": failed,
+                    "requests": requests,
+                    "sheet_calls": spreadsheet.calls(),
+                }
+                results.append(row)
+                print(
+                    f"{pipeline:<8}{cache_mode:<6}{concurrency:>4}{row['isbns_per_sec']:>10.1f}{row['p50_ms']:>10.1f}"
+                    f"{row['p95_ms']:>10.1f}{row['peak_heap_mb']:>8.1f}{failed:>6}{requests:>7}"
+                )
+
+    aladin.stop()
+    kpipa.stop()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
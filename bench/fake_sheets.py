@@ -0,0 +1,126 @@
+import json
+import re
+import threading
+import time
+
+# 가짜 "출판사 DB" (gspread Worksheet 중 이 프로젝트가 쓰는 메서드만)
+#   get / batch_get / col_values / acell / update_cell / batch_update / append_rows
+# - 행 데이터는 메모리에만 보관, 호출마다 latency_ms 지연 (구글 시트 API 왕복 흉내)
+# - 호출 수는 메서드별로 집계 (calls)
+# sheet_db.use_worksheet_factory(FakeSpreadsheet(...).worksheet) 로 연결
+
+_RANGE_RE = re.compile(r"^([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?$")
+
+
+def _column_index(letters):
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index - 1
+
+
+def _trim(row):
+    while row and row[-1] == "":
+        row = row[:-1]
+    return row
+
+
+class FakeWorksheet:
+    def __init__(self, title, rows, latency_ms=0):
+        self.title = title
+        self.rows = [list(row) for row in rows]
+        self.latency_ms = latency_ms
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def _call(self, name):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def _parse_range(self, a1):
+        match = _RANGE_RE.match(a1)
+        if not match:
+            raise ValueError(f"지원하지 않는 범위: {a1}")
+        start_col, start_row, end_col, end_row = match.groups()
+        first_col = _column_index(start_col)
+        last_col = _column_index(end_col or start_col)
+        first_row = int(start_row or 1) - 1
+        last_row = int(end_row) - 1 if end_row else (first_row if end_col is None and start_row else len(self.rows) - 1)
+        return first_row, last_row, first_col, last_col
+
+    def _read(self, a1):
+        first_row, last_row, first_col, last_col = self._parse_range(a1)
+        values = []
+        for row in self.rows[first_row:last_row + 1]:
+            values.append(_trim([row[col] if col < len(row) else "" for col in range(first_col, last_col + 1)]))
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def _write(self, a1, values):
+        first_row, _, first_col, _ = self._parse_range(a1)
+        for offset, row_values in enumerate(values):
+            row_idx = first_row + offset
+            while len(self.rows) <= row_idx:
+                self.rows.append([])
+            row = self.rows[row_idx]
+            for col_offset, value in enumerate(row_values):
+                col = first_col + col_offset
+                while len(row) <= col:
+                    row.append("")
+                row[col] = value
+
+    def get(self, a1):
+        self._call("get")
+        with self._lock:
+            return self._read(a1)
+
+    def batch_get(self, ranges):
+        self._call("batch_get")
+        with self._lock:
+            return [self._read(a1) for a1 in ranges]
+
+    def col_values(self, col):
+        self._call("col_values")
+        with self._lock:
+            return _trim([row[col - 1] if col - 1 < len(row) else "" for row in self.rows])
+
+    def acell(self, a1):
+        self._call("acell")
+        with self._lock:
+            values = self._read(a1)
+        return type("Cell", (), {"value": values[0][0] if values and values[0] else ""})()
+
+    def update_cell(self, row, col, value):
+        self._call("update_cell")
+        with self._lock:
+            self._write(f"{chr(ord('A') + col - 1)}{row}", [[value]])
+
+    def batch_update(self, data, **kwargs):
+        self._call("batch_update")
+        with self._lock:
+            for entry in data:
+                self._write(entry["range"], entry["values"])
+
+    def append_rows(self, values, **kwargs):
+        self._call("append_rows")
+        with self._lock:
+            self.rows.extend(list(row) for row in values)
+
+
+class FakeSpreadsheet:
+    def __init__(self, sheets, latency_ms=0):
+        self.worksheets = {title: FakeWorksheet(title, rows, latency_ms) for title, rows in sheets.items()}
+
+    @classmethod
+    def from_json(cls, path, latency_ms=0):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), latency_ms)
+
+    def worksheet(self, title):
+        return self.worksheets[title]
+
+    def calls(self):
+        return {title: dict(sheet.calls) for title, sheet in self.worksheets.items()}
@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import random
+import sys
+
+# 벤치마크용 ISBN 자료(fixture) 만들기
+#   python bench/fixtures.py synth [-n 300] [-o bench/fixtures]        합성 자료 생성 (네트워크 없음)
+#   python bench/fixtures.py record isbn목록.txt [-o bench/fixtures]   실제 알라딘/BNK 응답 녹화 (TTB 키 필요)
+#
+# 폴더 구조 (대역 서버 bench/standin_server.py 가 그대로 읽어 응답)
+#   <dir>/isbns.txt                      ISBN 목록
+#   <dir>/sheets.json                    가짜 "출판사 DB" (Sheet1 / Sheet2 / 시트3)
+#   <dir>/directory.json                 BNK 출판사 목록 검색 응답 {출판사명: [[이름, 지역, 업종], ...]}
+#   <dir>/<ISBN>/api.json                알라딘 ItemLookUp 응답 (상세 링크는 {ALADIN}/... 로 저장)
+#   <dir>/<ISBN>/search.html             알라딘 검색 결과
+#   <dir>/<ISBN>/detail.html             알라딘 상세 페이지
+#   <dir>/<ISBN>/kpipa_search.html       BNK 검색 결과
+#   <dir>/<ISBN>/kpipa_detail.html       BNK 상세 페이지
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DIR = os.path.join(ROOT, "bench", "fixtures")
+LINK_PLACEHOLDER = "{ALADIN}"
+
+REGIONS = [
+    ("서울특별시 마포구", "ulk"), ("경기도 파주시", "ggk"), ("서울특별시 종로구", "ulk"),
+    ("부산광역시 해운대구", "bnk"), ("대구광역시 중구", "tgk"), ("경기도 고양시", "ggk"),
+    ("인천광역시 남동구", "ick"), ("광주광역시 동구", "kjk"), ("강원도 춘천시", "gak"),
+]
+SYLLABLES = "가나다라마바사아자차카타파하민음문학창비동서북스푸른숲길봄열린책들한빛지식산업"
+SURNAMES = "김이박최정강조윤장임"
+PADDING = "<!-- " + "x" * 2000 + " -->\n"  # 실제 페이지처럼 파싱 대상이 아닌 부분을 길게
+
+
+def isbn13(rng):
+    digits = [9, 7, 9, 1, 1] + [rng.randrange(10) for _ in range(7)]
+    check = (10 - sum(d * (1 if i % 2 == 0 else 3) for i, d in enumerate(digits)) % 10) % 10
+    return "".join(map(str, digits + [check]))
+
+
+def api_json(book):
+    item = {
+        "title": book["title"],
+        "author": f"{book['author']} (지은이)",
+        "publisher": book["publisher"],
+        "pubDate": f"{book['year']}-03-15",
+        "link": f"{LINK_PLACEHOLDER}/shop/wproduct.aspx?ItemId={book['item_id']}",
+        "subInfo": {},
+    }
+    if book["api_physical"]:
+        item["subInfo"] = {
+            "itemPage": book["pages"],
+            "packing": {"sizeWidth": book["width"], "sizeHeight": book["height"]},
+        }
+    return json.dumps({"item": [item]}, ensure_ascii=False)
+
+
+def search_html(book):
+    return (
+        f"<html><body>{PADDING * 20}<div class=\"ss_book_box\"><div>"
+        f"<a class=\"bo3\" href=\"{LINK_PLACEHOLDER}/shop/wproduct.aspx?ItemId={book['item_id']}\"><b>{book['title']}</b></a>"
+        f"</div></div>{PADDING * 20}</body></html>"
+    )
+
+
+def detail_html(book):
+    return (
+        f"<html><head><title>{book['title']}</title></head><body>{PADDING * 40}"
+        f"<span class=\"Ere_bo_title\">{book['title']}</span>"
+        f"<ul><li class=\"Ere_sub2_title\"><a href=\"#\">{book['author']}</a> (지은이)"
+        f"<a href=\"#\">{book['publisher']}</a>{book['year']}-03-15</li></ul>"
+        f"{PADDING * 20}<div class=\"conts_info_list1\"><ul><li>{book['pages']}쪽</li>"
+        f"<li>{book['width']}*{book['height']}mm</li><li>412g</li></ul></div>{PADDING * 40}</body></html>"
+    )
+
+
+def kpipa_search_html(book):
+    return (
+        f"<ul class=\"list\"><li class=\"book_list\"><a href=\"/front/search/bookDetailView.do?book_seq={book['book_seq']}\">"
+        f"{book['title']}</a></li></ul>"
+    )
+
+
+def kpipa_detail_html(book):
+    return (
+        f"<html><body>{PADDING * 10}<table><tr><th>도서명</th><td>{book['title']}</td></tr>"
+        f"<tr><th>출판사/인프린트</th><td>{book['publisher']}</td></tr></table>{PADDING * 10}</body></html>"
+    )
+
+
+def write_book(directory, isbn, files):
+    book_dir = os.path.join(directory, isbn)
+    os.makedirs(book_dir, exist_ok=True)
+    for name, body in files.items():
+        if body is not None:
+            with open(os.path.join(book_dir, name), "w", encoding="utf-8") as f:
+                f.write(body)
+
+
+# 🔹 합성 자료: 출판사 일부는 Sheet1에 없음(유사 이름·BNK 검색 단계 사용), 일부 도서는 API에 형태사항 없음(크롤링 사용)
+def synthesize(directory, count, seed=42):
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    publishers = []
+    for _ in range(max(10, count // 5)):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + rng.choice(["", "북스", "출판", "미디어"])
+        publishers.append((name, rng.choice(REGIONS)))
+
+    sheet1 = []
+    directory_rows = {}
+    for idx, (name, (region, _)) in enumerate(publishers):
+        roll = rng.random()
+        if roll < 0.7:
+            sheet1.append([str(idx + 1), name, region])
+        elif roll < 0.85:
+            sheet1.append([str(idx + 1), f"(주){name}", region])  # 정규화로 일치
+        else:
+            directory_rows[name] = [[name, "", region, "출판업"]]  # Sheet1에 없음 → BNK 검색에서 찾음
+
+    isbns = []
+    seen = set()
+    while len(isbns) < count:
+        isbn = isbn13(rng)
+        if isbn in seen:
+            continue
+        seen.add(isbn)
+        isbns.append(isbn)
+
+        name, _ = rng.choice(publishers)
+        book = {
+            "title": "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 8))),
+            "author": rng.choice(SURNAMES) + "".join(rng.choice(SYLLABLES) for _ in range(2)),
+            "publisher": name,
+            "year": str(rng.randint(1995, 2025)),
+            "pages": rng.randint(80, 900),
+            "width": rng.choice([128, 135, 148, 152, 170, 188, 210]),
+            "height": rng.choice([188, 200, 210, 225, 240, 257, 297]),
+            "item_id": rng.randint(10_000_000, 399_999_999),
+            "book_seq": rng.randint(100_000, 999_999),
+            "api_physical": rng.random() < 0.6,
+        }
+        write_book(directory, isbn, {
+            "api.json": api_json(book),
+            "search.html": search_html(book),
+            "detail.html": detail_html(book),
+            "kpipa_search.html": kpipa_search_html(book),
+            "kpipa_detail.html": kpipa_detail_html(book),
+        })
+
+    sheets = {
+        "Sheet1": [["번호", "출판사명", "지역"]] + sheet1,
+        "Sheet2": [["지역", "발행국 부호"]] + [[region, code] for region, code in REGIONS],
+        "시트3": [["ISBN", "도서명", "출판사명"]] + [[isbn, "", ""] for isbn in isbns],
+    }
+    with open(os.path.join(directory, "sheets.json"), "w", encoding="utf-8") as f:
+        json.dump(sheets, f, ensure_ascii=False)
+    with open(os.path.join(directory, "directory.json"), "w", encoding="utf-8") as f:
+        json.dump(directory_rows, f, ensure_ascii=False)
+    with open(os.path.join(directory, "isbns.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(isbns) + "\n")
+    return isbns
+
+
+# 🔹 실제 응답 녹화 (알라딘 링크는 대역 서버 주소로 바꿀 수 있게 자리표시자로 저장)
+def record(directory, isbns):
+    sys.path.insert(0, ROOT)
+    import http_client
+    import kpipa
+    from kormarc_core import fetch_aladin_item_json
+
+    os.makedirs(directory, exist_ok=True)
+    recorded = []
+    for isbn in isbns:
+        try:
+            api = fetch_aladin_item_json(isbn)
+            if api is None:
+                print(f"{isbn}: 알라딘 결과 없음, 건너뜀", file=sys.stderr)
+                continue
+            link = json.loads(api)["item"][0].get("link", "")
+            detail = http_client.get(link).text if link else None
+            search = http_client.get(f"https://www.aladin.co.kr/search/wsearchresult.aspx?SearchWord={isbn}").text
+
+            kpipa_search = http_client.post(
+                kpipa.KPIPA_SEARCH_URL, data={"searchKeyword": isbn, "searchType": "isbn", "page": "1"}
+            ).text
+            href = kpipa.parse_book_link(kpipa_search) or ""
+            kpipa_detail = None
+            if "book_seq=" in href:
+                kpipa_detail = http_client.get(kpipa.KPIPA_DETAIL_URL + href.split("book_seq=")[-1]).text
+        except Exception as e:
+            print(f"{isbn}: 녹화 실패 ({e})", file=sys.stderr)
+            continue
+
+        def relink(text):
+            return text.replace("https://www.aladin.co.kr", LINK_PLACEHOLDER).replace("http://www.aladin.co.kr", LINK_PLACEHOLDER)
+
+        write_book(directory, isbn, {
+            "api.json": relink(api),
+            "search.html": relink(search),
+            "detail.html": detail,
+            "kpipa_search.html": kpipa_search,
+            "kpipa_detail.html": kpipa_detail,
+        })
+        recorded.append(isbn)
+        print(f"{isbn}: 녹화 완료", file=sys.stderr)
+
+    with open(os.path.join(directory, "isbns.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(recorded) + "\n")
+    print(f"{len(recorded)}건 녹화. sheets.json / directory.json 은 실제 시트에서 내보내 같은 폴더에 두세요.", file=sys.stderr)
+    return recorded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="벤치마크용 ISBN 자료 생성/녹화")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    synth_parser = sub.add_parser("synth", help="합성 자료 생성")
+    synth_parser.add_argument("-n", "--count", type=int, default=300)
+    synth_parser.add_argument("-o", "--output", default=DEFAULT_DIR)
+    synth_parser.add_argument("--seed", type=int, default=42)
+
+    record_parser = sub.add_parser("record", help="실제 응답 녹화")
+    record_parser.add_argument("input", help="ISBN 목록 파일")
+    record_parser.add_argument("-o", "--output", default=DEFAULT_DIR)
+
+    args = parser.parse_args(argv)
+    if args.command == "synth":
+        isbns = synthesize(args.output, args.count, args.seed)
+        print(f"합성 자료 {len(isbns)}건 → {args.output}", file=sys.stderr)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            record(args.output, [line.strip() for line in f if line.strip()])
+
+
+if __name__ == "__main__":
+    main()
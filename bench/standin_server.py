@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# 알라딘 / BNK 대역 서버 (bench/fixtures.py 로 만든 자료를 그대로 응답)
+#   python bench/standin_server.py [--fixtures bench/fixtures] [--latency-ms 80 --jitter-ms 40 --error-rate 0.02]
+#
+# 응답 경로
+#   GET  /ttb/api/ItemLookUp.aspx?ItemId=ISBN         알라딘 API
+#   GET  /search/wsearchresult.aspx?SearchWord=ISBN   알라딘 검색
+#   GET  /shop/wproduct.aspx?ItemId=...               알라딘 상세 (ItemId → ISBN 색인)
+#   POST /front/search/bookSearchListAjax.do          BNK 검색 (searchKeyword)
+#   GET  /front/search/bookDetailView.do?book_seq=    BNK 상세
+#   POST /home/v3/addition/adiPblshrInfoList          BNK 출판사 목록 검색
+# - 응답마다 latency ± jitter 만큼 지연, error_rate 확률로 503 (재시도 경로 확인용)
+# - 요청 수는 경로별로 집계 (stats())
+
+EMPTY_ITEM = json.dumps({"item": []})
+
+
+class FixtureStore:
+    def __init__(self, directory):
+        self.directory = directory
+        self.item_ids = {}
+        self.book_seqs = {}
+        with open(os.path.join(directory, "isbns.txt"), encoding="utf-8") as f:
+            isbns = [line.strip() for line in f if line.strip()]
+        for isbn in isbns:
+            search = self.read(isbn, "search.html") or ""
+            marker = "ItemId="
+            if marker in search:
+                item_id = search.split(marker, 1)[1].split('"', 1)[0].split("&", 1)[0]
+                self.item_ids[item_id] = isbn
+            kpipa_search = self.read(isbn, "kpipa_search.html") or ""
+            if "book_seq=" in kpipa_search:
+                self.book_seqs[kpipa_search.split("book_seq=", 1)[1].split('"', 1)[0]] = isbn
+
+        directory_path = os.path.join(directory, "directory.json")
+        self.publishers = {}
+        if os.path.exists(directory_path):
+            with open(directory_path, encoding="utf-8") as f:
+                self.publishers = json.load(f)
+
+    def read(self, isbn, name):
+        path = os.path.join(self.directory, isbn, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+
+def _directory_page(rows):
+    body = "".join(
+        "<tr>" + "".join(f"<td>{escape(str(cell))}</td>" for cell in row) + "</tr>" for row in rows
+    )
+    return f"<html><body><table><tbody id=\"pblshrListBody\">{body}</tbody></table></body></html>"
+
+
+class StandinServer:
+    def __init__(self, fixtures, host="127.0.0.1", port=0, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None):
+        self.store = FixtureStore(fixtures)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._counts = {}
+        self._counts_lock = threading.Lock()
+        self.aladin_base = ""  # 상세 링크에 넣을 알라딘 주소 (기본: 이 서버)
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive (실제 서버와 같은 커넥션 재사용)
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self, "GET", None)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode("utf-8")) if length else {}
+                server._handle(self, "POST", form)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True, name="standin")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def stats(self):
+        with self._counts_lock:
+            return dict(self._counts)
+
+    def _delay_and_fail(self):
+        with self._rng_lock:
+            delay = self.latency_ms + (self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+            fail = self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return fail
+
+    def _route(self, method, path, query, form):
+        store = self.store
+
+        def first(values, key):
+            return (values.get(key) or [""])[0]
+
+        if method == "GET" and path == "/ttb/api/ItemLookUp.aspx":
+            body = store.read(first(query, "ItemId"), "api.json")
+            return 200, "application/json", self._relink(body) if body else EMPTY_ITEM
+        if method == "GET" and path == "/search/wsearchresult.aspx":
+            body = store.read(first(query, "SearchWord"), "search.html")
+            return 200, "text/html", self._relink(body) if body else "<html><body>검색 결과 없음</body></html>"
+        if method == "GET" and path == "/shop/wproduct.aspx":
+            isbn = store.item_ids.get(first(query, "ItemId"))
+            body = store.read(isbn, "detail.html") if isbn else None
+            return (200, "text/html", body) if body else (404, "text/html", "not found")
+        if method == "POST" and path == "/front/search/bookSearchListAjax.do":
+            body = store.read(first(form, "searchKeyword"), "kpipa_search.html")
+            return 200, "text/html", body or "<ul class=\"list\"></ul>"
+        if method == "GET" and path == "/front/search/bookDetailView.do":
+            isbn = store.book_seqs.get(first(query, "book_seq"))
+            body = store.read(isbn, "kpipa_detail.html") if isbn else None
+            return (200, "text/html", body) if body else (404, "text/html", "not found")
+        if method == "POST" and path == "/home/v3/addition/adiPblshrInfoList":
+            return 200, "text/html", _directory_page(store.publishers.get(first(form, "searchKeyword"), []))
+        return 404, "text/plain", "unknown path"
+
+    def _relink(self, body):
+        return body.replace("{ALADIN}", self.aladin_base or self.base_url)
+
+    def _handle(self, handler, method, form):
+        parts = urlsplit(handler.path)
+        with self._counts_lock:
+            self._counts[parts.path] = self._counts.get(parts.path, 0) + 1
+
+        if self._delay_and_fail():
+            status, content_type, body = 503, "text/plain", "injected error"
+        else:
+            status, content_type, body = self._route(method, parts.path, parse_qs(parts.query), form or {})
+
+        payload = body.encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="알라딘 / BNK 대역 서버")
+    parser.add_argument("--fixtures", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StandinServer(args.fixtures, port=args.port, latency_ms=args.latency_ms,
+                           jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    print(f"대역 서버: {server.base_url}  (KOMARC_ALADIN_URL / KOMARC_KPIPA_URL 로 지정)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
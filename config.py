@@ -0,0 +1,50 @@
+import json
+import os
+
+# 비밀 설정(알라딘 TTB 키, 구글 서비스 계정) 읽기
+# Streamlit을 import하지 않고도 읽을 수 있도록 순서대로 확인
+#   1. 환경변수 (ALADIN_TTBKEY, GSPREAD_SERVICE_ACCOUNT_FILE)
+#   2. .streamlit/secrets.toml (현재 폴더 → 홈 폴더)
+#   3. st.secrets (그 밖의 Streamlit 설정 위치)
+
+# 외부 서비스 주소 (벤치마크·시험용 대역 서버로 바꿀 때 환경변수로 지정)
+ALADIN_BASE_URL = os.environ.get("KOMARC_ALADIN_URL", "https://www.aladin.co.kr").rstrip("/")
+KPIPA_BASE_URL = os.environ.get("KOMARC_KPIPA_URL", "https://bnk.kpipa.or.kr").rstrip("/")
+
+SECRETS_PATHS = [
+    os.path.join(os.getcwd(), ".streamlit", "secrets.toml"),
+    os.path.join(os.path.expanduser("~"), ".streamlit", "secrets.toml"),
+]
+
+_secrets = None
+
+
+def load_secrets():
+    global _secrets
+    if _secrets is None:
+        for path in SECRETS_PATHS:
+            if os.path.exists(path):
+                import tomllib
+                with open(path, "rb") as f:
+                    _secrets = tomllib.load(f)
+                break
+        else:
+            import streamlit as st
+            _secrets = st.secrets.to_dict()
+    return _secrets
+
+
+def get_aladin_ttbkey():
+    return os.environ.get("ALADIN_TTBKEY") or load_secrets()["aladin"]["ttbkey"]
+
+
+def get_gspread_key():
+    key_file = os.environ.get("GSPREAD_SERVICE_ACCOUNT_FILE")
+    if key_file:
+        with open(key_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    # ✅ dict로 복사 후 private_key 줄바꿈 복원
+    json_key = dict(load_secrets()["gspread"])
+    json_key["private_key"] = json_key["private_key"].replace('\\n', '\n')
+    return json_key
@@ -0,0 +1,125 @@
+import re
+import threading
+import time
+
+# KORMARC 발행국 부호 (008/15-17) 조회
+# - 국내 시·도 부호표를 코드에 내장해 두고, 구글 시트 Sheet2는 덮어쓰기(override) 용도로만 사용
+# - Sheet2는 백그라운드 스레드에서 주기적으로 다시 읽어 병합
+
+UNKNOWN_COUNTRY_CODE = "xxu"
+
+# 지역명 표기 → 발행국 부호 (정규화 전 원본 표기, 자주 쓰이는 이형 포함)
+_BUILTIN_REGIONS = {
+    "ulk": ["서울특별시", "서울시", "서울"],
+    "bnk": ["부산광역시", "부산시", "부산"],
+    "tgk": ["대구광역시", "대구시", "대구"],
+    "ick": ["인천광역시", "인천시", "인천"],
+    "kjk": ["광주광역시", "광주"],
+    "tjk": ["대전광역시", "대전시", "대전"],
+    "usk": ["울산광역시", "울산시", "울산"],
+    "sjk": ["세종특별자치시", "세종시", "세종"],
+    "ggk": ["경기도", "경기"],
+    "gak": ["강원도", "강원특별자치도", "강원"],
+    "hbk": ["충청북도", "충북"],
+    "hck": ["충청남도", "충남"],
+    "jbk": ["전라북도", "전북특별자치도", "전북"],
+    "jnk": ["전라남도", "전남"],
+    "gbk": ["경상북도", "경북"],
+    "gnk": ["경상남도", "경남"],
+    "jjk": ["제주특별자치도", "제주도", "제주"],
+}
+
+_REGION_SUFFIX_RE = re.compile(r"(광역시|특별시|특별자치도)")
+
+
+# ✅ 정규화 함수
+def normalize_region(region):
+    region = region.strip()
+
+    # 1. 특별자치도 제거 (단, 따로 표시해 기억)
+    was_teukbyeol = "특별자치도" in region
+    region = _REGION_SUFFIX_RE.sub("", region)
+
+    # 2. 예외 처리
+    if region in ["강원도", "제주도", "경기도"]:
+        return region.replace("도", "")
+
+    # 3. ~도 처리 (특별자치도였던 항목은 여기서 제외)
+    if region.endswith("도") and len(region) >= 4 and not was_teukbyeol:
+        return region[0] + region[2]
+
+    # 4. ~시 처리
+    if region.endswith("시"):
+        return region[:-1]
+
+    return region
+
+
+# 내장 부호표: 정규화된 지역명 → 부호 (import 시 1회 구성)
+BUILTIN_COUNTRY_CODES = {
+    normalize_region(region): code
+    for code, regions in _BUILTIN_REGIONS.items()
+    for region in regions
+}
+
+
+# 🔹 내장 부호표 + Sheet2 덮어쓰기
+class CountryCodeTable:
+    def __init__(self, worksheet_name="Sheet2", refresh_interval=3600):
+        self.worksheet_name = worksheet_name
+        self.refresh_interval = refresh_interval
+        self._codes = dict(BUILTIN_COUNTRY_CODES)
+        self._refresher = None
+        self._refresher_lock = threading.Lock()
+
+    def load_overrides(self):
+        from sheet_snapshot import get_sheet_snapshot
+
+        rows = get_sheet_snapshot().values(self.worksheet_name, 0, 1)  # A열: 지역명, B열: 발행국 부호
+
+        codes = dict(BUILTIN_COUNTRY_CODES)
+        overrides = {}
+        for row in rows:
+            if len(row) < 2 or not row[0].strip():
+                continue
+            # 시트 위쪽 행이 우선 (기존 순차 탐색과 동일)
+            overrides.setdefault(normalize_region(row[0]), row[1].strip() or UNKNOWN_COUNTRY_CODE)
+        codes.update(overrides)
+        self._codes = codes
+
+    def start_background_refresh(self):
+        with self._refresher_lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(
+                    target=self._refresh_loop, name="country-code-refresh", daemon=True
+                )
+                self._refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            try:
+                self.load_overrides()
+            except Exception:
+                pass  # 시트를 못 읽어도 내장 부호표(또는 직전 병합본)로 계속 응답
+            time.sleep(self.refresh_interval)
+
+    def lookup(self, region_name):
+        codes = self._codes
+        code = codes.get(normalize_region(region_name))
+        if code is None and region_name.strip():
+            # "경기도 파주시"처럼 시·군이 붙은 경우 첫 단어(시·도)로 다시 조회
+            code = codes.get(normalize_region(region_name.split()[0]))
+        return code or UNKNOWN_COUNTRY_CODE
+
+
+_country_code_table = None
+_country_code_table_lock = threading.Lock()
+
+
+def get_country_code_table():
+    global _country_code_table
+    with _country_code_table_lock:
+        if _country_code_table is None:
+            _country_code_table = CountryCodeTable()
+            _country_code_table.start_background_refresh()
+        return _country_code_table
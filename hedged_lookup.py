@@ -0,0 +1,265 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import http_client
+from aladin_parse import format_300, normalize_creator, parse_detail_page
+from instrumentation import carry_trace, timed
+from kormarc_core import (
+    build_book_info, describe_publisher_match, fetch_aladin_detail_html, fetch_aladin_detail_link,
+    get_country_code_by_region, match_publisher_location, physical_from_api, resolve_aladin_record
+)
+from kpipa import get_kpipa_client
+from response_cache import get_response_cache
+
+# 여러 출처에 나눠 묻는 ISBN 조회 (hedged request)
+# - 1차 출처(알라딘 API)를 먼저 보내고, HEDGE_DELAY 초 안에 모든 항목이 채워지지 않으면
+#   2차 출처(알라딘 상세페이지, BNK 상세페이지)를 함께 보냄 (1차가 빈 항목을 남기고 끝나도 바로 보냄)
+# - 항목(서명·저자·출판사·발행년·형태사항)마다 가장 먼저 온 완전한 값을 사용, 어느 출처인지 기록
+# - 모든 항목이 채워지면 아직 시작 안 한 요청은 취소하고, 진행 중인 요청은 기다리지 않음
+#   (파이썬 스레드는 도중에 멈출 수 없어 응답은 받되 버림 — 응답 캐시에는 남아 다음 조회에 쓰임)
+# - 저자는 출처마다 모양이 달라("한강 (지은이)" / "한강 지음") aladin_parse.normalize_creator로 맞춤
+#   → 어느 출처가 먼저 와도, 일반 변환(convert_isbn)과도 245 $c 모양이 같음
+# - 출처별 요청은 스레드 풀에서 실행되므로 호출한 스레드의 기록(trace)을 이어 붙여 단계·요청 수를 남김
+# - KOMARC_HEDGE_DELAY 로 기본 지연 변경 (호출마다 resolve(..., delay=)로 지정 가능)
+
+HEDGE_DELAY = float(os.environ.get("KOMARC_HEDGE_DELAY", "0.8"))  # 초
+HEDGE_WORKERS = 32  # 출처별 요청용 스레드 (ISBN 동시 처리 수 × 출처 수 이상)
+
+FIELDS = ("title", "creator", "publisher", "pubyear", "physical")
+
+# 출처별로 채울 수 있는 항목 (BNK 상세페이지는 출판사만)
+SOURCE_FIELDS = {
+    "aladin_api": FIELDS,
+    "aladin_crawl": FIELDS,
+    "kpipa": ("publisher",),
+}
+
+SOURCE_LABELS = {
+    "aladin_api": "알라딘 API",
+    "aladin_crawl": "알라딘 상세",
+    "kpipa": "BNK",
+}
+FIELD_LABELS = {
+    "title": "서명",
+    "creator": "저자",
+    "publisher": "출판사",
+    "pubyear": "발행년",
+    "physical": "형태사항",
+}
+
+# 빈 값 대신 기존 변환기가 쓰던 표시
+PLACEHOLDERS = {
+    "title": "제목 없음",
+    "creator": "저자 정보 없음",
+    "publisher": "출판사 정보 없음",
+    "pubyear": "발행년도 없음",
+    "physical": (0, 0, 0),
+}
+KPIPA_MESSAGES = ("검색 결과 없음", "상세페이지 링크 없음", "출판사 정보 없음")
+
+
+# 🔹 값이 MARC에 바로 쓸 수 있을 만큼 완전한지
+def is_complete(field, value):
+    if not value or value == PLACEHOLDERS[field]:
+        return False
+    if field == "pubyear":
+        return len(value) == 4 and value.isdigit()
+    if field == "physical":
+        pages, width, height = value
+        return bool(pages or (width and height))
+    return True
+
+
+# --- 출처별 조회: 찾은 항목만 dict로 반환, 요청 실패는 예외 ---
+def from_aladin_api(isbn, use_cache=True):
+    record = resolve_aladin_record(isbn, use_cache)
+    if record["blocked"]:
+        raise http_client.HostBlocked(record["error"])
+    result, error = build_book_info(record)
+    if error:
+        if record["item"] is None and error != "도서 정보를 찾을 수 없습니다.":
+            raise http_client.FetchError(error)
+        return {}
+    return {
+        "title": result["title"],
+        "creator": normalize_creator(record["item"].get("author", "").split(",")),
+        "publisher": result["publisher"],
+        "pubyear": result["pubyear"],
+        "physical": physical_from_api(record),
+    }
+
+
+def from_aladin_crawl(isbn, use_cache=True):
+    cache = get_response_cache()
+    detail_url = cache.get_or_fetch("aladin_search", isbn, lambda: fetch_aladin_detail_link(isbn), use_cache)
+    if not detail_url:
+        return {}
+    parsed = parse_detail_page(
+        cache.get_or_fetch("aladin_detail", isbn, lambda: fetch_aladin_detail_html(detail_url), use_cache)
+    )
+    return {
+        "title": parsed["title"],
+        "creator": normalize_creator(parsed["authors"]),
+        "publisher": parsed["publisher"],
+        "pubyear": parsed["pubyear"],
+        "physical": (parsed["pages"], parsed["width"], parsed["height"]),
+    }
+
+
+def from_kpipa(isbn, use_cache=True):
+    publisher = get_kpipa_client().lookup(isbn, use_cache)
+    return {} if publisher in KPIPA_MESSAGES else {"publisher": publisher}
+
+
+# (이름, 조회 함수) — 첫 번째가 1차 출처
+SOURCES = (
+    ("aladin_api", from_aladin_api),
+    ("aladin_crawl", from_aladin_crawl),
+    ("kpipa", from_kpipa),
+)
+
+
+class HedgedResolver:
+    def __init__(self, sources=SOURCES, delay=HEDGE_DELAY, workers=HEDGE_WORKERS):
+        self.sources = sources
+        self.delay = delay
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self.wins = {name: 0 for name, _ in sources}
+        self.hedges = 0
+
+    # 🔹 ISBN 1건 → {"fields": {항목: 값}, "sources": {항목: 출처}, "errors": {출처: 오류}, "blocked": [차단된 출처]}
+    # delay: 이 호출의 2차 출처 대기(초), None이면 self.delay (화면에서는 세션별 값을 넘김)
+    @timed("hedged_lookup")
+    def resolve(self, isbn, use_cache=True, delay=None):
+        delay = self.delay if delay is None else delay
+        fields, winners, errors = {}, {}, {}
+        blocked = []
+
+        (primary_name, primary), *secondary = self.sources
+        futures = {self._pool.submit(carry_trace(primary), isbn, use_cache): primary_name}
+        started = time.monotonic()
+        hedged = not secondary
+
+        while futures:
+            timeout = None if hedged else max(delay - (time.monotonic() - started), 0)
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = futures.pop(future)
+                try:
+                    found = future.result()
+                except http_client.HostBlocked as e:
+                    errors[name] = str(e)
+                    blocked.append(name)
+                    continue
+                except Exception as e:
+                    errors[name] = str(e)
+                    continue
+                for field in FIELDS:
+                    if field not in fields and is_complete(field, found.get(field)):
+                        fields[field] = found[field]
+                        winners[field] = name
+
+            if len(fields) == len(FIELDS):
+                break
+            # 1차가 늦거나(지연 초과) 빈 항목을 남기고 끝났으면 2차 출처도 보냄
+            if not hedged and (not futures or time.monotonic() - started >= delay):
+                hedged = True
+                with self._lock:
+                    self.hedges += 1
+                for name, source in secondary:
+                    futures[self._pool.submit(carry_trace(source), isbn, use_cache)] = name
+
+        for future in futures:
+            future.cancel()
+
+        with self._lock:
+            for name in winners.values():
+                self.wins[name] += 1
+        return {"fields": fields, "sources": winners, "errors": errors, "blocked": blocked}
+
+    def stats(self):
+        with self._lock:
+            return {"hedges": self.hedges, "wins": dict(self.wins)}
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_hedged_resolver():
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = HedgedResolver()
+    return _resolver
+
+
+# 🔹 "출처: 서명 알라딘 API · 출판사 BNK ..." (화면 표시용)
+def describe_sources(winners):
+    return " · ".join(
+        f"{FIELD_LABELS[field]} {SOURCE_LABELS[winners[field]]}" for field in FIELDS if field in winners
+    )
+
+
+# --- ISBN 1건 변환 (convert_isbn과 같은 모양의 결과 + 항목별 출처) ---
+def convert_isbn_hedged(isbn, use_cache=True, delay=None):
+    found = get_hedged_resolver().resolve(isbn, use_cache, delay)
+    fields = found["fields"]
+    debug_messages = [f"⚠️ {SOURCE_LABELS[name]} 조회 실패: {error}" for name, error in found["errors"].items()]
+
+    # 빈 항목을 채울 수 있었던 출처가 차단됐으면 대체값으로 레코드를 만들지 않고 다시 조회
+    # (BNK가 차단돼도 출판사를 이미 찾았으면 다시 조회하지 않음)
+    missing = set(FIELDS) - set(fields)
+    requeue_sources = [name for name in found["blocked"] if missing & set(SOURCE_FIELDS.get(name, FIELDS))]
+    requeue = bool(requeue_sources)
+    if requeue:
+        labels = ", ".join(SOURCE_LABELS[name] for name in requeue_sources)
+        debug_messages.append(f"⏸️ {labels} 접속이 일시 중지되어 이 ISBN은 나중에 다시 조회합니다.")
+    if not fields or requeue:
+        if not requeue:
+            debug_messages.append("⚠️ 결과 없음")
+        return {
+            "isbn": isbn, "result": None, "error": "; ".join(found["errors"].values()) or "도서 정보를 찾을 수 없습니다.",
+            "location": None, "country_code": None, "300": None, "300_warning": None, "physical": (0, 0, 0),
+            "debug_messages": debug_messages, "requeue": requeue, "field_sources": found["sources"],
+        }
+
+    values = {field: fields.get(field, PLACEHOLDERS[field]) for field in FIELDS}
+    result = {
+        "title": values["title"],
+        "creator": values["creator"],
+        "publisher": values["publisher"],
+        "pubyear": values["pubyear"],
+        "245": f"=245  10$a{values['title']} /$c{values['creator']}",
+    }
+
+    if values["publisher"] == PLACEHOLDERS["publisher"]:
+        location = "[출판지 미상]"
+    else:
+        match = match_publisher_location(values["publisher"], use_cache)
+        location = match["location"]
+        debug_messages.append(f"🏙️ 지역정보 결과: **{location}**")
+        debug_messages.append(describe_publisher_match(match))
+
+    warning_300 = None if "physical" in fields else "형태사항을 찾지 못함"
+    if warning_300:
+        debug_messages.append(f"⚠️ 형태사항 크롤링 경고: {warning_300}")
+
+    return {
+        "isbn": isbn,
+        "result": result,
+        "error": None,
+        "location": location,
+        "country_code": get_country_code_by_region(location),
+        "300": format_300(*values["physical"]),
+        "300_warning": warning_300,
+        "physical": values["physical"],
+        "debug_messages": debug_messages,
+        "requeue": False,
+        "field_sources": found["sources"],
+    }
@@ -0,0 +1,181 @@
+import threading
+import time
+
+# 호스트별 요청 속도 조절 + 차단기(circuit breaker)
+# - 토큰 버킷: 호스트마다 초당 요청 수(rate) 만큼 토큰을 채우고, 요청마다 하나씩 사용
+# - 속도는 응답에 맞춰 조정 (AIMD): 정상 응답마다 조금씩 올리고, 429/5xx를 받으면 절반으로
+# - 차단 페이지(캡차 등)를 받거나 재시도 후에도 429/5xx가 연달아 나면 호스트를 잠시 멈춤(open)
+#   → 멈춘 동안의 요청은 네트워크에 나가지 않고 바로 실패, 호출부는 ISBN을 다시 대기열에 넣음
+#   → 멈춤 시간이 지나면 요청 하나만 시험으로 보내고(half-open), 성공하면 정상으로 복귀
+#     시험 요청이 나가 있는 동안 다른 요청은 거절하지 않고 결과를 기다림 (실패하면 그때 거절)
+# - 반복해서 멈추면 멈춤 시간을 두 배씩 늘림 (최대 MAX_COOLDOWN)
+
+DEFAULT_RATE = 10.0       # 시작 속도 (요청/초)
+DEFAULT_MIN_RATE = 0.5
+DEFAULT_MAX_RATE = 50.0
+RATE_INCREASE = 0.5       # 정상 응답 1건마다 더할 속도
+RATE_DECREASE = 0.5       # 429/5xx 때 곱할 비율
+
+FAILURE_THRESHOLD = 3     # 연속 실패 몇 번에 멈출지
+COOLDOWN = 30.0           # 첫 멈춤 시간(초)
+MAX_COOLDOWN = 600.0
+TRIAL_TIMEOUT = 60.0      # 시험 요청 결과가 이만큼 안 오면(중단 등) 다른 요청을 새 시험으로
+TRIAL_POLL = 0.2          # wait_for_hosts가 시험 요청 결과를 확인하는 간격(초)
+
+
+class HostThrottle:
+    def __init__(self, host, rate=DEFAULT_RATE, min_rate=DEFAULT_MIN_RATE, max_rate=DEFAULT_MAX_RATE):
+        self.host = host
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+
+        self.failures = 0
+        self.cooldown = COOLDOWN
+        self.open_until = 0.0
+        self.trial = False      # half-open 시험 요청이 나가 있는지
+        self.trial_started = 0.0
+        self.open_reason = None
+        self.counts = {"ok": 0, "throttled": 0, "blocked": 0, "rejected": 0}
+        self._lock = threading.Condition()  # 시험 요청 결과를 기다리는 요청을 깨움
+
+    # 🔹 요청 전: 멈춘 상태면 남은 시간(초)을 반환(요청하지 말 것), 아니면 토큰을 받을 때까지 기다린 뒤 0
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.open_until:
+                    if now < self.open_until:
+                        self.counts["rejected"] += 1
+                        return self.open_until - now
+                    if self.trial and now - self.trial_started < TRIAL_TIMEOUT:
+                        # 시험 요청 결과를 기다림 → 성공하면 아래 토큰 버킷으로, 실패하면 다시 멈춰 거절
+                        self._lock.wait(TRIAL_TIMEOUT - (now - self.trial_started))
+                        continue
+                    self.trial = True  # 멈춤 시간이 지남 → 이 요청 하나만 시험으로
+                    self.trial_started = now
+                    return 0
+
+                burst = max(self.rate, 1.0)
+                self.tokens = min(burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return 0
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    # 🔹 정상 응답
+    def on_success(self):
+        with self._lock:
+            self.counts["ok"] += 1
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+            self.failures = 0
+            if self.open_until:
+                self.open_until = 0.0
+                self.trial = False
+                self.cooldown = COOLDOWN
+                self.open_reason = None
+                self._lock.notify_all()
+
+    # 🔹 429/5xx: 속도를 낮춤. final=True(재시도 후에도 실패)면 연속 실패로 세어 멈출지 판단
+    def on_throttle(self, final=True):
+        with self._lock:
+            self.counts["throttled"] += 1
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+            self.tokens = min(self.tokens, 0.0)
+            if final:
+                self.failures += 1
+                if self.failures >= FAILURE_THRESHOLD or self.trial:
+                    self._open("429/5xx 응답 반복")
+
+    # 🔹 차단 페이지(캡차 등): 바로 멈춤
+    def on_block(self, reason):
+        with self._lock:
+            self.counts["blocked"] += 1
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+            self._open(reason)
+
+    # 연결 오류 등: 속도는 그대로, 시험 요청이었다면 다시 멈춤
+    def on_error(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= FAILURE_THRESHOLD or self.trial:
+                self._open("연결 오류 반복")
+
+    def _open(self, reason):
+        if self.open_until:
+            self.cooldown = min(self.cooldown * 2, MAX_COOLDOWN)  # 시험 요청도 실패 → 더 오래
+        self.open_until = time.monotonic() + self.cooldown
+        self.trial = False
+        self.failures = 0
+        self.open_reason = reason
+        self._lock.notify_all()
+
+    def remaining(self):
+        with self._lock:
+            return max(self.open_until - time.monotonic(), 0.0) if self.open_until else 0.0
+
+    # 다시 조회하기 전에 기다릴 시간: 멈춤 중이면 남은 시간, 시험 요청이 나가 있으면 TRIAL_POLL, 아니면 0
+    # (멈춤 시간이 지났고 시험 요청이 없으면 0 → 다음 요청이 시험 요청이 됨)
+    def settle_time(self):
+        with self._lock:
+            if not self.open_until:
+                return 0.0
+            now = time.monotonic()
+            if now < self.open_until:
+                return self.open_until - now
+            if self.trial and now - self.trial_started < TRIAL_TIMEOUT:
+                return TRIAL_POLL
+            return 0.0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "host": self.host,
+                "rate": round(self.rate, 2),
+                "paused_for": round(max(self.open_until - time.monotonic(), 0.0), 1) if self.open_until else 0.0,
+                "reason": self.open_reason,
+                **self.counts,
+            }
+
+
+_host_rates = {}
+_throttles = {}
+_throttles_lock = threading.Lock()
+
+
+def set_host_rate(host, rate=DEFAULT_RATE, min_rate=DEFAULT_MIN_RATE, max_rate=DEFAULT_MAX_RATE):
+    with _throttles_lock:
+        _host_rates[host] = (rate, min_rate, max_rate)
+        _throttles[host] = HostThrottle(host, rate, min_rate, max_rate)
+
+
+def get_host_throttle(host):
+    with _throttles_lock:
+        throttle = _throttles.get(host)
+        if throttle is None:
+            throttle = _throttles[host] = HostThrottle(host, *_host_rates.get(host, ()))
+        return throttle
+
+
+# 🔹 멈춘 호스트가 다시 열릴 때까지 대기 (다시 대기열에 넣은 ISBN을 재시도하기 전)
+# 멈춤 시간이 남았거나 시험 요청 결과를 기다리는 호스트가 있으면 계속 대기 → 반환값은 기다린 시간(초)
+def wait_for_hosts(max_wait=MAX_COOLDOWN):
+    started = time.monotonic()
+    while True:
+        with _throttles_lock:
+            throttles = list(_throttles.values())
+        wait = max((throttle.settle_time() for throttle in throttles), default=0.0)
+        left = max_wait - (time.monotonic() - started)
+        if not wait or left <= 0:
+            return time.monotonic() - started
+        time.sleep(min(wait, left))
+
+
+def host_stats():
+    with _throttles_lock:
+        throttles = list(_throttles.values())
+    return [throttle.stats() for throttle in throttles]
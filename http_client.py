@@ -0,0 +1,132 @@
+import threading
+from urllib.parse import urlsplit
+
+from batch_runner import host_slot
+from host_throttle import get_host_throttle
+from instrumentation import record_http
+
+# 알라딘 / KPIPA 공용 HTTP 클라이언트
+# - 세션 하나를 공유해 호스트별 커넥션 풀(keep-alive) 재사용
+# - 모든 요청에 connect/read 타임아웃 지정
+# - 429/5xx 및 연결 오류는 지수 백오프로 재시도
+# - User-Agent는 여기서만 지정
+# - 호스트별 속도 조절·차단기(host_throttle): 429/5xx에 맞춰 속도를 낮추고,
+#   차단 페이지(캡차 등)나 반복 실패 시 호스트를 잠시 멈춤 → HostBlocked (결과 없음과 구분)
+
+USER_AGENT = "Mozilla/5.0"
+
+CONNECT_TIMEOUT = 5   # 초
+READ_TIMEOUT = 20     # 초
+
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5   # 0.5s → 1s → 2s
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+POOL_CONNECTIONS = 8  # 풀을 유지할 호스트 수
+POOL_MAXSIZE = 16     # 호스트당 커넥션 수 (동시 처리 수 이상)
+
+# 차단·캡차 페이지 표시 (정상 페이지보다 훨씬 작으므로 작은 HTML 응답만 검사)
+BLOCK_MARKERS = ("captcha", "자동입력 방지", "자동입력방지", "비정상적인 접근", "접근이 차단", "access denied")
+BLOCK_PAGE_MAX_BYTES = 50_000
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "POST"]),  # KPIPA 검색 POST도 조회용이라 재시도 안전
+        respect_retry_after_header=True,
+        raise_on_status=False  # 재시도 소진 시 마지막 응답을 그대로 반환 → 호출부에서 status 확인
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+# 🔹 차단 페이지 판별 → 사유 문자열 또는 None
+def detect_block(response):
+    if response.status_code == 403:
+        return "403 응답"
+    if "html" not in response.headers.get("Content-Type", "") or len(response.content) > BLOCK_PAGE_MAX_BYTES:
+        return None
+    text = response.text.lower()
+    for marker in BLOCK_MARKERS:
+        if marker in text:
+            return f"차단 페이지 ({marker})"
+    return None
+
+
+# urllib3가 내부에서 재시도한 429/5xx 횟수 (속도 조절에 반영)
+def _retried_statuses(response):
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    history = getattr(retries, "history", None) or ()
+    return sum(1 for entry in history if entry.status in RETRY_STATUSES)
+
+
+# 🔹 공용 요청 함수 (호스트별 속도 조절·동시 요청 수 제한 포함)
+def request(method, url, **kwargs):
+    kwargs.setdefault("timeout", (CONNECT_TIMEOUT, READ_TIMEOUT))
+    host = urlsplit(url).hostname
+    throttle = get_host_throttle(host)
+
+    paused_for = throttle.acquire()
+    if paused_for:
+        raise HostBlocked(f"{host} 접속 일시 중지 ({throttle.open_reason}, {paused_for:.0f}초 후 재개)")
+
+    try:
+        with host_slot(host):
+            response = get_session().request(method, url, **kwargs)
+    except Exception:
+        throttle.on_error()
+        raise
+    record_http(len(response.content))
+
+    block_reason = detect_block(response)
+    if block_reason:
+        throttle.on_block(block_reason)
+        raise HostBlocked(f"{host} {block_reason}")
+    for _ in range(_retried_statuses(response)):
+        throttle.on_throttle(final=False)
+    if response.status_code in RETRY_STATUSES:
+        throttle.on_throttle()
+    else:
+        throttle.on_success()
+    return response
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+# 🔹 재시도 후에도 정상 응답을 받지 못한 경우 (캐시에 저장하지 않음)
+class FetchError(Exception):
+    pass
+
+
+# 🔹 차단 페이지를 받았거나 호스트가 일시 중지된 경우 → 결과 없음이 아니라 나중에 다시 조회할 대상
+class HostBlocked(FetchError):
+    pass
@@ -0,0 +1,204 @@
+import csv
+import functools
+import io
+import json
+import math
+import threading
+import time
+
+# ISBN 단위 처리 과정 계측
+# - 단계(stage)별 소요 시간, HTTP 요청 수·수신 바이트, 응답 캐시 적중/누락
+# - traced(worker)로 감싼 작업이 ISBN 1건의 기록(trace)을 만들고, 그 안에서 호출되는
+#   @timed("단계") 함수·http_client·response_cache 가 현재 스레드의 기록에 값을 더함
+# - 단계 시간은 자기 시간만 계산 (안쪽 단계 시간은 바깥 단계에서 뺌) → 단계 합 ≒ 전체
+# - 다른 스레드에 넘기는 작업은 carry_trace(func)로 감싸면 같은 기록에 더함
+#   (단계 중첩은 스레드마다 따로 계산, 동시에 실행된 단계는 시간이 겹쳐 단계 합이 전체보다 클 수 있음)
+# - 기록 중이 아니면(trace 없음) 아무것도 하지 않음
+# - summarize()로 단계별 p50/p95, traces_to_json()/traces_to_csv()로 내보내기
+
+_local = threading.local()
+
+
+class Trace:
+    def __init__(self, isbn):
+        self.isbn = isbn
+        self.started = time.perf_counter()
+        self.total_ms = 0.0
+        self.stages = {}
+        self.cache = {"hit": 0, "miss": 0}
+        self._lock = threading.Lock()  # carry_trace로 여러 스레드가 함께 기록
+
+    def _stage(self, name):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {"ms": 0.0, "calls": 0, "requests": 0, "bytes": 0}
+        return stage
+
+    def add_http(self, stage_name, size):
+        with self._lock:
+            stage = self._stage(stage_name)
+            stage["requests"] += 1
+            stage["bytes"] += size
+
+    def add_stage(self, stage_name, ms):
+        with self._lock:
+            stage = self._stage(stage_name)
+            stage["ms"] += ms
+            stage["calls"] += 1
+
+    def add_cache(self, hit):
+        with self._lock:
+            self.cache["hit" if hit else "miss"] += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "isbn": self.isbn,
+                "total_ms": round(self.total_ms, 1),
+                "stages": {name: dict(stage, ms=round(stage["ms"], 1)) for name, stage in self.stages.items()},
+                "cache": dict(self.cache),
+            }
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+# 이 스레드에서 trace에 기록 (진행 중인 단계 목록은 스레드마다 따로)
+def _enter(trace):
+    previous = (getattr(_local, "trace", None), getattr(_local, "stack", None))
+    _local.trace, _local.stack = trace, []
+    return previous
+
+
+def _leave(previous):
+    _local.trace, _local.stack = previous
+
+
+# 🔹 작업 함수 감싸기: ISBN 1건을 기록하고 결과 dict에 "trace"로 붙임
+def traced(worker):
+    @functools.wraps(worker)
+    def wrapper(isbn, **kwargs):
+        trace = Trace(isbn)
+        previous = _enter(trace)
+        try:
+            outcome = worker(isbn, **kwargs)
+        finally:
+            trace.total_ms = (time.perf_counter() - trace.started) * 1000
+            _leave(previous)
+        if isinstance(outcome, dict):
+            outcome["trace"] = trace.to_dict()
+        return outcome
+    return wrapper
+
+
+# 🔹 다른 스레드(스레드 풀 등)에서 실행할 함수를 현재 기록에 이어 붙임 (기록 중이 아니면 그대로 반환)
+def carry_trace(func):
+    trace = current_trace()
+    if trace is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = _enter(trace)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _leave(previous)
+    return wrapper
+
+
+# 🔹 단계 계측 데코레이터 (같은 단계가 여러 번 불리면 합산)
+def timed(stage_name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = getattr(_local, "trace", None)
+            if trace is None:
+                return func(*args, **kwargs)
+
+            stack = _local.stack
+            frame = [stage_name, 0.0]  # [단계, 안쪽 단계에 쓴 시간]
+            stack.append(frame)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = (time.perf_counter() - started) * 1000
+                stack.pop()
+                if stack:
+                    stack[-1][1] += elapsed
+                trace.add_stage(stage_name, elapsed - frame[1])
+        return wrapper
+    return decorator
+
+
+def record_http(size):
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        # 진행 중인 가장 안쪽 단계에 귀속 (단계 밖이면 "other")
+        trace.add_http(_local.stack[-1][0] if _local.stack else "other", size)
+
+
+def record_cache(hit):
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace.add_cache(hit)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct * len(ordered) / 100) - 1))  # nearest-rank
+    return ordered[rank]
+
+
+# 🔹 trace 목록 → 단계별 요약 [{"stage", "isbns", "p50_ms", "p95_ms", "requests", "bytes"}, ...]
+def summarize(traces):
+    per_stage = {}
+    for trace in traces:
+        for name, stage in trace["stages"].items():
+            per_stage.setdefault(name, []).append(stage)
+    per_stage["total"] = [
+        {
+            "ms": trace["total_ms"],
+            "requests": sum(stage["requests"] for stage in trace["stages"].values()),
+            "bytes": sum(stage["bytes"] for stage in trace["stages"].values()),
+        }
+        for trace in traces
+    ]
+
+    rows = []
+    for name, stages in per_stage.items():
+        timings = [stage["ms"] for stage in stages]
+        rows.append({
+            "stage": name,
+            "isbns": len(stages),
+            "p50_ms": round(percentile(timings, 50), 1),
+            "p95_ms": round(percentile(timings, 95), 1),
+            "requests": sum(stage["requests"] for stage in stages),
+            "bytes": sum(stage["bytes"] for stage in stages),
+        })
+    return rows
+
+
+def traces_to_json(traces):
+    return json.dumps(traces, ensure_ascii=False, indent=2)
+
+
+CSV_COLUMNS = ["isbn", "stage", "ms", "calls", "requests", "bytes", "cache_hit", "cache_miss", "total_ms"]
+
+
+# 🔹 ISBN × 단계 한 줄씩
+def traces_to_csv(traces):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(CSV_COLUMNS)
+    for trace in traces:
+        for name, stage in trace["stages"].items():
+            writer.writerow([
+                trace["isbn"], name, stage["ms"], stage["calls"], stage["requests"], stage["bytes"],
+                trace["cache"]["hit"], trace["cache"]["miss"], trace["total_ms"],
+            ])
+    return out.getvalue()
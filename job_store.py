@@ -0,0 +1,208 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# 일괄 변환 작업 저장소 (SQLite) — 중단된 대량 변환을 이어서 실행
+# - 작업(job)마다 ISBN별 상태를 기록: pending(대기) / running(처리 중) / done(완료) / failed(실패, 사유)
+# - 완료되는 즉시 생성된 필드(화면용 텍스트 + MARC 레코드)를 저장 → 언제든 내보내기 가능
+# - 여러 작업 프로세스가 같은 파일을 열어 대기 항목을 나눠 가져감(claim) — BEGIN IMMEDIATE로 한 번에 한 프로세스만
+# - 처리 중에 죽은 프로세스의 항목은 CLAIM_TIMEOUT 뒤 다시 대기로 돌아감
+# - 완료된 ISBN은 다시 조회하지 않음 (새 작업에 같은 ISBN이 있으면 이전 완료 결과를 그대로 사용)
+# - KOMARC_JOBS_PATH 로 위치 변경
+
+DEFAULT_JOBS_PATH = os.path.join(os.path.expanduser("~"), ".cache", "komarc", "jobs.sqlite3")
+
+STATES = ("pending", "running", "done", "failed")
+CLAIM_TIMEOUT = 30 * 60  # 초: 이보다 오래 running인 항목은 작업 프로세스가 죽은 것으로 봄
+INSERT_CHUNK = 1000
+
+
+class JobStore:
+    def __init__(self, path=DEFAULT_JOBS_PATH, claim_timeout=CLAIM_TIMEOUT):
+        self.path = path
+        self.claim_timeout = claim_timeout
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                options TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                isbn TEXT NOT NULL,
+                state TEXT NOT NULL,
+                reason TEXT,
+                fields TEXT,
+                claimed_by TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (job_id, seq)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS job_items_state ON job_items (job_id, state, seq)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS job_items_isbn ON job_items (isbn, state)")
+
+    # 여러 문장을 한 트랜잭션으로 (IMMEDIATE: 다른 프로세스의 쓰기와 겹치지 않게 처음부터 쓰기 잠금)
+    def _transaction(self, statements):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = statements(self._conn)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    # 🔹 새 작업: ISBN을 입력 순서대로 대기 상태로 등록 (이전 작업에서 완료된 ISBN은 결과를 복사해 바로 완료)
+    def create_job(self, isbns, options=None):
+        job_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        now = time.time()
+
+        def insert(conn):
+            conn.execute(
+                "INSERT INTO jobs (id, created_at, options) VALUES (?, ?, ?)",
+                (job_id, now, json.dumps(options or {}, ensure_ascii=False))
+            )
+            chunk = []
+            for seq, isbn in enumerate(isbns, 1):
+                chunk.append((job_id, seq, isbn, "pending", now))
+                if len(chunk) >= INSERT_CHUNK:
+                    conn.executemany(
+                        "INSERT INTO job_items (job_id, seq, isbn, state, updated_at) VALUES (?, ?, ?, ?, ?)", chunk
+                    )
+                    chunk = []
+            conn.executemany("INSERT INTO job_items (job_id, seq, isbn, state, updated_at) VALUES (?, ?, ?, ?, ?)", chunk)
+            conn.execute("""
+                UPDATE job_items SET state = 'done', reason = '이전 작업 결과 사용', fields = (
+                    SELECT d.fields FROM job_items d
+                    WHERE d.isbn = job_items.isbn AND d.state = 'done' AND d.job_id != job_items.job_id
+                    ORDER BY d.updated_at DESC LIMIT 1
+                )
+                WHERE job_id = ? AND EXISTS (
+                    SELECT 1 FROM job_items d
+                    WHERE d.isbn = job_items.isbn AND d.state = 'done' AND d.job_id != job_items.job_id
+                )
+            """, (job_id,))
+
+        self._transaction(insert)
+        return job_id
+
+    def get_job(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT id, created_at, options FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "created_at": row[1], "options": json.loads(row[2])}
+
+    def list_jobs(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM jobs ORDER BY created_at").fetchall()
+        return [{**self.get_job(job_id), "counts": self.counts(job_id)} for job_id, in rows]
+
+    def latest_job(self):
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM jobs ORDER BY created_at DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    # 🔹 대기 항목을 최대 limit개 가져가 running으로 표시 → [(순번, ISBN), ...]
+    # 오래 running인 항목(죽은 프로세스)도 함께 다시 가져감
+    def claim(self, job_id, worker_id, limit):
+        now = time.time()
+
+        def take(conn):
+            rows = conn.execute("""
+                SELECT seq, isbn FROM job_items
+                WHERE job_id = ? AND (state = 'pending' OR (state = 'running' AND updated_at < ?))
+                ORDER BY seq LIMIT ?
+            """, (job_id, now - self.claim_timeout, limit)).fetchall()
+            conn.executemany(
+                "UPDATE job_items SET state = 'running', claimed_by = ?, updated_at = ? WHERE job_id = ? AND seq = ?",
+                [(worker_id, now, job_id, seq) for seq, _ in rows]
+            )
+            return rows
+
+        return self._transaction(take)
+
+    # 🔹 완료: 생성된 필드 저장
+    def complete(self, job_id, seq, fields, warning=None):
+        self._set(job_id, seq, "done", warning, json.dumps(fields, ensure_ascii=False))
+
+    # 🔹 실패: 사유 저장 (retry_failed로 다시 대기)
+    def fail(self, job_id, seq, reason):
+        self._set(job_id, seq, "failed", reason, None)
+
+    # 이미 완료된 항목은 덮어쓰지 않음 (오래 걸린 프로세스와 다시 가져간 프로세스가 겹친 경우)
+    def _set(self, job_id, seq, state, reason, fields):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_items SET state = ?, reason = ?, fields = ?, claimed_by = NULL, updated_at = ? "
+                "WHERE job_id = ? AND seq = ? AND state != 'done'",
+                (state, reason, fields, time.time(), job_id, seq)
+            )
+
+    # 🔹 작업 프로세스가 끝날 때(중단 포함) 가져간 채 남은 항목을 대기로 되돌림
+    def release(self, job_id, worker_id):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_items SET state = 'pending', claimed_by = NULL, updated_at = ? "
+                "WHERE job_id = ? AND state = 'running' AND claimed_by = ?",
+                (time.time(), job_id, worker_id)
+            )
+
+    # 🔹 실패 항목만 다시 대기로 → 반환값은 되돌린 수
+    def retry_failed(self, job_id):
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE job_items SET state = 'pending', reason = NULL, updated_at = ? WHERE job_id = ? AND state = 'failed'",
+                (time.time(), job_id)
+            ).rowcount
+
+    def counts(self, job_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY state", (job_id,)
+            ).fetchall()
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(rows)
+        return counts
+
+    # 🔹 상태별 항목 (순번 순서, 한 번에 읽지 않고 나눠 읽음) → (순번, ISBN, 사유, 필드)
+    def iter_items(self, job_id, state, batch=INSERT_CHUNK):
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, isbn, reason, fields FROM job_items WHERE job_id = ? AND state = ? AND seq > ? "
+                    "ORDER BY seq LIMIT ?", (job_id, state, last, batch)
+                ).fetchall()
+            if not rows:
+                return
+            for seq, isbn, reason, fields in rows:
+                yield seq, isbn, reason, json.loads(fields) if fields else None
+            last = rows[-1][0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_job_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = JobStore(os.environ.get("KOMARC_JOBS_PATH", DEFAULT_JOBS_PATH))
+    return _store
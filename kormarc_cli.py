@@ -0,0 +1,160 @@
+import argparse
+import csv
+import functools
+import logging
+import re
+import sys
+
+from batch_runner import DEFAULT_CONCURRENCY, run_with_requeue
+from hedged_lookup import HEDGE_DELAY, convert_isbn_hedged, get_hedged_resolver
+from host_throttle import host_stats, wait_for_hosts
+from instrumentation import summarize, traced, traces_to_csv, traces_to_json
+from kormarc_core import build_marc_record, convert_isbn, format_text_fields
+from marc_record import index_isbns, normalize_isbn
+from marc_writers import WRITERS
+from publisher_resolver import get_publisher_resolver
+
+# 명령행 일괄 변환기 (Streamlit 없이 수천~수만 건 처리)
+#
+#   python kormarc_cli.py isbn목록.txt -f marcxml -o 결과.xml --errors 오류.csv
+#   cat isbn목록.csv | python kormarc_cli.py - -f iso2709 -o 결과.mrc -j 8
+#
+# - 입력: TXT/CSV 파일 또는 표준입력(-). 줄마다 쉼표·탭·'/'·공백으로 나뉜 값 중 ISBN(10/13자리)만 사용
+# - 출력: 변환이 끝나는 대로 한 건씩 기록 (text / marcxml / iso2709)
+# - 오류: ISBN별 실패·경고를 별도 CSV로 기록
+# - 알라딘이 차단 페이지를 보내거나 429/5xx가 이어지면 해당 호스트를 잠시 멈추고,
+#   그동안의 ISBN은 대기열 뒤로 보냈다가 다시 조회 (대체값으로 레코드를 만들지 않음 → 출력 순서가 바뀔 수 있음)
+# - --hedged: 알라딘 API가 늦으면 --hedge-delay 초 뒤 알라딘 상세·BNK에도 물어 항목별로 먼저 온 값 사용
+# - --skip-existing 기존.mrc: 이미 목록화한 ISBN(020)은 네트워크 조회 전에 건너뜀 (여러 번 지정 가능)
+# - 수천 건 이상을 중단 후 이어서 실행하려면 kormarc_jobs.py (작업 저장소에 ISBN별 결과를 바로 기록)
+
+_SPLIT_RE = re.compile(r"[,\t/;\s]+")
+_NON_ISBN_RE = re.compile(r"[^\dXx]")
+
+
+# 🔹 입력 스트림 → ISBN (한 줄씩 읽어 바로 내보냄, 중복은 건너뜀)
+def read_isbns(stream):
+    seen = set()
+    for line in stream:
+        for token in _SPLIT_RE.split(line):
+            isbn = _NON_ISBN_RE.sub("", token).upper()
+            if len(isbn) not in (10, 13) or isbn in seen:
+                continue
+            seen.add(isbn)
+            yield isbn
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ISBN 목록 → KORMARC 일괄 변환")
+    parser.add_argument("input", help="ISBN 목록 파일 (TXT/CSV), 표준입력은 -")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (기본: 표준출력)")
+    parser.add_argument("-f", "--format", choices=sorted(WRITERS), default="text", help="출력 형식")
+    parser.add_argument("--errors", default="kormarc_errors.csv", help="오류 보고서 CSV 경로")
+    parser.add_argument("-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 처리 ISBN 수")
+    parser.add_argument("--skip-existing", action="append", default=[], metavar="MRC",
+                        help="이 ISO 2709 파일에 이미 있는 ISBN은 건너뜀")
+    parser.add_argument("--hedged", action="store_true",
+                        help="알라딘 API가 늦으면 알라딘 상세·BNK에도 함께 물어 항목별로 먼저 온 값 사용")
+    parser.add_argument("--hedge-delay", type=float, default=HEDGE_DELAY, help="2차 출처 요청까지 대기(초)")
+    parser.add_argument("--trace", help="ISBN별 단계 소요 시간 기록 경로 (.json 또는 .csv)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="조회 과정 디버그 로그를 표준오류로 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format="%(name)s: %(message)s")
+
+    writer_class = WRITERS[args.format]
+
+    if args.input == "-":
+        input_stream = sys.stdin
+    else:
+        input_stream = open(args.input, encoding="utf-8-sig", newline="")
+
+    if args.output == "-":
+        output_stream = sys.stdout.buffer if writer_class.binary else sys.stdout
+    else:
+        output_stream = open(args.output, "wb" if writer_class.binary else "w", encoding=None if writer_class.binary else "utf-8")
+
+    existing = index_isbns(*args.skip_existing) if args.skip_existing else set()
+    if args.skip_existing:
+        print(f"기존 레코드 ISBN {len(existing)}건 색인", file=sys.stderr)
+    skipped = 0
+
+    def new_isbns(isbns):
+        nonlocal skipped
+        for isbn in isbns:
+            if normalize_isbn(isbn) in existing:
+                skipped += 1
+                continue
+            yield isbn
+
+    convert = convert_isbn
+    if args.hedged:
+        convert = functools.partial(convert_isbn_hedged, delay=args.hedge_delay)
+    worker = traced(convert) if args.trace else convert
+    traces = []
+
+    converted = failed = 0
+    with input_stream, output_stream, open(args.errors, "w", encoding="utf-8-sig", newline="") as error_file:
+        errors = csv.writer(error_file)
+        errors.writerow(["번호", "ISBN", "구분", "내용"])
+        writer = writer_class(output_stream)
+
+        try:
+            isbns = new_isbns(read_isbns(input_stream))
+            for idx, isbn, outcome in run_with_requeue(
+                isbns, worker, args.concurrency, should_requeue=lambda outcome: outcome.get("requeue"),
+                before_retry=wait_for_hosts
+            ):
+                if args.trace:
+                    traces.append(outcome["trace"])
+                if not outcome["result"]:
+                    failed += 1
+                    kind = "보류" if outcome.get("requeue") else "실패"  # 재시도 후에도 차단 → 나중에 다시 실행
+                    errors.writerow([idx, isbn, kind, outcome["error"] or "결과 없음"])
+                else:
+                    converted += 1
+                    writer.write(isbn, format_text_fields(outcome), build_marc_record(outcome))
+                    if outcome["300_warning"]:
+                        errors.writerow([idx, isbn, "경고", f"형태사항: {outcome['300_warning']}"])
+                error_file.flush()
+
+                if idx % 100 == 0:
+                    print(f"… {idx}건 처리 (변환 {converted} / 실패 {failed})", file=sys.stderr)
+        finally:
+            writer.close()
+            # 새로 찾은 출판사 → 지역을 Sheet1에 반영
+            get_publisher_resolver().flush()
+
+    print(f"완료: 변환 {converted}건, 실패 {failed}건, 기존 레코드라 건너뜀 {skipped}건 → 오류 보고서 {args.errors}", file=sys.stderr)
+    if args.trace:
+        with open(args.trace, "w", encoding="utf-8", newline="") as trace_file:
+            trace_file.write(traces_to_csv(traces) if args.trace.lower().endswith(".csv") else traces_to_json(traces))
+        for row in summarize(traces):
+            print(
+                f"  {row['stage']:<20} p50 {row['p50_ms']:>8.1f} ms  p95 {row['p95_ms']:>8.1f} ms  "
+                f"요청 {row['requests']}  {row['bytes'] / 1024:.0f} KB",
+                file=sys.stderr
+            )
+
+    for host in host_stats():
+        if host["throttled"] or host["blocked"] or host["rejected"]:
+            print(
+                f"{host['host']}: 최종 속도 {host['rate']}/초, 429/5xx {host['throttled']}회, "
+                f"차단 {host['blocked']}회, 일시 중지 중 거절 {host['rejected']}회",
+                file=sys.stderr
+            )
+
+    if args.hedged:
+        hedge_stats = get_hedged_resolver().stats()
+        wins = ", ".join(f"{name} {count}" for name, count in hedge_stats["wins"].items())
+        print(f"2차 출처 요청 {hedge_stats['hedges']}건, 항목별 채택: {wins}", file=sys.stderr)
+
+    stats = get_publisher_resolver().stats()
+    if stats["total"]:
+        tiers = ", ".join(f"{tier} {count}" for tier, count in stats["counts"].items())
+        print(f"출판사 조회 단계별 적중: {tiers}", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
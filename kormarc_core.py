@@ -0,0 +1,422 @@
+import datetime
+import json
+import logging
+
+import http_client
+from aladin_parse import (
+    find_detail_link, format_300, normalize_creator, parse_detail_page, parse_detail_physical, physical_parts
+)
+from config import ALADIN_BASE_URL, get_aladin_ttbkey
+from country_codes import UNKNOWN_COUNTRY_CODE, get_country_code_table, normalize_region
+from instrumentation import timed
+from marc_record import Record
+from response_cache import get_response_cache
+from publisher_resolver import get_publisher_resolver
+from sheet_db import normalize_publisher
+
+# ISBN → KORMARC 변환 공용 로직 (Streamlit 화면 / 명령행 일괄 변환이 함께 사용)
+# - 알라딘 API + 상세페이지(필요할 때만) 수집, 또는 상세페이지 크롤링만으로 수집
+# - 출판사 지역(260 $a, publisher_resolver 단계별 조회), 발행국 부호(008) 조회
+# - 008/245/260/300 필드 구성
+#
+# 화면 출력은 하지 않음. 디버그 메시지는 logging("kormarc_core" 등)으로 남기므로
+# 필요한 쪽에서 핸들러를 붙여 사용. bs4/gspread/requests 는 실제 사용 시점에 import
+
+log = logging.getLogger(__name__)
+
+
+# --- 발행국 부호 구하기 (내장 부호표 + 구글 시트 Sheet2 덮어쓰기) ---
+@timed("country_code")
+def get_country_code_by_region(region_name):
+    try:
+        log.debug("발행국 부호 조회: %r (정규화: %r)", region_name, normalize_region(region_name))
+        return get_country_code_table().lookup(region_name)
+    except Exception:
+        log.exception("발행국 부호 조회 실패: %r", region_name)
+        return UNKNOWN_COUNTRY_CODE
+
+
+# --- 출판사 지역명 추출 (로컬 캐시 → Sheet1 색인 → BNK 출판사 목록 → 부정 캐시) ---
+# {"location", "tier", "matched", "score"} 반환
+@timed("publisher_location")
+def match_publisher_location(publisher_name, use_cache=True):
+    log.debug("출판사 지역 조회: %r (정규화: %r)", publisher_name, normalize_publisher(publisher_name))
+    found = get_publisher_resolver().resolve(publisher_name, use_cache)
+    log.debug("출판사 지역 결과: %r → %r (%s, %s %.2f)", publisher_name, found["location"], found["tier"], found["matched"], found["score"])
+    return found
+
+
+def get_publisher_location(publisher_name):
+    return match_publisher_location(publisher_name)["location"]
+
+
+_TIER_LABELS = {
+    "cache": "로컬 캐시",
+    "sheet": "출판사 DB",
+    "directory": "BNK 출판사 검색 (Sheet1에 추가 예정)",
+    "negative": "일치 없음",
+    "error": "조회 실패",
+}
+
+
+def describe_publisher_match(found):
+    label = _TIER_LABELS[found["tier"]]
+    if found["matched"] is None:
+        suggestions = found.get("suggestions")
+        if suggestions:
+            # 유사도가 낮아 자동으로 쓰지 않은 후보 → 확인 후 Sheet1에 추가하도록 안내
+            label += " — 유사 후보: " + ", ".join(
+                f"{name}({region or '지역 없음'}, {score:.2f})" for name, region, score in suggestions
+            )
+        return f"🔎 출판사 조회: {label}"
+    if found["score"] >= 1.0:
+        return f"🔎 출판사 조회: {label} — {found['matched']}"
+    return f"🔎 출판사 조회: {label} — 유사 일치 {found['matched']} (유사도 {found['score']:.2f})"
+
+
+# --- API 기반 도서정보 가져오기 ---
+def fetch_aladin_item_json(isbn):
+    url = f"{ALADIN_BASE_URL}/ttb/api/ItemLookUp.aspx"
+    params = {
+        "ttbkey": get_aladin_ttbkey(),
+        "itemIdType": "ISBN",
+        "ItemId": isbn,
+        "output": "js",
+        "Version": "20131101",
+        "OptResult": "packing"  # subInfo.packing: 판형 크기(mm) / subInfo.itemPage: 쪽수
+    }
+
+    res = http_client.get(url, params=params)
+    if res.status_code != 200:
+        raise http_client.FetchError(f"API 요청 실패 (status: {res.status_code})")
+
+    data = res.json()
+    # 키 오류·호출 한도 초과 등은 errorCode로 옴 → "결과 없음"으로 캐시하지 않고 오류로 알림
+    if "errorCode" in data:
+        raise http_client.FetchError(
+            f"API 오류 ({data['errorCode']}): {data.get('errorMessage', '')} [응답 내용: {res.text[:300]}]"
+        )
+    if "item" not in data:
+        raise http_client.FetchError(f"API 응답 형식 오류 [응답 내용: {res.text[:300]}]")
+    if not data["item"]:
+        return None
+    return res.text
+
+
+# --- 알라딘 검색 페이지 → 상세페이지 링크 (API 응답에 link가 없을 때만 사용) ---
+def fetch_aladin_detail_link(isbn):
+    search_url = f"{ALADIN_BASE_URL}/search/wsearchresult.aspx?SearchWord={isbn}"
+    res = http_client.get(search_url)
+    if res.status_code != 200:
+        raise http_client.FetchError(f"검색 실패 (status {res.status_code})")
+
+    # 검색 페이지 전체 대신 상세페이지 링크만 캐시에 보관
+    return find_detail_link(res.text)
+
+
+def fetch_aladin_detail_html(detail_url):
+    detail_res = http_client.get(detail_url)
+    if detail_res.status_code != 200:
+        raise http_client.FetchError(f"상세페이지 요청 실패 (status {detail_res.status_code})")
+    return detail_res.text
+
+
+# --- ISBN 1건의 알라딘 자료를 한 번에 수집 ---
+# 245/260/300 필드는 모두 여기서 만든 record 하나를 읽어서 구성
+# 상세페이지는 API에 쪽수·크기가 없을 때만 load_detail_html()로 가져옴
+# use_cache=False: 응답 캐시를 거치지 않음 (화면의 "캐시 사용 안 함", 사용자별)
+@timed("aladin_api")
+def resolve_aladin_record(isbn, use_cache=True):
+    record = {"isbn": isbn, "item": None, "error": None, "detail_html": None, "detail_error": None, "blocked": False,
+              "use_cache": use_cache}
+
+    try:
+        body = get_response_cache().get_or_fetch(
+            "aladin_api", isbn, lambda: fetch_aladin_item_json(isbn), use_cache
+        )
+        if body is None:
+            record["error"] = "도서 정보를 찾을 수 없습니다."
+        else:
+            record["item"] = json.loads(body)["item"][0]
+    except http_client.HostBlocked as e:
+        record["error"] = str(e)
+        record["blocked"] = True
+    except http_client.FetchError as e:
+        record["error"] = str(e)
+    except Exception as e:
+        record["error"] = f"API 예외 발생: {str(e)}"
+
+    return record
+
+
+@timed("aladin_crawl")
+def load_detail_html(record):
+    if record["detail_html"] is not None or record["detail_error"] or record["blocked"]:
+        return record["detail_html"]
+
+    cache = get_response_cache()
+    isbn = record["isbn"]
+    use_cache = record["use_cache"]
+    try:
+        # API 결과의 상세페이지 링크로 바로 이동 (검색 페이지 경유 생략)
+        detail_url = record["item"].get("link") if record["item"] else None
+        if not detail_url:
+            detail_url = cache.get_or_fetch("aladin_search", isbn, lambda: fetch_aladin_detail_link(isbn), use_cache)
+        if not detail_url:
+            record["detail_error"] = "도서 링크를 찾을 수 없습니다."
+        else:
+            record["detail_html"] = cache.get_or_fetch(
+                "aladin_detail", isbn, lambda: fetch_aladin_detail_html(detail_url), use_cache
+            )
+    except http_client.HostBlocked as e:
+        record["detail_error"] = str(e)
+        record["blocked"] = True
+    except http_client.FetchError as e:
+        record["detail_error"] = str(e)
+    except Exception as e:
+        record["detail_error"] = f"예외 발생: {str(e)}"
+
+    return record["detail_html"]
+
+
+# --- 도서 기본정보 (245/260용) ---
+def build_book_info(record):
+    if record["error"]:
+        return None, record["error"]
+
+    book = record["item"]
+
+    title = book.get("title", "제목 없음")
+    author = book.get("author", "")
+    publisher = book.get("publisher", "출판사 정보 없음")
+    pubdate = book.get("pubDate", "")
+    pubyear = pubdate[:4] if len(pubdate) >= 4 else "발행년도 없음"
+
+    creator_str = normalize_creator(author.split(",")) or "저자 정보 없음"
+
+    field_245 = f"=245  10$a{title} /$c{creator_str}"
+
+    return {
+        "title": title,
+        "creator": creator_str,
+        "publisher": publisher,
+        "pubyear": pubyear,
+        "245": field_245
+    }, None
+
+
+def search_aladin_by_isbn(isbn):
+    return build_book_info(resolve_aladin_record(isbn))
+
+
+# --- 형태사항 (300) : API subInfo 우선 ---
+def physical_from_api(record):
+    sub_info = (record["item"] or {}).get("subInfo") or {}
+    packing = sub_info.get("packing") or {}
+
+    def to_int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return 0
+
+    pages = to_int(sub_info.get("itemPage"))
+    width = to_int(packing.get("sizeWidth"))
+    height = to_int(packing.get("sizeHeight"))
+    if not pages and not (width and height):
+        return None
+    return pages, width, height
+
+
+# --- 형태사항 (300) : API에 값이 없을 때만 상세페이지 크롤링 ---
+# record["physical"]에 (쪽수, 가로mm, 세로mm)를 남겨 MARCXML/ISO 2709 출력에서도 사용
+def build_physical_description(record):
+    physical = physical_from_api(record)
+    if physical:
+        record["physical"] = physical
+        return format_300(*physical), None
+
+    record["physical"] = (0, 0, 0)
+    detail_html = load_detail_html(record)
+    if record["blocked"]:
+        return None, record["detail_error"] or record["error"]  # 차단으로 못 읽음 → '1책'으로 채우지 않고 다시 조회
+    if record["detail_error"]:
+        return "=300  \\$a1책.", record["detail_error"]
+
+    try:
+        record["physical"] = parse_detail_physical(detail_html)
+        return format_300(*record["physical"]), None
+
+    except Exception as e:
+        return "=300  \\$a1책.", f"예외 발생: {str(e)}"
+
+
+def extract_physical_description_by_crawling(isbn):
+    return build_physical_description(resolve_aladin_record(isbn))
+
+
+# --- 상세페이지 크롤링만으로 도서정보 구성 (크롤링 주소 반영.py) ---
+def parse_aladin_detail_page(html):
+    parsed = parse_detail_page(html)
+
+    title = parsed["title"] or "제목 없음"
+    creator_str = normalize_creator(parsed["authors"]) or "저자 정보 없음"
+    publisher = parsed["publisher"] if parsed["publisher"] else "출판사 정보 없음"
+    pubyear = parsed["pubyear"] if parsed["pubyear"] else "발행연도 없음"
+
+    return {
+        "title": title,
+        "creator": creator_str,
+        "publisher": publisher,
+        "pubyear": pubyear,
+        "245": f"=245  10$a{title} /$c{creator_str}",
+        "300": format_300(parsed["pages"], parsed["width"], parsed["height"])
+    }
+
+
+@timed("aladin_crawl")
+def search_aladin_by_crawling(isbn, use_cache=True):
+    try:
+        cache = get_response_cache()
+        detail_url = cache.get_or_fetch("aladin_search", isbn, lambda: fetch_aladin_detail_link(isbn), use_cache)
+        if not detail_url:
+            return None, "도서 링크를 찾을 수 없습니다."
+
+        detail_html = cache.get_or_fetch(
+            "aladin_detail", isbn, lambda: fetch_aladin_detail_html(detail_url), use_cache
+        )
+        result = parse_aladin_detail_page(detail_html)
+        return result, None
+
+    except http_client.HostBlocked:
+        raise  # 결과 없음이 아니라 다시 조회할 대상 → convert_isbn_by_crawling에서 처리
+    except http_client.FetchError as e:
+        return None, str(e)
+    except Exception as e:
+        return None, f"예외 발생: {str(e)}"
+
+
+def convert_isbn_by_crawling(isbn, use_cache=True):
+    try:
+        result, error = search_aladin_by_crawling(isbn, use_cache)
+    except http_client.HostBlocked as e:
+        return {"isbn": isbn, "result": None, "error": str(e), "requeue": True}
+    if error or not result:
+        return {"isbn": isbn, "result": result, "error": error}
+
+    # 260 필드 구성
+    publisher = result["publisher"]
+    publisher_match = None
+    if publisher == "출판사 정보 없음":
+        location = "[출판지 미상]"
+    else:
+        found = match_publisher_location(publisher, use_cache)
+        location = found["location"]
+        publisher_match = describe_publisher_match(found)
+
+    return {
+        "isbn": isbn,
+        "result": result,
+        "error": None,
+        "location": location,
+        "country_code": get_country_code_by_region(location),
+        "publisher_match": publisher_match
+    }
+
+
+# --- ISBN 1건 변환 (UI 출력 없이 결과만 반환 → 작업 스레드에서 실행 가능) ---
+def convert_isbn(isbn, use_cache=True):
+    # 디버깅 및 경고 메시지를 담을 리스트 준비
+    debug_messages = []
+
+    # 알라딘 자료는 ISBN당 한 번만 수집하고 245/260/300이 같은 record를 사용
+    record = resolve_aladin_record(isbn, use_cache)
+
+    result, error = build_book_info(record)
+    if error:
+        debug_messages.append(f"❌ 오류: {error}")
+
+    # 형태사항 크롤링
+    field_300, err_300 = build_physical_description(record)
+    if err_300:
+        debug_messages.append(f"⚠️ 형태사항 크롤링 경고: {err_300}")
+
+    # 차단·일시 중지로 못 가져온 경우: 대체값('1책' 등)으로 레코드를 만들지 않고 다시 조회하도록 표시
+    if record["blocked"]:
+        debug_messages.append("⏸️ 알라딘 접속이 일시 중지되어 이 ISBN은 나중에 다시 조회합니다.")
+        result = None
+        error = error or err_300
+
+    location = country_code = None
+    if result:
+        publisher = result["publisher"]
+
+        if publisher == "출판사 정보 없음":
+            location = "[출판지 미상]"
+        else:
+            found = match_publisher_location(publisher, use_cache)
+            location = found["location"]
+            debug_messages.append(f"🏙️ 지역정보 결과: **{location}**")
+            debug_messages.append(describe_publisher_match(found))
+
+        country_code = get_country_code_by_region(location)
+    elif not record["blocked"]:
+        debug_messages.append("⚠️ 결과 없음")
+
+    return {
+        "isbn": isbn,
+        "result": result,
+        "error": error,
+        "location": location,
+        "country_code": country_code,
+        "300": field_300,
+        "300_warning": err_300,
+        "physical": record["physical"],
+        "debug_messages": debug_messages,
+        "requeue": record["blocked"]
+    }
+
+
+# --- 화면 출력용 텍스트 필드 (=TAG  지시기호$a...) ---
+def format_text_fields(outcome):
+    result = outcome["result"]
+    return [
+        f"=008  \\$a{outcome['country_code']}",
+        result["245"],
+        f"=260  \\$a{outcome['location']} :$b{result['publisher']},$c{result['pubyear']}.",
+        outcome["300"]
+    ]
+
+
+# --- 008 고정길이 필드 (단행본, 40자리) ---
+def build_008_value(country_code, pubyear, entered=None):
+    entered = entered or datetime.date.today()
+    if len(pubyear) == 4 and pubyear.isdigit():
+        date_part = f"s{pubyear}    "
+    else:
+        date_part = "nuuuu    "
+    country = (country_code or UNKNOWN_COUNTRY_CODE)[:3].ljust(3)
+    # 00-05 입력일자 / 06 발행년유형 / 07-14 발행년 / 15-17 발행국 / 18-34 자료별 정의 / 35-37 언어 / 38-39
+    return f"{entered:%y%m%d}{date_part}{country}{' ' * 17}kor  "
+
+
+# --- MARC 레코드 (008/020/245/260/300) — MARCXML/ISO 2709 출력기가 사용 ---
+def build_marc_record(outcome):
+    result = outcome["result"]
+    a_part, c_part = physical_parts(*outcome["physical"])
+    if a_part and c_part:
+        subfields_300 = [("a", f"{a_part} ;"), ("c", f"{c_part}.")]
+    elif a_part:
+        subfields_300 = [("a", a_part)]
+    elif c_part:
+        subfields_300 = [("c", f"{c_part}.")]
+    else:
+        subfields_300 = [("a", "1책.")]
+
+    record = Record()
+    record.add_control("008", build_008_value(outcome["country_code"], result["pubyear"]))
+    record.add("020", "  ", [("a", outcome["isbn"])])
+    record.add("245", "10", [("a", f"{result['title']} /"), ("c", result["creator"])])
+    record.add("260", "  ", [("a", f"{outcome['location']} :"), ("b", f"{result['publisher']},"), ("c", f"{result['pubyear']}.")])
+    record.add("300", "  ", subfields_300)
+    return record
@@ -0,0 +1,177 @@
+import argparse
+import csv
+import functools
+import logging
+import os
+import socket
+import sys
+
+from batch_runner import DEFAULT_CONCURRENCY, run_with_requeue
+from hedged_lookup import HEDGE_DELAY, convert_isbn_hedged
+from host_throttle import wait_for_hosts
+from job_store import get_job_store
+from kormarc_cli import read_isbns
+from kormarc_core import build_marc_record, convert_isbn, format_text_fields
+from marc_record import Record, index_isbns, normalize_isbn
+from marc_writers import WRITERS
+from publisher_resolver import get_publisher_resolver
+
+# 이어서 실행할 수 있는 일괄 변환 (작업 저장소 job_store.py 사용)
+#
+#   python kormarc_jobs.py start isbn목록.txt [-j 8] [--hedged] [--skip-existing 기존.mrc]
+#   python kormarc_jobs.py resume [작업ID]             중단된 작업 이어서 (여러 프로세스에서 동시에 실행 가능)
+#   python kormarc_jobs.py retry-failed [작업ID]       실패한 ISBN만 다시
+#   python kormarc_jobs.py export [작업ID] -f iso2709 -o 결과.mrc [--errors 실패.csv]
+#   python kormarc_jobs.py status [작업ID]
+#
+# - 작업ID를 생략하면 가장 최근 작업
+# - ISBN이 끝날 때마다 결과를 저장 → 중간에 죽어도 완료된 ISBN은 다시 조회하지 않음
+# - 내보내기는 실행 중에도 가능 (그때까지 완료된 것만)
+
+CLAIM_BATCH = 4  # 한 번에 가져갈 ISBN 수 = 동시 처리 수 × CLAIM_BATCH
+
+
+def pick_converter(options):
+    if options.get("hedged"):
+        return functools.partial(convert_isbn_hedged, delay=options.get("hedge_delay", HEDGE_DELAY))
+    return convert_isbn
+
+
+# 🔹 대기 항목이 없을 때까지 가져가서 변환하고 결과를 바로 기록
+def run_job(store, job_id, concurrency):
+    convert = pick_converter(store.get_job(job_id)["options"])
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    done = failed = 0
+    try:
+        while True:
+            claimed = store.claim(job_id, worker_id, concurrency * CLAIM_BATCH)
+            if not claimed:
+                break
+            for _, (seq, isbn), outcome in run_with_requeue(
+                claimed, lambda item: convert(item[1]), concurrency,
+                should_requeue=lambda outcome: outcome.get("requeue"), before_retry=wait_for_hosts
+            ):
+                if outcome["result"]:
+                    fields = {"text": format_text_fields(outcome), "marc": build_marc_record(outcome).to_list()}
+                    store.complete(job_id, seq, fields, outcome["300_warning"])
+                    done += 1
+                else:
+                    reason = outcome["error"] or "결과 없음"
+                    store.fail(job_id, seq, f"보류: {reason}" if outcome.get("requeue") else reason)
+                    failed += 1
+                if (done + failed) % 100 == 0:
+                    print(f"… 이번 실행 {done + failed}건 (완료 {done} / 실패 {failed})", file=sys.stderr)
+    finally:
+        # Ctrl+C 등으로 멈춰도 가져간 항목은 대기로 되돌리고, 새로 찾은 출판사는 시트에 반영
+        store.release(job_id, worker_id)
+        get_publisher_resolver().flush()
+    return done, failed
+
+
+def print_status(store, job_id):
+    job = store.get_job(job_id)
+    counts = store.counts(job_id)
+    total = sum(counts.values())
+    summary = " / ".join(f"{state} {count}" for state, count in counts.items())
+    print(f"{job_id}: 전체 {total}건 — {summary}", file=sys.stderr)
+    if job["options"]:
+        print(f"  옵션: {job['options']}", file=sys.stderr)
+
+
+def export_job(store, job_id, output, fmt, errors_path):
+    writer_class = WRITERS[fmt]
+    if output == "-":
+        stream = sys.stdout.buffer if writer_class.binary else sys.stdout
+    else:
+        stream = open(output, "wb" if writer_class.binary else "w", encoding=None if writer_class.binary else "utf-8")
+
+    exported = 0
+    writer = writer_class(stream)
+    try:
+        for _, isbn, _, fields in store.iter_items(job_id, "done"):
+            writer.write(isbn, fields["text"], Record.from_list(fields["marc"]))
+            exported += 1
+    finally:
+        writer.close()
+        if output != "-":
+            stream.close()
+
+    failed = 0
+    if errors_path:
+        with open(errors_path, "w", encoding="utf-8-sig", newline="") as f:
+            errors = csv.writer(f)
+            errors.writerow(["번호", "ISBN", "사유"])
+            for seq, isbn, reason, _ in store.iter_items(job_id, "failed"):
+                errors.writerow([seq, isbn, reason])
+                failed += 1
+    print(f"내보내기: 완료 {exported}건 → {output}" + (f", 실패 {failed}건 → {errors_path}" if errors_path else ""),
+          file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="이어서 실행할 수 있는 KORMARC 일괄 변환")
+    parser.add_argument("-v", "--verbose", action="store_true", help="조회 과정 디버그 로그를 표준오류로 출력")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    start = sub.add_parser("start", help="새 작업 등록 후 실행")
+    start.add_argument("input", help="ISBN 목록 파일 (TXT/CSV), 표준입력은 -")
+    start.add_argument("--hedged", action="store_true", help="알라딘 API·상세·BNK 여러 출처 동시 조회")
+    start.add_argument("--hedge-delay", type=float, default=HEDGE_DELAY)
+    start.add_argument("--skip-existing", action="append", default=[], metavar="MRC",
+                       help="이 ISO 2709 파일에 이미 있는 ISBN은 등록하지 않음")
+
+    for name, help_text in (("resume", "대기 중인 ISBN 이어서 처리"), ("retry-failed", "실패한 ISBN만 다시 처리")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("job", nargs="?", help="작업ID (생략하면 가장 최근 작업)")
+
+    for command in (start, sub.choices["resume"], sub.choices["retry-failed"]):
+        command.add_argument("-j", "--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 처리 ISBN 수")
+
+    export = sub.add_parser("export", help="완료된 결과 내보내기")
+    export.add_argument("job", nargs="?")
+    export.add_argument("-o", "--output", default="-", help="출력 파일 (기본: 표준출력)")
+    export.add_argument("-f", "--format", choices=sorted(WRITERS), default="text")
+    export.add_argument("--errors", help="실패 ISBN과 사유를 기록할 CSV 경로")
+
+    status = sub.add_parser("status", help="작업 상태 (작업ID 생략 시 전체 목록)")
+    status.add_argument("job", nargs="?")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format="%(name)s: %(message)s")
+    store = get_job_store()
+
+    if args.command == "status" and not args.job:
+        for job in store.list_jobs():
+            print_status(store, job["id"])
+        return 0
+
+    if args.command == "start":
+        existing = index_isbns(*args.skip_existing) if args.skip_existing else set()
+        stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+        with stream:
+            isbns = (isbn for isbn in read_isbns(stream) if normalize_isbn(isbn) not in existing)
+            job_id = store.create_job(isbns, {"hedged": args.hedged, "hedge_delay": args.hedge_delay})
+        print(f"작업 {job_id} 등록", file=sys.stderr)
+    else:
+        job_id = args.job or store.latest_job()
+        if not job_id or store.get_job(job_id) is None:
+            print(f"작업을 찾을 수 없습니다: {args.job or '(저장된 작업 없음)'}", file=sys.stderr)
+            return 2
+
+    if args.command == "export":
+        export_job(store, job_id, args.output, args.format, args.errors)
+        return 0
+    if args.command == "status":
+        print_status(store, job_id)
+        return 0
+
+    if args.command == "retry-failed":
+        print(f"실패 {store.retry_failed(job_id)}건을 다시 대기로", file=sys.stderr)
+    done, failed = run_job(store, job_id, args.concurrency)
+    print(f"이번 실행: 완료 {done}건, 실패 {failed}건", file=sys.stderr)
+    print_status(store, job_id)
+    return 0 if store.counts(job_id)["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+import logging
+import re
+import threading
+import time
+from html import unescape
+from urllib.parse import urlsplit
+
+import http_client
+from aladin_parse import make_soup
+from batch_runner import DEFAULT_CONCURRENCY, run_in_order, set_host_limit
+from config import KPIPA_BASE_URL
+from instrumentation import timed
+from response_cache import get_response_cache
+from sheet_db import open_worksheet
+
+# 출판유통통합전산망(BNK, bnk.kpipa.or.kr) ISBN → 출판사/인프린트 조회
+# 및 "출판사 DB" 시트3(A열 ISBN, C열 출판사명) 반영
+
+log = logging.getLogger(__name__)
+
+KPIPA_SEARCH_URL = f"{KPIPA_BASE_URL}/front/search/bookSearchListAjax.do"
+KPIPA_DETAIL_URL = f"{KPIPA_BASE_URL}/front/search/bookDetailView.do?book_seq="
+PUBLISHER_WORKSHEET = "시트3"
+KPIPA_HOST = urlsplit(KPIPA_BASE_URL).hostname
+KPIPA_HOST_LIMIT = 4  # BNK 서버 부담을 고려한 동시 요청 상한
+
+
+_BOOK_LIST_RE = re.compile(r"<li\b[^>]*\bclass=[\"'][^\"']*\bbook_list\b[^>]*>\s*<a\b[^>]*\bhref=[\"']([^\"']*)[\"']", re.IGNORECASE)
+_PUBLISHER_TD_RE = re.compile(r"<th\b[^>]*>\s*출판사/인프린트\s*</th>\s*<td\b[^>]*>(.*?)</td>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+# 🔹 검색 결과 HTML → 첫 번째 도서 링크 (없으면 None)
+def parse_book_link(html):
+    match = _BOOK_LIST_RE.search(html)
+    if match:
+        return unescape(match.group(1))
+
+    # 마크업이 예상과 다를 때만 트리 파싱
+    first_result = make_soup(html, ["book_list"]).select_one("li.book_list > a")
+    return first_result["href"] if first_result and first_result.get("href") else None
+
+
+# 🔹 상세 페이지 HTML → "출판사/인프린트" 값 (없으면 None)
+def parse_publisher(html):
+    match = _PUBLISHER_TD_RE.search(html)
+    if match:
+        return _SPACE_RE.sub(" ", unescape(_TAG_RE.sub("", match.group(1)))).strip()
+
+    th = make_soup(html).find("th", string="출판사/인프린트")
+    if not th or not th.find_next_sibling("td"):
+        return None
+    return th.find_next_sibling("td").get_text(strip=True)
+
+
+# 🔍 BNK 검색 → book_seq (결과 없음: None, 상세페이지 링크 없음: "")
+def fetch_kpipa_book_seq(isbn):
+    headers = {
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Referer": f"{KPIPA_BASE_URL}/html/searchList.php"
+    }
+
+    data = {
+        "searchKeyword": isbn,
+        "searchType": "isbn",
+        "page": "1"
+    }
+
+    response = http_client.post(KPIPA_SEARCH_URL, headers=headers, data=data)
+    if response.status_code != 200:
+        raise http_client.FetchError(f"BNK 검색 실패 (status {response.status_code})")
+
+    href = parse_book_link(response.text)
+    if href is None:
+        return None
+
+    # href = "/front/search/bookDetailView.do?book_seq=123456"
+    if "book_seq=" not in href:
+        return ""
+
+    return href.split("book_seq=")[-1]
+
+
+# 🔍 BNK 상세 페이지 HTML
+def fetch_kpipa_detail_html(book_seq):
+    detail_response = http_client.get(KPIPA_DETAIL_URL + book_seq)
+    if detail_response.status_code != 200:
+        raise http_client.FetchError(f"BNK 상세페이지 요청 실패 (status {detail_response.status_code})")
+    return detail_response.text
+
+
+# 📚 BNK 출판사 조회 클라이언트
+# - 연결 재사용 세션(http_client)과 호스트별 동시 요청 제한 사용
+# - ISBN → book_seq, book_seq → 출판사명을 메모리 + 디스크(response_cache)에 보관
+#   (상세 페이지 HTML 대신 출판사명만 저장, 같은 도서의 다른 ISBN은 상세 요청 생략)
+# - lookup_many()로 여러 ISBN을 동시에 조회
+class KpipaClient:
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, host_limit=KPIPA_HOST_LIMIT):
+        self.concurrency = concurrency
+        set_host_limit(KPIPA_HOST, host_limit)
+        self._book_seqs = {}
+        self._publishers = {}
+        self._lock = threading.Lock()
+
+    # use_cache=False: 메모리·디스크에 있어도 다시 조회 (결과는 메모리에 갱신)
+    def book_seq(self, isbn, use_cache=True):
+        with self._lock:
+            if use_cache and isbn in self._book_seqs:
+                return self._book_seqs[isbn]
+        book_seq = get_response_cache().get_or_fetch(
+            "kpipa_search", isbn, lambda: fetch_kpipa_book_seq(isbn), use_cache
+        )
+        with self._lock:
+            self._book_seqs[isbn] = book_seq
+        return book_seq
+
+    def publisher(self, book_seq, use_cache=True):
+        with self._lock:
+            if use_cache and book_seq in self._publishers:
+                return self._publishers[book_seq]
+        publisher = get_response_cache().get_or_fetch(
+            "kpipa_publisher", book_seq, lambda: parse_publisher(fetch_kpipa_detail_html(book_seq)), use_cache
+        )
+        with self._lock:
+            self._publishers[book_seq] = publisher
+        return publisher
+
+    # 🔹 ISBN 1건 → 출판사명 또는 안내 문구 (요청 실패는 예외)
+    @timed("kpipa")
+    def lookup(self, isbn, use_cache=True):
+        book_seq = self.book_seq(isbn, use_cache)
+        if book_seq is None:
+            return "검색 결과 없음"
+        if not book_seq:
+            return "상세페이지 링크 없음"
+
+        publisher = self.publisher(book_seq, use_cache)
+        if not publisher:
+            return "출판사 정보 없음"
+
+        log.debug("KPIPA %s → 출판사 %s", isbn, publisher)
+        return publisher
+
+    def _lookup_safe(self, isbn, use_cache=True):
+        try:
+            return self.lookup(isbn, use_cache), None
+        except Exception as e:
+            log.warning("KPIPA 조회 실패 (%s): %s", isbn, e)
+            return None, f"KPIPA 조회 실패: {e}"
+
+    # 🔹 여러 ISBN 동시 조회 → 입력 순서대로 (ISBN, 출판사명, 오류)
+    def lookup_many(self, isbns, concurrency=None, use_cache=True):
+        for _, isbn, (publisher, error) in run_in_order(
+            isbns, lambda isbn: self._lookup_safe(isbn, use_cache), concurrency or self.concurrency
+        ):
+            yield isbn, publisher, error
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_kpipa_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = KpipaClient()
+    return _client
+
+
+# 🔍 BNK 검색 결과 → 출판사/인프린트 정보 추출
+def get_publisher_from_kpipa(isbn, use_cache=True):
+    return get_kpipa_client().lookup(isbn, use_cache)
+
+
+# 📝 Google Sheet 업데이트 (C열: 출판사명)
+def update_sheet_with_publisher(isbn, use_cache=True):
+    sheet = open_worksheet(PUBLISHER_WORKSHEET)
+    idx = _find_isbn_row(sheet, isbn)
+    if idx is None:
+        return f"❌ ISBN {isbn} 이(가) 시트에서 발견되지 않음"
+
+    publisher = get_publisher_from_kpipa(isbn, use_cache)
+    sheet.update_cell(idx, 3, publisher)  # C열 = 3번째 열
+    return f"✅ ISBN {isbn} → 출판사명: {publisher}"
+
+
+# 로컬 사본에서 행 번호를 찾고 그 칸만 시트에서 확인, 사본이 낡았으면 A열 전체를 훑음
+def _find_isbn_row(sheet, isbn):
+    from sheet_snapshot import get_sheet_snapshot
+
+    try:
+        for idx, _ in get_sheet_snapshot().find_rows(PUBLISHER_WORKSHEET, isbn):
+            if idx >= 2 and sheet.acell(f"A{idx}").value == isbn:
+                return idx
+    except Exception:
+        log.debug("시트3 로컬 사본 조회 실패, 시트 직접 확인", exc_info=True)
+
+    isbn_list = sheet.col_values(1)  # A열: ISBN 리스트
+    for idx, val in enumerate(isbn_list[1:], start=2):  # 첫 행 제외
+        if val == isbn:
+            return idx
+    return None
+
+
+# 📦 시트3 일괄 채우기
+# - A열(ISBN)·C열(출판사명)을 한 번에 읽어 C열이 빈 행만 골라냄
+# - 출판사 조회는 동시에 처리
+# - 결과는 인접한 행끼리 묶어 batch_update 한 번에 여러 범위를 기록 (쓰기 할당량 보호)
+# - 쓰기 할당량(429) 초과 시 기다렸다 재시도, 그래도 실패하면 중단 → 다시 실행하면 빈 행부터 이어서 진행
+WRITE_CHUNK_ROWS = 200       # batch_update 1회에 기록할 최대 행 수
+WRITE_MIN_INTERVAL = 1.1     # 쓰기 요청 간 최소 간격(초) — 분당 60회 한도 아래로 유지
+WRITE_MAX_RETRIES = 5
+
+
+def find_rows_missing_publisher(sheet):
+    isbn_col, publisher_col = sheet.batch_get(["A2:A", "C2:C"])
+
+    rows = []
+    for offset, isbn_row in enumerate(isbn_col):
+        isbn = isbn_row[0].strip() if isbn_row else ""
+        publisher_row = publisher_col[offset] if offset < len(publisher_col) else []
+        publisher = publisher_row[0].strip() if publisher_row else ""
+        if isbn and not publisher:
+            rows.append((offset + 2, isbn))  # 2행부터 시작
+    return rows
+
+
+def _contiguous_ranges(updates, column="C"):
+    ranges = []
+    for row, value in sorted(updates):
+        if ranges and ranges[-1]["end"] == row - 1:
+            ranges[-1]["end"] = row
+            ranges[-1]["values"].append([value])
+        else:
+            ranges.append({"start": row, "end": row, "values": [[value]]})
+    return [
+        {"range": f"{column}{r['start']}:{column}{r['end']}", "values": r["values"]}
+        for r in ranges
+    ]
+
+
+class SheetWriter:
+    def __init__(self, sheet):
+        self.sheet = sheet
+        self._last_write = 0.0
+
+    def write(self, updates):
+        from gspread.exceptions import APIError
+
+        data = _contiguous_ranges(updates)
+        for attempt in range(WRITE_MAX_RETRIES + 1):
+            wait = self._last_write + WRITE_MIN_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                self.sheet.batch_update(data)
+                self._last_write = time.monotonic()
+                return
+            except APIError as e:
+                self._last_write = time.monotonic()
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if status != 429 or attempt == WRITE_MAX_RETRIES:
+                    raise
+                time.sleep(min(2 ** attempt * 5, 60))  # 5s → 10s → 20s → 40s → 60s
+
+
+def bulk_fill_publishers(concurrency=DEFAULT_CONCURRENCY, progress=None, use_cache=True):
+    sheet = open_worksheet(PUBLISHER_WORKSHEET)
+    targets = find_rows_missing_publisher(sheet)
+    writer = SheetWriter(sheet)
+
+    summary = {"total": len(targets), "written": 0, "skipped": 0}
+    pending = []
+
+    def flush():
+        if pending:
+            writer.write(pending)
+            summary["written"] += len(pending)
+            pending.clear()
+
+    rows = [row for row, _ in targets]
+    isbns = [isbn for _, isbn in targets]
+    results = get_kpipa_client().lookup_many(isbns, concurrency, use_cache)
+    for idx, (row, (isbn, publisher, error)) in enumerate(zip(rows, results), 1):
+        if error:  # 일시적 오류는 비워 두고 다음 실행에서 다시 시도
+            summary["skipped"] += 1
+        else:
+            pending.append((row, publisher))
+            if len(pending) >= WRITE_CHUNK_ROWS:
+                flush()
+        if progress:
+            progress(idx, summary)
+
+    flush()
+    if progress:
+        progress(summary["total"], summary)
+    return summary
@@ -0,0 +1,183 @@
+import mmap
+import re
+
+# MARC 레코드 모델 + ISO 2709 직렬화 / 읽기
+# - Field / Record 는 __slots__ 로 가볍게 (수만 건을 흘려 보내도 레코드당 dict 없음)
+#   제어필드(00X)는 data, 데이터필드는 지시기호 2자리 + [(식별기호, 값), ...]
+# - encode_iso2709(record): 레코드 1건 → bytes (출력기가 한 건씩 바로 기록)
+# - index_isbns(path): 기존 .mrc 파일을 mmap으로 열어 020 $a ISBN만 색인
+#   (레코드 전체를 해석하지 않고 리더·디렉터리만 읽음 → 수 GB 파일도 메모리에 올리지 않음)
+
+FIELD_TERMINATOR = b"\x1e"
+RECORD_TERMINATOR = b"\x1d"
+SUBFIELD_DELIMITER = b"\x1f"
+
+LEADER_LENGTH = 24
+DIRECTORY_ENTRY_LENGTH = 12
+# 05 상태 n / 06 유형 a / 07 서지수준 m / 09 문자부호화 a(UCS) / 10-11 지시기호·식별기호 길이 / 20-23 4500
+DEFAULT_LEADER = f"{' ' * 5}nam a22{' ' * 5} a 4500"
+
+_ISBN_RE = re.compile(rb"[0-9][0-9\-]{8,16}[0-9Xx]")
+
+
+class Field:
+    __slots__ = ("tag", "indicators", "subfields", "data")
+
+    def __init__(self, tag, indicators=None, subfields=None, data=None):
+        self.tag = tag
+        self.indicators = indicators
+        self.subfields = subfields or []
+        self.data = data
+
+    @property
+    def is_control(self):
+        return self.indicators is None
+
+    def get(self, code, default=None):
+        for sub_code, value in self.subfields:
+            if sub_code == code:
+                return value
+        return default
+
+    def __repr__(self):
+        if self.is_control:
+            return f"Field({self.tag!r}, data={self.data!r})"
+        return f"Field({self.tag!r}, {self.indicators!r}, {self.subfields!r})"
+
+
+class Record:
+    __slots__ = ("leader", "fields")
+
+    def __init__(self, fields=None, leader=DEFAULT_LEADER):
+        self.leader = leader
+        self.fields = fields or []
+
+    def add_control(self, tag, data):
+        self.fields.append(Field(tag, data=data))
+
+    def add(self, tag, indicators, subfields):
+        self.fields.append(Field(tag, indicators, subfields))
+
+    def get(self, tag):
+        for field in self.fields:
+            if field.tag == tag:
+                return field
+        return None
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    # JSON으로 저장할 수 있는 모양: [[태그, 지시기호 또는 None, 식별기호 목록 또는 제어필드 값], ...]
+    def to_list(self):
+        return [
+            [field.tag, None, field.data] if field.is_control else [field.tag, field.indicators, field.subfields]
+            for field in self.fields
+        ]
+
+    @classmethod
+    def from_list(cls, rows, leader=DEFAULT_LEADER):
+        record = cls(leader=leader)
+        for tag, indicators, value in rows:
+            if indicators is None:
+                record.add_control(tag, value)
+            else:
+                record.add(tag, indicators, [tuple(subfield) for subfield in value])
+        return record
+
+    def __len__(self):
+        return len(self.fields)
+
+
+# 🔹 ISBN 정규화: 하이픈·부가기호 제거, 10자리는 13자리(978)로 → 입력 목록과 .mrc 색인을 같은 기준으로 비교
+def normalize_isbn(value):
+    if len(value) == 13 and value.isdigit():
+        return value
+    isbn = re.sub(r"[^0-9Xx]", "", value).upper()
+    if len(isbn) == 10:
+        body = "978" + isbn[:9]
+        check = (10 - sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(body)) % 10) % 10
+        return body + str(check)
+    return isbn
+
+
+# 🔹 레코드 1건 → ISO 2709 bytes
+def encode_iso2709(record):
+    directory = []
+    data = []
+    offset = 0
+    for field in record.fields:
+        if field.is_control:
+            body = field.data.encode("utf-8")
+        else:
+            body = field.indicators.encode("ascii") + b"".join(
+                SUBFIELD_DELIMITER + code.encode("ascii") + text.encode("utf-8") for code, text in field.subfields
+            )
+        body += FIELD_TERMINATOR
+        directory.append(f"{field.tag}{len(body):04d}{offset:05d}".encode("ascii"))
+        data.append(body)
+        offset += len(body)
+
+    directory_bytes = b"".join(directory) + FIELD_TERMINATOR
+    base_address = LEADER_LENGTH + len(directory_bytes)
+    record_length = base_address + offset + 1
+    leader = record.leader
+    leader = f"{record_length:05d}{leader[5:12]}{base_address:05d}{leader[17:]}".encode("ascii")
+    return leader + directory_bytes + b"".join(data) + RECORD_TERMINATOR
+
+
+# 레코드 1건(buf[start:end])의 020 $a 값들 — 리더의 기본주소와 디렉터리만 해석
+def _record_isbns(buf, start, end):
+    try:
+        base_address = int(buf[start + 12:start + 17])
+    except ValueError:
+        return
+    directory = buf[start + LEADER_LENGTH:min(start + base_address - 1, end)]
+    # 디렉터리 항목(12바이트)을 하나씩 보지 않고 "020"을 찾아 항목 경계에 맞는 것만 사용
+    entry = directory.find(b"020")
+    while entry >= 0:
+        if entry % DIRECTORY_ENTRY_LENGTH:
+            entry = directory.find(b"020", entry + 1)
+            continue
+        try:
+            length = int(directory[entry + 3:entry + 7])
+            field_start = start + base_address + int(directory[entry + 7:entry + 12])
+        except ValueError:
+            entry = directory.find(b"020", entry + 1)
+            continue  # 깨진 디렉터리 항목
+        field = buf[field_start:min(field_start + length, end)]
+        for subfield in field.split(SUBFIELD_DELIMITER)[1:]:
+            if subfield[:1] == b"a":
+                match = _ISBN_RE.search(subfield)
+                if match:
+                    yield normalize_isbn(match.group().decode("ascii"))
+        entry = directory.find(b"020", entry + DIRECTORY_ENTRY_LENGTH)
+
+
+# 🔹 .mrc 파일의 레코드마다 020 ISBN 목록 (리더의 레코드 길이로 다음 레코드로 건너뜀, 길이가 깨졌으면 종단기호 검색)
+def iter_record_isbns(path):
+    with open(path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # 빈 파일
+        with buf:
+            pos = 0
+            size = len(buf)
+            while pos + LEADER_LENGTH <= size:
+                try:
+                    end = pos + int(buf[pos:pos + 5])
+                except ValueError:
+                    end = 0
+                if end <= pos or end > size or buf[end - 1:end] != RECORD_TERMINATOR:
+                    end = buf.find(RECORD_TERMINATOR, pos)
+                    end = size if end < 0 else end + 1
+                yield list(_record_isbns(buf, pos, end))
+                pos = end
+
+
+def index_isbns(*paths):
+    isbns = set()
+    for path in paths:
+        for record_isbns in iter_record_isbns(path):
+            isbns.update(record_isbns)
+    return isbns
@@ -0,0 +1,85 @@
+from marc_record import encode_iso2709
+
+# 변환 결과를 파일로 흘려 쓰는 출력기 (레코드 단위로 바로 기록, 전체를 메모리에 모으지 않음)
+# - text    : 화면과 같은 =TAG  지시기호$a... 형식
+# - marcxml : MARC21 slim 스키마
+# - iso2709 : 교환용 바이너리 (.mrc)
+#
+# 레코드 모델(Field / Record)과 ISO 2709 인코딩은 marc_record.py, 필드 구성은 kormarc_core.build_marc_record()
+
+# xml.sax.saxutils 는 urllib.request 까지 끌어와 import가 무거워 직접 처리
+_XML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+
+def escape(text):
+    return text.translate(_XML_ESCAPES)
+
+
+def quoteattr(text):
+    return f'"{escape(text)}"'
+
+
+class TextWriter:
+    binary = False
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, isbn, text_fields, record):
+        self.stream.write(f"=020  \\\\$a{isbn}\n")
+        for field in text_fields:
+            self.stream.write(field + "\n")
+        self.stream.write("\n")
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class MarcXmlWriter:
+    binary = False
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.stream.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.stream.write('<collection xmlns="http://www.loc.gov/MARC21/slim">\n')
+
+    def write(self, isbn, text_fields, record):
+        lines = ["  <record>", f"    <leader>{escape(record.leader)}</leader>"]
+        for field in record:
+            if field.is_control:
+                lines.append(f"    <controlfield tag={quoteattr(field.tag)}>{escape(field.data)}</controlfield>")
+                continue
+            ind1, ind2 = field.indicators
+            lines.append(f"    <datafield tag={quoteattr(field.tag)} ind1={quoteattr(ind1)} ind2={quoteattr(ind2)}>")
+            for code, data in field.subfields:
+                lines.append(f"      <subfield code={quoteattr(code)}>{escape(data)}</subfield>")
+            lines.append("    </datafield>")
+        lines.append("  </record>")
+        self.stream.write("\n".join(lines) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        self.stream.write("</collection>\n")
+        self.stream.flush()
+
+
+class Iso2709Writer:
+    binary = True
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, isbn, text_fields, record):
+        self.stream.write(encode_iso2709(record))
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+WRITERS = {
+    "text": TextWriter,
+    "marcxml": MarcXmlWriter,
+    "iso2709": Iso2709Writer,
+}
@@ -0,0 +1,345 @@
+import atexit
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from html import unescape
+
+import http_client
+from batch_runner import DEFAULT_CONCURRENCY, run_in_order
+from config import KPIPA_BASE_URL
+
+# 출판유통통합전산망(BNK) 출판사 목록 검색 (adiPblshrInfoList)
+# - 기본은 브라우저 없이 HTTP 폼 전송 + #pblshrListBody 행 직접 파싱
+# - HTTP 경로가 실패하면(요청 오류, 마크업 변경) Selenium으로 재시도
+# - 빈 결과는 페이지가 보낸 검색어를 그대로 되돌려 줬을 때만 "결과 없음"으로 인정
+#   (검색어가 빠진 기본 페이지·세션 만료 페이지의 빈 표를 결과 없음으로 캐시하지 않음)
+#   KOMARC_DIRECTORY_BACKEND=http | selenium 으로 한쪽만 사용 가능 (기본 auto)
+# 브라우저 경로 (selenium / webdriver_manager 는 실제로 브라우저를 쓸 때만 import)
+# - 헤드리스 크롬 여러 개를 미리 띄워 두고 빌려 쓰고 돌려주는 풀 (사용자끼리 한 브라우저에 줄 서지 않음)
+# - 고정 sleep 대신 검색창 / 결과 행(#pblshrListBody > tr)이 나타날 때까지만 대기
+# - chromedriver 경로는 한 번 찾아 로컬 파일에 저장 (CHROMEDRIVER_PATH 로 직접 지정 가능)
+
+PUBLISHER_DIRECTORY_URL = f"{KPIPA_BASE_URL}/home/v3/addition/adiPblshrInfoList"
+RESULT_ROWS_SELECTOR = "#pblshrListBody > tr"
+DIRECTORY_BACKEND = os.environ.get("KOMARC_DIRECTORY_BACKEND", "auto").lower()
+
+DRIVER_POOL_SIZE = int(os.environ.get("KOMARC_DRIVER_POOL", "2"))
+PAGE_TIMEOUT = 10       # 페이지·검색 결과 최대 대기(초)
+EMPTY_SETTLE = 1.0      # 결과 표가 이만큼 비어 있으면 검색 결과 없음으로 봄(초)
+CHECKOUT_TIMEOUT = 60   # 풀에서 드라이버를 기다리는 최대 시간(초)
+DRIVER_PATH_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "komarc", "chromedriver_path")
+
+log = logging.getLogger(__name__)
+
+_LIST_BODY_RE = re.compile(r"<tbody\b[^>]*\bid=[\"']pblshrListBody[\"'][^>]*>(.*?)</tbody>", re.IGNORECASE | re.DOTALL)
+_ROW_RE = re.compile(r"<tr\b[^>]*>(.*?)</tr>", re.IGNORECASE | re.DOTALL)
+_CELL_RE = re.compile(r"<td\b[^>]*>(.*?)</td>", re.IGNORECASE | re.DOTALL)
+_KEYWORD_INPUT_RE = re.compile(r"<input\b[^>]*\bid=[\"']searchKeyword[\"'][^>]*>", re.IGNORECASE)
+_VALUE_RE = re.compile(r"(?<![\w-])value=(?:\"([^\"]*)\"|'([^']*)')", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _cell_text(html):
+    return _SPACE_RE.sub(" ", unescape(_TAG_RE.sub("", html))).strip()
+
+
+# 🔹 빈 결과표를 받았지만 그 페이지가 보낸 검색어에 대한 결과인지 확인할 수 없는 경우
+class UnconfirmedEmptyResult(http_client.FetchError):
+    pass
+
+
+# 🔹 결과 페이지 검색창(#searchKeyword)에 채워진 검색어 (없으면 None)
+def echoed_keyword(html):
+    tag = _KEYWORD_INPUT_RE.search(html)
+    value = _VALUE_RE.search(tag.group(0)) if tag else None
+    if not value:
+        return None
+    return _SPACE_RE.sub(" ", unescape(value.group(1) if value.group(1) is not None else value.group(2))).strip()
+
+
+# 🔹 검색 결과 페이지 HTML → [(출판사명, 지역, 업종), ...] 또는 "검색 결과가 없습니다."
+# 결과 표(#pblshrListBody) 자체가 없으면 마크업이 바뀐 것으로 보고 예외
+# keyword를 주면 빈 결과일 때 페이지가 그 검색어를 되돌려 줬는지 확인 → 아니면 UnconfirmedEmptyResult
+def parse_directory_rows(html, keyword=None):
+    body = _LIST_BODY_RE.search(html)
+    if not body:
+        raise http_client.FetchError("출판사 목록 표(#pblshrListBody)를 찾을 수 없음")
+
+    data = []
+    for row in _ROW_RE.findall(body.group(1)):
+        cols = _CELL_RE.findall(row)
+        if len(cols) >= 4:
+            data.append((_cell_text(cols[0]), _cell_text(cols[2]), _cell_text(cols[3])))
+    if data:
+        return data
+
+    if keyword is not None:
+        echoed = echoed_keyword(html)
+        if echoed != _SPACE_RE.sub(" ", keyword).strip():
+            raise UnconfirmedEmptyResult(f"빈 결과표의 검색어가 요청과 다름 (요청 {keyword!r}, 페이지 {echoed!r})")
+    return "검색 결과가 없습니다."
+
+
+# 🔹 브라우저 없이 검색 (검색창 폼과 같은 값을 POST)
+def search_publisher_http(publisher_name):
+    headers = {
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Referer": PUBLISHER_DIRECTORY_URL,
+    }
+    data = {
+        "searchKeyword": publisher_name,
+        "pageIndex": "1",
+    }
+    response = http_client.post(PUBLISHER_DIRECTORY_URL, headers=headers, data=data)
+    if response.status_code != 200:
+        raise http_client.FetchError(f"출판사 목록 검색 실패 (status {response.status_code})")
+    return parse_directory_rows(response.text, keyword=publisher_name)
+
+
+# 🔹 chromedriver 경로: 환경변수 → 저장된 경로 → webdriver_manager 설치 (결과 저장)
+def resolve_driver_path():
+    path = os.environ.get("CHROMEDRIVER_PATH")
+    if path:
+        return path
+
+    try:
+        with open(DRIVER_PATH_CACHE, encoding="utf-8") as f:
+            path = f.read().strip()
+        if path and os.path.exists(path):
+            return path
+    except OSError:
+        pass
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+        with open(DRIVER_PATH_CACHE, "w", encoding="utf-8") as f:
+            f.write(path)
+    except OSError:
+        pass
+    return path
+
+
+def _create_driver(driver_path):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')  # GUI 없이 실행
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    driver.set_page_load_timeout(PAGE_TIMEOUT * 3)
+    return driver
+
+
+# 🔹 크롬 드라이버 풀 (최대 size개, 필요할 때 생성·미리 띄우기 가능)
+class DriverPool:
+    def __init__(self, size=DRIVER_POOL_SIZE):
+        self.size = max(1, size)
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._driver_path = None
+        self._closed = False
+
+    def _driver_path_once(self):
+        with self._lock:
+            if self._driver_path is None:
+                self._driver_path = resolve_driver_path()
+            return self._driver_path
+
+    def _try_reserve(self):
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _release_reservation(self):
+        with self._lock:
+            self._created -= 1
+
+    def _new_driver(self):
+        try:
+            driver = _create_driver(self._driver_path_once())
+            _open_directory(driver)
+            return driver
+        except Exception:
+            self._release_reservation()
+            raise
+
+    # 🔹 비어 있는 자리만큼 드라이버를 미리 띄워 둠 (검색 페이지까지 열어 둠)
+    def warm(self, count=None):
+        for _ in range(self.size if count is None else count):
+            if not self._try_reserve():
+                break
+            self._idle.put(self._new_driver())
+
+    def warm_in_background(self, count=None):
+        threading.Thread(target=self.warm, args=(count,), daemon=True, name="driver-warm").start()
+
+    # 🔹 드라이버 빌리기 → with 블록이 끝나면 반납, 오류가 나면 폐기 후 다음에 새로 생성
+    @contextmanager
+    def checkout(self, timeout=CHECKOUT_TIMEOUT):
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            driver = self._new_driver() if self._try_reserve() else self._idle.get(timeout=timeout)
+
+        try:
+            yield driver
+        except Exception:
+            self._discard(driver)
+            raise
+        else:
+            if self._closed:
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self._release_reservation()
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = DriverPool()
+                _pool.warm_in_background(1)
+                atexit.register(_pool.close)
+    return _pool
+
+
+# 🔹 검색 페이지 열기 (검색창이 나타날 때까지 대기)
+def _open_directory(driver):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver.get(PUBLISHER_DIRECTORY_URL)
+    WebDriverWait(driver, PAGE_TIMEOUT).until(EC.presence_of_element_located((By.ID, "searchKeyword")))
+
+
+# 🔹 검색 후 결과가 바뀔 때까지 대기 조건: 이전 요소(첫 행, 없으면 결과 표)가 사라지고 새 결과가 나타남
+# - 결과는 (행 목록,) 으로 감싸 반환 (빈 목록도 대기 종료로 인정되도록)
+# - "결과 없음" 안내 행(칸 4개 미만)도 새 행이므로 바로 끝남
+# - 이전 요소가 사라진 뒤 표가 EMPTY_SETTLE 초 동안 비어 있으면 결과 없음으로 끝냄
+#   → 결과 없는 검색이 PAGE_TIMEOUT 전체를 기다리며 드라이버를 붙잡지 않음
+def _results_replaced(old_element):
+    from selenium.common.exceptions import StaleElementReferenceException
+    from selenium.webdriver.common.by import By
+
+    empty_since = [None]
+
+    def condition(driver):
+        if old_element is not None:
+            try:
+                old_element.is_enabled()
+                return False
+            except StaleElementReferenceException:
+                pass
+        rows = driver.find_elements(By.CSS_SELECTOR, RESULT_ROWS_SELECTOR)
+        if rows:
+            return (rows,)
+        if old_element is None:
+            return False  # 바뀐 것을 확인할 기준이 없음: 새 결과 행이 나타날 때까지 대기
+        now = time.monotonic()
+        if empty_since[0] is None:
+            empty_since[0] = now
+        return ([],) if now - empty_since[0] >= EMPTY_SETTLE else False
+
+    return condition
+
+
+def _search_with_driver(driver, publisher_name):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    if not driver.current_url.startswith(PUBLISHER_DIRECTORY_URL):
+        _open_directory(driver)
+
+    old_rows = driver.find_elements(By.CSS_SELECTOR, RESULT_ROWS_SELECTOR) or driver.find_elements(By.ID, "pblshrListBody")
+
+    # 검색창 찾기 및 검색어 입력
+    search_box = driver.find_element(By.ID, "searchKeyword")
+    search_box.clear()
+    search_box.send_keys(publisher_name)
+    search_box.send_keys(Keys.RETURN)
+
+    # 검색 결과 대기
+    try:
+        results, = WebDriverWait(driver, PAGE_TIMEOUT, poll_frequency=0.2).until(
+            _results_replaced(old_rows[0] if old_rows else None)
+        )
+    except TimeoutException:
+        return "검색 결과가 없습니다."
+
+    data = []
+    for result in results:
+        cols = result.find_elements(By.TAG_NAME, "td")
+        if len(cols) >= 4:
+            name = cols[0].text.strip()
+            area = cols[2].text.strip()
+            category = cols[3].text.strip()
+            data.append((name, area, category))
+
+    return data or "검색 결과가 없습니다."
+
+
+def search_publisher_selenium(publisher_name):
+    with get_driver_pool().checkout() as driver:
+        return _search_with_driver(driver, publisher_name)
+
+
+# 🔹 출판사명 검색 → [(출판사명, 지역, 업종), ...] 또는 오류 메시지 문자열
+# auto: HTTP 결과가 확인되지 않은 빈 결과(UnconfirmedEmptyResult)면 브라우저로 한 번 더 확인
+# http: 같은 경우 "오류 발생" → 결과 없음으로 캐시하지 않음
+def search_publisher(publisher_name):
+    if DIRECTORY_BACKEND != "selenium":
+        try:
+            return search_publisher_http(publisher_name)
+        except Exception as e:
+            if DIRECTORY_BACKEND == "http":
+                return f"오류 발생: {e}"
+            log.warning("HTTP 출판사 검색 실패, 브라우저로 재시도 (%s): %s", publisher_name, e)
+
+    try:
+        return search_publisher_selenium(publisher_name)
+    except Exception as e:
+        return f"오류 발생: {e}"
+
+
+# 🔹 여러 출판사명을 나눠 검색 → 입력 순서대로 (출판사명, 결과)
+# 브라우저 경로는 풀 크기만큼만 동시에 돌고, 나머지는 checkout()에서 대기
+def search_publishers(publisher_names, concurrency=None):
+    default = DRIVER_POOL_SIZE if DIRECTORY_BACKEND == "selenium" else DEFAULT_CONCURRENCY
+    for _, name, result in run_in_order(publisher_names, search_publisher, concurrency or default):
+        yield name, result
@@ -0,0 +1,208 @@
+import logging
+import threading
+
+from publisher_directory import search_publisher
+from response_cache import get_response_cache
+from sheet_db import UNKNOWN_LOCATION, get_publisher_index, normalize_publisher, open_worksheet
+
+# 출판사명 → 출판지(지역) 단계별 조회
+#   1. 메모리 캐시 : 이 프로세스에서 이미 찾은 이름 (출판사 DB 사본 version이 바뀌면 비움)
+#   2. Sheet1 색인 : 정확히 일치 또는 3-gram 유사 일치 — 시트에 넣거나 고친 출판사가 항상 우선
+#   3. 디스크 캐시 : 이전에 BNK 검색으로 찾은 지역 / 못 찾은 이름 (response_cache "publisher_region")
+#   4. BNK 출판사 목록 검색 (publisher_directory, 느림) — 정규화 이름이 같은 행만 사용
+#   5. 부정 캐시   : 4단계에서도 못 찾은 이름은 "출판지 미상"으로 일정 기간 기억 → 같은 이름으로 다시 검색하지 않음
+# 4단계에서 새로 알게 된 출판사 → 지역은 모아 두었다가 Sheet1에 append_rows로 한 번에 추가
+# → 다음 시트 재적재부터는 2단계에서 바로 찾음. 단계별 적중 횟수는 stats()로 확인
+
+log = logging.getLogger(__name__)
+
+CACHE_SOURCE = "publisher_region"
+WRITEBACK_WORKSHEET = "Sheet1"
+WRITEBACK_BATCH = 20   # 이만큼 모이면 Sheet1에 추가
+
+TIERS = ("cache", "sheet", "directory", "negative", "error")
+
+
+class PublisherResolver:
+    def __init__(self, use_directory=True, writeback=True):
+        self.use_directory = use_directory
+        self.writeback = writeback
+        self._memory = {}
+        self._version = None   # 메모리 캐시를 채울 때의 출판사 DB 사본 version
+        self._pending = []
+        self._counts = dict.fromkeys(TIERS, 0)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def _count(self, tier):
+        with self._lock:
+            self._counts[tier] += 1
+
+    # 🔹 출판사명 → {"location", "tier", "matched", "score"} (+ Sheet1에서 못 찾았으면 "suggestions": 유사 후보)
+    # use_cache=False: 메모리·디스크 캐시를 읽지 않고 다시 조회, 디스크 캐시에는 쓰지 않음 (화면의 "캐시 사용 안 함", "다시 조회")
+    def resolve(self, publisher_name, use_cache=True):
+        key = normalize_publisher(publisher_name)
+
+        # 1. 메모리 캐시 (use_cache=False면 건너뜀, 새 결과는 메모리에 갱신)
+        self._drop_stale_memory()
+        with self._lock:
+            found = self._memory.get(key) if use_cache else None
+        if found is not None:
+            self._count(found["tier"])
+            return found
+
+        cache = get_response_cache()
+        use_cache = cache.enabled and use_cache
+
+        # 2. Sheet1 색인 (유사도가 낮은 후보는 지역으로 쓰지 않고 후보로만 전달)
+        try:
+            index = get_publisher_index()
+            location, matched, score = index.match(publisher_name)
+            suggestions = [] if matched is not None else index.search(publisher_name, k=3)
+        except Exception as e:
+            log.exception("출판사 지역 조회 실패: %r", publisher_name)
+            self._count("error")
+            return {"location": "예외 발생", "tier": "error", "matched": None, "score": 0.0, "error": str(e)}
+        if matched is not None:
+            found = {"location": location, "tier": "sheet", "matched": matched, "score": score}
+            self._remember(key, found)
+            self._count("sheet")
+            return found
+
+        # 3. 디스크 캐시 (BNK 검색 결과와 "못 찾음"만 보관)
+        if use_cache:
+            hit, region = cache.get(CACHE_SOURCE, key)
+            if hit:
+                if region:
+                    found = {"location": region, "tier": "cache", "matched": key, "score": 1.0}
+                else:
+                    found = {"location": UNKNOWN_LOCATION, "tier": "negative", "matched": None, "score": 0.0,
+                             "suggestions": suggestions}
+                self._remember(key, found)
+                self._count(found["tier"])
+                return found
+
+        if not self.use_directory:
+            self._count("negative")
+            return {"location": UNKNOWN_LOCATION, "tier": "negative", "matched": None, "score": 0.0,
+                    "suggestions": suggestions}
+
+        # 4. BNK 출판사 목록 검색
+        row = self._search_directory(publisher_name, key)
+        if row is False:  # 검색 자체가 실패 → 캐시하지 않고 다음에 다시 시도
+            self._count("error")
+            return {"location": UNKNOWN_LOCATION, "tier": "error", "matched": None, "score": 0.0,
+                    "suggestions": suggestions}
+
+        if row:
+            name, region = row
+            found = {"location": region, "tier": "directory", "matched": name, "score": 1.0}
+            self._queue_writeback(name, region)
+        else:
+            # 5. 부정 캐시
+            region = None
+            found = {"location": UNKNOWN_LOCATION, "tier": "negative", "matched": None, "score": 0.0,
+                     "suggestions": suggestions}
+        if use_cache:
+            cache.put(CACHE_SOURCE, key, region)
+        self._remember(key, found)
+        self._count(found["tier"])
+        return found
+
+    # 🔹 메모리·디스크 캐시 비우기 (출판사 DB를 다시 불러온 뒤 BNK 검색 결과·"못 찾음"도 새로 조회)
+    def clear_cache(self):
+        with self._lock:
+            self._memory.clear()
+        get_response_cache().clear(CACHE_SOURCE)
+
+    # 출판사 DB 사본이 바뀌었으면(시트 수정·재동기화) 메모리 캐시를 비움 → Sheet1 수정이 바로 반영
+    def _drop_stale_memory(self):
+        from sheet_snapshot import get_sheet_snapshot
+
+        try:
+            version = get_sheet_snapshot().version
+        except Exception:
+            return  # 사본을 못 열면 기존 메모리로 응답 (Sheet1 단계에서 오류 처리)
+        with self._lock:
+            if version != self._version:
+                self._memory.clear()
+                self._version = version
+
+    def _remember(self, key, found):
+        # 이후 같은 이름은 1단계에서 응답 (부정 결과도 같은 프로세스에서는 기억)
+        cached = dict(found, tier="cache" if found["tier"] != "negative" else "negative")
+        with self._lock:
+            self._memory[key] = cached
+
+    # BNK 검색 결과 중 정규화 이름이 같은 첫 행 → (BNK의 출판사명, 지역)
+    # 이름이 다른 행은 결과가 한 건이어도 쓰지 않음 (다른 출판사의 지역이 Sheet1에 들어가지 않도록)
+    # 반환: (이름, 지역) / "" (못 찾음) / False (검색 실패)
+    def _search_directory(self, publisher_name, key):
+        results = search_publisher(publisher_name)
+        if isinstance(results, str):
+            if results.startswith("오류 발생"):
+                log.warning("BNK 출판사 검색 실패 (%s): %s", publisher_name, results)
+                return False
+            return ""
+
+        for name, area, _ in results:
+            if normalize_publisher(name) == key and area:
+                return name.strip(), area
+        return ""
+
+    def _queue_writeback(self, name, region):
+        if not self.writeback:
+            return
+        with self._lock:
+            # 동시에 같은 출판사를 찾은 경우 한 번만 추가
+            if any(pending_name == name for pending_name, _ in self._pending):
+                return
+            self._pending.append((name, region))
+            ready = len(self._pending) >= WRITEBACK_BATCH
+        if ready:
+            self.flush()
+
+    # 🔹 모아 둔 출판사 → 지역을 Sheet1에 추가 (실패하면 다음 flush에서 다시 시도)
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            try:
+                open_worksheet(WRITEBACK_WORKSHEET).append_rows(
+                    [["", name, region] for name, region in rows], value_input_option="RAW"
+                )
+            except Exception:
+                log.exception("Sheet1 출판사 추가 실패 (%d건), 다음에 다시 시도", len(rows))
+                with self._lock:
+                    self._pending = rows + self._pending
+                return 0
+            log.debug("Sheet1에 출판사 %d건 추가", len(rows))
+            return len(rows)
+
+    # 🔹 단계별 적중 횟수와 비율
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+            pending = len(self._pending)
+        total = sum(counts.values())
+        return {
+            "total": total,
+            "counts": counts,
+            "rates": {tier: (count / total if total else 0.0) for tier, count in counts.items()},
+            "pending_writeback": pending,
+        }
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_publisher_resolver():
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = PublisherResolver()
+    return _resolver
@@ -0,0 +1,161 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from instrumentation import record_cache
+
+# ISBN 단위 응답 캐시 (SQLite)
+# - 알라딘 API JSON, 알라딘 검색/상세 페이지, KPIPA 검색/상세 페이지를 로컬 디스크에 보관
+# - 출처(source)별 TTL, 용량 초과 시 가장 오래 안 쓴 항목부터 삭제(LRU)
+# - "결과 없음"도 짧은 TTL로 저장(negative cache)해 같은 ISBN을 반복 조회하지 않음
+#   (출처별로 더 짧게 지정 가능: BNK 출판사 "못 찾음"은 몇 시간만 보관 → 새 등록·일시 오류가 곧 반영)
+# - KOMARC_CACHE=off 또는 enabled = False 로 프로세스 전체 우회 (명령행·벤치마크용)
+#   화면에서는 사용자별로 get_or_fetch(..., use_cache=False)를 넘겨 그 조회만 우회, clear()로 비우기
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "komarc", "responses.sqlite3")
+
+DAY = 24 * 60 * 60
+SOURCE_TTLS = {
+    "aladin_api": 7 * DAY,
+    "aladin_search": 7 * DAY,
+    "aladin_detail": 30 * DAY,
+    "kpipa_search": 30 * DAY,
+    "kpipa_detail": 30 * DAY,
+    "kpipa_publisher": 30 * DAY,
+    "publisher_region": 30 * DAY,
+}
+DEFAULT_TTL = 7 * DAY
+NEGATIVE_TTL = 1 * DAY
+NEGATIVE_TTLS = {
+    "publisher_region": 2 * 60 * 60,
+}
+
+MAX_BYTES = 200 * 1024 * 1024
+
+
+class ResponseCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=MAX_BYTES, ttls=None, negative_ttl=NEGATIVE_TTL,
+                 negative_ttls=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(SOURCE_TTLS if ttls is None else ttls)
+        self.negative_ttl = negative_ttl
+        self.negative_ttls = dict(NEGATIVE_TTLS if negative_ttls is None else negative_ttls)
+        self.enabled = os.environ.get("KOMARC_CACHE", "on").lower() not in ("off", "0", "false")
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                body BLOB,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (source, key)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    # 🔹 조회: (적중 여부, 본문) — 본문이 None이면 "결과 없음"으로 저장된 항목
+    def get(self, source, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, stored_at FROM responses WHERE source = ? AND key = ?", (source, key)
+            ).fetchone()
+            if row is None:
+                record_cache(False)
+                return False, None
+
+            body, stored_at = row
+            if body is None:
+                ttl = self.negative_ttls.get(source, self.negative_ttl)
+            else:
+                ttl = self.ttls.get(source, DEFAULT_TTL)
+            if now - stored_at > ttl:
+                self._delete(source, key)
+                record_cache(False)
+                return False, None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE source = ? AND key = ?", (now, source, key)
+            )
+        record_cache(True)
+        return True, None if body is None else zlib.decompress(body).decode("utf-8")
+
+    # 🔹 저장: body=None 이면 negative cache
+    def put(self, source, key, body):
+        now = time.time()
+        blob = None if body is None else zlib.compress(body.encode("utf-8"))
+        size = len(blob) if blob is not None else 0
+        with self._lock:
+            self._delete(source, key)
+            self._conn.execute(
+                "INSERT INTO responses (source, key, body, stored_at, accessed_at, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (source, key, blob, now, now, size)
+            )
+            self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    # 🔹 캐시에 있으면 그대로, 없으면 fetch() 결과를 저장 후 반환
+    # fetch()는 본문 문자열 또는 None("결과 없음")을 반환하고, 일시적 오류는 예외로 알림(저장 안 함)
+    # use_cache=False: 이 호출만 캐시를 읽지도 쓰지도 않음
+    def get_or_fetch(self, source, key, fetch, use_cache=True):
+        if not (self.enabled and use_cache):
+            return fetch()
+
+        hit, body = self.get(source, key)
+        if hit:
+            return body
+
+        body = fetch()
+        self.put(source, key, body)
+        return body
+
+    def clear(self, source=None):
+        with self._lock:
+            if source is None:
+                self._conn.execute("DELETE FROM responses")
+            else:
+                self._conn.execute("DELETE FROM responses WHERE source = ?", (source,))
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _delete(self, source, key):
+        row = self._conn.execute(
+            "SELECT size FROM responses WHERE source = ? AND key = ?", (source, key)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM responses WHERE source = ? AND key = ?", (source, key))
+            self._total_bytes -= row[0]
+
+    def _evict(self):
+        # 상한의 90%까지 가장 오래 안 쓴 항목부터 삭제
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT source, key, size FROM responses ORDER BY accessed_at").fetchall()
+        for source, key, size in rows:
+            if self._total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE source = ? AND key = ?", (source, key))
+            self._total_bytes -= size
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(os.environ.get("KOMARC_CACHE_PATH", DEFAULT_CACHE_PATH))
+        return _response_cache
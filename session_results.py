@@ -0,0 +1,152 @@
+import io
+
+import streamlit as st
+
+from batch_runner import run_in_order
+from instrumentation import traced
+from marc_writers import TextWriter
+from response_cache import get_response_cache
+
+# 변환기 화면 공용: ISBN별 결과를 세션(session_state)에 보관
+# - Streamlit은 입력이 바뀔 때마다 스크립트를 처음부터 다시 실행 → 이미 변환한 ISBN은 보관한 결과로 바로 출력
+# - 새로 추가된 ISBN만 조회, "이 ISBN 다시 조회" 버튼으로 한 건만 강제로 다시 가져옴
+#   (그 ISBN은 응답 캐시·메모리를 거치지 않도록 worker(isbn, fresh=True)로 호출)
+# - 작업 스레드에서는 session_state 대신 평범한 dict만 읽음 (쓰기는 화면 스레드에서만)
+# - 간단히 보기: ISBN마다 st.code 여러 개를 쌓지 않고 진행 막대 + 페이지 나눈 표 하나,
+#   상세 필드는 표에서 고른 한 건만 그림 → ISBN 수백 건에도 화면 요소 수가 일정
+#   (생성된 MARC 텍스트 전체는 내려받기 버튼 하나로)
+
+PAGE_SIZE = 50
+FORCED_KEY = "refresh_forced"
+
+
+def get_memo(name):
+    return st.session_state.setdefault(name, {})
+
+
+def _forced():
+    return st.session_state.setdefault(FORCED_KEY, set())
+
+
+# 🔹 입력 순서대로 (번호, ISBN, 결과, 이번에 새로 조회했는지)
+# 보관된 결과는 작업 스레드로 보내지 않고, 새 ISBN만 동시 처리 → 결과가 나오는 대로 보관
+# "다시 조회"로 표시된 ISBN은 worker(isbn, fresh=True) → 캐시를 거치지 않고 새로 가져옴
+def run_memoized(isbn_list, worker, concurrency, memo):
+    fetch = traced(worker)
+    pending = {}
+    to_fetch = [isbn for isbn in dict.fromkeys(isbn_list) if isbn not in memo]
+    forced = _forced()
+    refetch = forced & set(to_fetch)  # 작업 스레드는 session_state 대신 이 set만 읽음
+    forced -= refetch
+    fetched = run_in_order(to_fetch, lambda isbn: fetch(isbn, fresh=True) if isbn in refetch else fetch(isbn), concurrency)
+
+    fresh = set(to_fetch)
+    fresh_seen = set()
+    for idx, isbn in enumerate(isbn_list, 1):
+        if isbn not in fresh:
+            yield idx, isbn, memo[isbn], False
+            continue
+        # 앞선 새 ISBN들의 결과를 순서대로 받아 두다가 이 ISBN 차례가 되면 출력 (같은 ISBN이 또 나오면 그 결과 재사용)
+        while isbn not in pending:
+            _, fetched_isbn, outcome = next(fetched)
+            pending[fetched_isbn] = outcome
+            if not outcome.get("requeue"):  # 차단·일시 중지로 못 가져온 결과는 보관하지 않음 → 다음 실행 때 다시 조회
+                memo[fetched_isbn] = outcome
+        yield idx, isbn, pending[isbn], isbn not in fresh_seen
+        fresh_seen.add(isbn)
+
+    # 입력에서 빠진 ISBN은 보관하지 않음 (세션 메모리 일정)
+    for isbn in set(memo) - set(isbn_list):
+        del memo[isbn]
+
+
+# 🔹 "이 ISBN 다시 조회" — 누르면 보관된 결과를 지우고 캐시 우회 대상으로 표시한 뒤 다시 실행
+# (on_click은 재실행 전에 처리됨)
+def _force_refresh(memo, isbn):
+    memo.pop(isbn, None)
+    _forced().add(isbn)
+
+
+def refresh_button(memo, isbn, key):
+    st.button("🔁 이 ISBN 다시 조회", key=key, on_click=_force_refresh, args=(memo, isbn))
+
+
+# 🔹 사이드바 "응답 캐시 사용 안 함" → use_cache 값 (이 세션의 조회에만 적용, 다른 사용자는 그대로 캐시 사용)
+def cache_bypass_toggle():
+    return not st.sidebar.checkbox(
+        "🚫 응답 캐시 사용 안 함", value=not get_response_cache().enabled, key="response_cache_bypass"
+    )
+
+
+def compact_mode_toggle():
+    return st.sidebar.checkbox("📋 간단히 보기 (표 + 페이지 나눔, 많은 ISBN용)", value=True)
+
+
+# 🔹 화면에 ISBN별로 그리지 않고 진행 막대만 갱신하며 결과 수집 → ([(번호, ISBN, 결과), ...], 새로 조회한 기록)
+def collect_results(isbn_list, worker, concurrency, memo):
+    total = len(isbn_list)
+    progress = st.progress(0.0, text=f"🔍 도서 정보 검색 중... 0/{total}")
+    rows, traces = [], []
+    for idx, isbn, outcome, fetched in run_memoized(isbn_list, worker, concurrency, memo):
+        rows.append((idx, isbn, outcome))
+        if fetched:
+            traces.append(outcome["trace"])
+        progress.progress(idx / total, text=f"🔍 도서 정보 검색 중... {idx}/{total}")
+    progress.empty()
+    return rows, traces
+
+
+def _status(outcome):
+    if outcome["result"]:
+        return "✅"
+    if outcome.get("requeue"):
+        return "⏸️ 보류"
+    return "❌ 실패"
+
+
+# 🔹 MARC 텍스트 전체 (명령행 -f text 출력과 같은 형식)
+def marc_text(rows, text_fields):
+    buffer = io.StringIO()
+    writer = TextWriter(buffer)
+    for _, isbn, outcome in rows:
+        if outcome["result"]:
+            writer.write(isbn, text_fields(outcome), None)
+    return buffer.getvalue()
+
+
+# 🔹 표 한 페이지 + 고른 한 건의 상세(render_detail) + 전체 내려받기
+def render_results(rows, text_fields, render_detail, memo):
+    done = sum(1 for _, _, outcome in rows if outcome["result"])
+    st.caption(f"완료 {done}건 / 실패·보류 {len(rows) - done}건")
+    st.download_button(
+        "📥 MARC 텍스트 전체 내려받기", marc_text(rows, text_fields), file_name="kormarc.txt", mime="text/plain"
+    )
+
+    pages = max((len(rows) + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+    page = st.number_input(f"페이지 (전체 {pages})", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+    page_rows = rows[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+
+    table = []
+    for idx, isbn, outcome in page_rows:
+        result = outcome["result"] or {}
+        table.append({
+            "번호": idx,
+            "ISBN": isbn,
+            "상태": _status(outcome),
+            "서명": result.get("title", outcome.get("error") or ""),
+            "출판사": result.get("publisher", ""),
+            "발행년": result.get("pubyear", ""),
+            "발행지": outcome.get("location") or "",
+        })
+    event = st.dataframe(
+        table, hide_index=True, use_container_width=True,
+        on_select="rerun", selection_mode="single-row", key=f"results-page-{page}"
+    )
+
+    selected = event.selection.rows
+    if not selected:
+        st.caption("표에서 행을 고르면 필드와 메시지를 보여 줍니다.")
+        return
+    idx, isbn, outcome = page_rows[selected[0]]
+    render_detail(idx, isbn, outcome)
+    refresh_button(memo, isbn, key=f"refresh-{idx}-{isbn}")
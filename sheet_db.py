@@ -0,0 +1,187 @@
+import re
+import threading
+import time
+
+from config import get_gspread_key
+from trigram_index import DEFAULT_THRESHOLD, TrigramIndex
+
+# "출판사 DB" 구글 시트 공용 접근 모듈
+# - gspread 인증은 프로세스 전체에서 한 번만 수행
+# - Sheet1(출판사 → 지역)은 로컬 사본(sheet_snapshot)에서 읽어 메모리 색인으로 올려 두고 조회마다 네트워크를 타지 않음
+# - 정확히 일치하는 이름이 없으면 3-gram 유사 검색으로 가장 비슷한 출판사를 찾음
+#   유사도 AUTO_MATCH_THRESHOLD 이상만 지역으로 사용, 그 아래는 후보(suggestions)로만 보여 주고 "출판지 미상"
+#   (짧은 이름은 0.5 안팎에서 다른 출판사와 겹침: 민음사↔민음인, 창비교육↔창비, 푸른↔푸른숲)
+
+SPREADSHEET_NAME = "출판사 DB"
+SCOPE = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+
+UNKNOWN_LOCATION = "출판지 미상"
+AUTO_MATCH_THRESHOLD = 0.8  # 유사 일치를 260 $a·008에 바로 쓰는 최소 유사도
+
+_client = None
+_client_lock = threading.Lock()
+
+
+# 🔹 gspread 클라이언트 (최초 1회만 인증)
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            import gspread
+            from oauth2client.service_account import ServiceAccountCredentials
+
+            creds = ServiceAccountCredentials.from_json_keyfile_dict(get_gspread_key(), SCOPE)
+            _client = gspread.authorize(creds)
+        return _client
+
+
+_worksheet_factory = None
+
+
+# 🔹 워크시트 공급자 교체 (벤치마크·시험에서 가짜 워크시트를 쓸 때, None이면 원래대로)
+def use_worksheet_factory(factory):
+    global _worksheet_factory
+    _worksheet_factory = factory
+
+
+def open_worksheet(worksheet_name):
+    if _worksheet_factory is not None:
+        return _worksheet_factory(worksheet_name)
+    return get_client().open(SPREADSHEET_NAME).worksheet(worksheet_name)
+
+
+# 🔹 스프레드시트 전체 (워크시트 공급자를 바꾼 경우 None)
+def open_spreadsheet():
+    if _worksheet_factory is not None:
+        return None
+    return get_client().open(SPREADSHEET_NAME)
+
+
+_PUBLISHER_NOISE_RE = re.compile(r"\s|\(.*?\)|주식회사|㈜|도서출판|출판사")
+
+
+def normalize_publisher(name):
+    return _PUBLISHER_NOISE_RE.sub("", name).lower()
+
+
+# 🔹 Sheet1 출판사 색인 (정규화 이름 / 원본 이름 → 지역, 정규화 이름 3-gram 색인)
+class PublisherIndex:
+    def __init__(self, worksheet_name="Sheet1", ttl=600, fuzzy_threshold=DEFAULT_THRESHOLD,
+                 auto_threshold=AUTO_MATCH_THRESHOLD):
+        self.worksheet_name = worksheet_name
+        self.ttl = ttl
+        self.fuzzy_threshold = fuzzy_threshold  # 후보로 보여 줄 최소 유사도
+        self.auto_threshold = auto_threshold
+        self._by_normalized = {}
+        self._by_raw = {}
+        self._trigrams = TrigramIndex([])
+        self._loaded_at = None
+        self._version = None
+        self._reload_lock = threading.Lock()
+
+    # 🔹 구글 시트에서 바로 다시 동기화한 뒤 색인 재구성
+    def reload(self):
+        from sheet_snapshot import get_sheet_snapshot
+
+        get_sheet_snapshot().sync(force=True)
+        with self._reload_lock:
+            self._load()
+
+    def _load(self):
+        from sheet_snapshot import get_sheet_snapshot
+
+        snapshot = get_sheet_snapshot()
+        self._version = snapshot.version
+        rows = snapshot.values(self.worksheet_name, 1, 2)  # B열: 출판사명, C열: 지역
+
+        by_normalized = {}
+        by_raw = {}
+        for row in rows:
+            if not row:
+                continue
+            name = row[0]
+            region = row[1].strip() if len(row) > 1 else ""
+            # 시트 위쪽 행이 우선 (기존 순차 탐색과 동일)
+            by_normalized.setdefault(normalize_publisher(name), region)
+            by_raw.setdefault(name.strip(), region)
+
+        # 시트 내용이 그대로면 3-gram 색인을 다시 만들지 않음
+        if by_normalized != self._by_normalized or by_raw != self._by_raw:
+            trigram_index = TrigramIndex(name for name in by_normalized if name)
+            # 완성된 색인으로 한 번에 교체 → 조회 중인 스레드는 이전 색인을 그대로 사용
+            self._by_normalized, self._by_raw, self._trigrams = by_normalized, by_raw, trigram_index
+        self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        if self._loaded_at is None:
+            with self._reload_lock:
+                # 동시에 들어온 첫 조회들 중 한 스레드만 시트를 읽음
+                if self._loaded_at is None:
+                    self._load()
+            return
+        if time.monotonic() - self._loaded_at < self.ttl and not self._snapshot_changed():
+            return
+        # 만료된 경우 한 스레드만 다시 읽고, 나머지는 기존 색인으로 응답
+        if self._reload_lock.acquire(blocking=False):
+            try:
+                self._load()
+            except Exception:
+                # 갱신 실패 시 기존 색인 유지, 다음 TTL 주기에 다시 시도
+                self._loaded_at = time.monotonic()
+            finally:
+                self._reload_lock.release()
+
+    def _snapshot_changed(self):
+        from sheet_snapshot import get_sheet_snapshot
+
+        return get_sheet_snapshot().version != self._version
+
+    # 🔹 출판사명 → (지역, 일치한 시트 이름, 점수) — 정확히 일치하면 점수 1.0
+    # 유사 일치가 auto_threshold 미만이면 (출판지 미상, None, 0.0) → 후보는 search()로
+    def match(self, publisher_name):
+        self._ensure_fresh()
+
+        normalized = normalize_publisher(publisher_name)
+        region = self._by_normalized.get(normalized)
+        if region is not None:
+            return region or UNKNOWN_LOCATION, normalized, 1.0
+        region = self._by_raw.get(publisher_name.strip())
+        if region is not None:
+            return region or UNKNOWN_LOCATION, publisher_name.strip(), 1.0
+
+        candidates = self._trigrams.search(normalized, k=1, threshold=self.auto_threshold)
+        if not candidates:
+            return UNKNOWN_LOCATION, None, 0.0
+        name, score = candidates[0]
+        return self._by_normalized[name] or UNKNOWN_LOCATION, name, score
+
+    # 🔹 유사 출판사 후보 상위 k개 → [(정규화 이름, 지역, 점수), ...]
+    def search(self, publisher_name, k=5, threshold=None):
+        self._ensure_fresh()
+        threshold = self.fuzzy_threshold if threshold is None else threshold
+        return [
+            (name, self._by_normalized[name], score)
+            for name, score in self._trigrams.search(normalize_publisher(publisher_name), k, threshold)
+        ]
+
+    def lookup(self, publisher_name):
+        return self.match(publisher_name)[0]
+
+    def __len__(self):
+        return len(self._by_raw)
+
+
+_publisher_index = None
+_publisher_index_lock = threading.Lock()
+
+
+def get_publisher_index():
+    global _publisher_index
+    with _publisher_index_lock:
+        if _publisher_index is None:
+            _publisher_index = PublisherIndex()
+        return _publisher_index
@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from sheet_db import normalize_publisher, open_spreadsheet, open_worksheet
+
+# "출판사 DB" 로컬 사본 (SQLite)
+# - Sheet1 / Sheet2 / 시트3 의 모든 행을 로컬에 보관하고, 읽기는 모두 사본에서 처리
+#   → 시작할 때 구글 시트를 기다리지 않고, 구글에 접속이 안 돼도 마지막 사본으로 계속 동작
+# - 백그라운드에서 스프레드시트 수정 시각(lastUpdateTime)만 주기적으로 확인하고,
+#   바뀌었을 때만 세 시트를 한 번의 요청(values_batch_get)으로 읽어 달라진 행만 반영
+# - 시트별 조회 키(Sheet1: 정규화 출판사명, Sheet2: 지역명, 시트3: ISBN)에 색인
+# - 변경이 반영될 때마다 version 증가 → 메모리 색인(PublisherIndex 등)은 version이 바뀐 경우에만 다시 구성
+# - KOMARC_SNAPSHOT_PATH 로 위치 변경
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "komarc", "sheets.sqlite3")
+SYNC_INTERVAL = 60  # 수정 시각 확인 주기(초)
+READ_RANGE = "A1:Z"
+
+log = logging.getLogger(__name__)
+
+
+def _strip_key(value):
+    return value.strip()
+
+
+# 시트별 조회 키: (열 번호, 정규화 함수)
+SHEET_KEYS = {
+    "Sheet1": (1, normalize_publisher),   # B열: 출판사명
+    "Sheet2": (0, _strip_key),            # A열: 지역명
+    "시트3": (0, _strip_key),             # A열: ISBN
+}
+
+
+class SheetSnapshot:
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH, sheets=None, sync_interval=SYNC_INTERVAL):
+        self.path = path
+        self.sheets = dict(SHEET_KEYS if sheets is None else sheets)
+        self.sync_interval = sync_interval
+        self.last_error = None
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sheet_rows (
+                sheet TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                key TEXT,
+                cells TEXT NOT NULL,
+                PRIMARY KEY (sheet, row)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sheet_rows_key ON sheet_rows (sheet, key)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sheet_meta (name TEXT PRIMARY KEY, value TEXT)")
+        self.version = int(self._meta("version") or 0)
+        self._syncer = None
+
+    def _meta(self, name):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sheet_meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name, value):
+        self._conn.execute("INSERT OR REPLACE INTO sheet_meta (name, value) VALUES (?, ?)", (name, str(value)))
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM sheet_rows LIMIT 1").fetchone() is None
+
+    # 🔹 gspread의 get("B2:C")와 같은 모양: first_row행부터, first_col~last_col 열 (0부터), 뒤쪽 빈 칸은 잘라냄
+    def values(self, sheet, first_col=0, last_col=None, first_row=2):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row, cells FROM sheet_rows WHERE sheet = ? AND row >= ? ORDER BY row", (sheet, first_row)
+            ).fetchall()
+
+        values = []
+        expected = first_row
+        for row, cells in rows:
+            values.extend([] for _ in range(row - expected))  # 사이의 빈 행
+            expected = row + 1
+            cells = json.loads(cells)
+            part = cells[first_col:None if last_col is None else last_col + 1]
+            while part and part[-1] == "":
+                part.pop()
+            values.append(part)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    # 🔹 조회 키로 행 찾기 → [(행 번호, 셀 목록), ...]
+    def find_rows(self, sheet, key):
+        _, normalize = self.sheets[sheet]
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row, cells FROM sheet_rows WHERE sheet = ? AND key = ? ORDER BY row", (sheet, normalize(key))
+            ).fetchall()
+        return [(row, json.loads(cells)) for row, cells in rows]
+
+    # 수정 시각이 그대로면 (수정 시각, None), 아니면 (수정 시각, {시트: 행 목록})
+    def _read_remote(self, force=False):
+        spreadsheet = open_spreadsheet()
+        if spreadsheet is None:
+            # 워크시트 공급자가 바뀐 경우(벤치마크의 가짜 시트 등): 수정 시각 없이 시트별로 읽음
+            return None, {name: open_worksheet(name).get(READ_RANGE) for name in self.sheets}
+
+        modified = getattr(spreadsheet, "lastUpdateTime", None)
+        if not force and modified and modified == self._meta("modified"):
+            return modified, None
+
+        response = spreadsheet.values_batch_get([f"'{name}'!{READ_RANGE}" for name in self.sheets])
+        data = {}
+        for name, value_range in zip(self.sheets, response.get("valueRanges", [])):
+            data[name] = value_range.get("values", [])
+        return modified, data
+
+    # 🔹 동기화: 수정 시각이 그대로면 아무것도 읽지 않음. 반환값은 바뀐 행 수
+    def sync(self, force=False):
+        with self._sync_lock:
+            try:
+                modified, data = self._read_remote(force)
+            except Exception as e:
+                self.last_error = str(e)
+                log.warning("출판사 DB 동기화 실패, 로컬 사본으로 계속 응답: %s", e)
+                raise
+
+            if data is None:
+                return 0
+
+            changed = sum(self._apply(name, rows) for name, rows in data.items())
+            with self._lock:
+                if changed:
+                    self.version += 1
+                    self._set_meta("version", self.version)
+                if modified:
+                    self._set_meta("modified", modified)
+                self._set_meta("synced_at", time.time())
+            self.last_error = None
+            if changed:
+                log.debug("출판사 DB 동기화: %d행 변경 (version %d)", changed, self.version)
+            return changed
+
+    # 시트 하나의 새 행 목록과 사본을 비교해 달라진 행만 기록
+    def _apply(self, sheet, rows):
+        key_col, normalize = self.sheets[sheet]
+        incoming = {}
+        for idx, cells in enumerate(rows, start=1):
+            if any(cell != "" for cell in cells):
+                incoming[idx] = json.dumps(cells, ensure_ascii=False)
+
+        with self._lock:
+            existing = dict(self._conn.execute("SELECT row, cells FROM sheet_rows WHERE sheet = ?", (sheet,)).fetchall())
+            upserts = [
+                (sheet, row, normalize(rows[row - 1][key_col]) if len(rows[row - 1]) > key_col else "", cells)
+                for row, cells in incoming.items() if existing.get(row) != cells
+            ]
+            deletes = [(sheet, row) for row in existing if row not in incoming]
+            if not upserts and not deletes:
+                return 0
+
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO sheet_rows (sheet, row, key, cells) VALUES (?, ?, ?, ?)", upserts)
+                self._conn.executemany("DELETE FROM sheet_rows WHERE sheet = ? AND row = ?", deletes)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(upserts) + len(deletes)
+
+    def start_background_sync(self):
+        with self._lock:
+            if self._syncer is None:
+                self._syncer = threading.Thread(target=self._sync_loop, name="sheet-snapshot-sync", daemon=True)
+                self._syncer.start()
+
+    def _sync_loop(self):
+        while True:
+            time.sleep(self.sync_interval)
+            try:
+                self.sync()
+            except Exception:
+                pass  # 실패해도 사본으로 계속 응답, 다음 주기에 다시 시도
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+# 🔹 공용 사본: 비어 있으면 처음 한 번은 바로 동기화, 이후에는 백그라운드에서 동기화
+def get_sheet_snapshot():
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                snapshot = SheetSnapshot(os.environ.get("KOMARC_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH))
+                if snapshot.is_empty():
+                    snapshot.sync(force=True)
+                else:
+                    threading.Thread(target=_sync_quietly, args=(snapshot,), daemon=True).start()
+                snapshot.start_background_sync()
+                _snapshot = snapshot
+    return _snapshot
+
+
+def _sync_quietly(snapshot):
+    try:
+        snapshot.sync()
+    except Exception:
+        pass
@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aladin_parse import normalize_creator  # noqa: E402
+from kormarc_core import build_book_info  # noqa: E402
+
+
+def test_api_and_detail_page_authors_normalize_alike():
+    api = "한강 (지은이), 데버라 스미스 (옮긴이)".split(",")
+    detail = ["한강 지음", "데버라 스미스 옮김"]
+    assert normalize_creator(api) == normalize_creator(detail) == "한강 지음 ; 데버라 스미스 옮김"
+
+
+def test_build_book_info_uses_normalized_creator():
+    record = {"error": None, "item": {"title": "소년이 온다", "author": "한강 (지은이)", "pubDate": "2014-05-19"}}
+    result, error = build_book_info(record)
+    assert error is None
+    assert result["creator"] == "한강 지음"
+    assert result["245"] == "=245  10$a소년이 온다 /$c한강 지음"
+
+
+def test_build_book_info_without_author():
+    result, _ = build_book_info({"error": None, "item": {"title": "무제", "author": ""}})
+    assert result["creator"] == "저자 정보 없음"
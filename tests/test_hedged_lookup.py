@@ -0,0 +1,62 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hedged_lookup  # noqa: E402
+import http_client  # noqa: E402
+from hedged_lookup import HedgedResolver, convert_isbn_hedged  # noqa: E402
+
+COMPLETE = {
+    "title": "소년이 온다",
+    "creator": "한강 지음",
+    "publisher": "창비",
+    "pubyear": "2014",
+    "physical": (216, 140, 205),
+}
+
+
+def _blocked(isbn, use_cache=True):
+    raise http_client.HostBlocked("차단 페이지 (captcha)")
+
+
+def _use(monkeypatch, sources):
+    resolver = HedgedResolver(sources=sources, delay=0, workers=4)
+    monkeypatch.setattr(hedged_lookup, "get_hedged_resolver", lambda: resolver)
+    monkeypatch.setattr(hedged_lookup, "match_publisher_location", lambda name, use_cache=True: {"location": "파주"})
+    monkeypatch.setattr(hedged_lookup, "describe_publisher_match", lambda match: "")
+    monkeypatch.setattr(hedged_lookup, "get_country_code_by_region", lambda region: "ggk")
+
+
+def test_blocked_bnk_is_ignored_when_publisher_is_found(monkeypatch):
+    without_physical = {field: value for field, value in COMPLETE.items() if field != "physical"}
+    _use(monkeypatch, (
+        ("aladin_api", lambda isbn, use_cache=True: without_physical),
+        ("aladin_crawl", lambda isbn, use_cache=True: {}),
+        ("kpipa", _blocked),
+    ))
+    outcome = convert_isbn_hedged("9788936434120")
+    assert outcome["requeue"] is False
+    assert outcome["result"]["publisher"] == "창비"
+    assert outcome["300_warning"]
+
+
+def test_blocked_bnk_requeues_when_publisher_is_missing(monkeypatch):
+    without_publisher = {field: value for field, value in COMPLETE.items() if field != "publisher"}
+    _use(monkeypatch, (
+        ("aladin_api", lambda isbn, use_cache=True: without_publisher),
+        ("aladin_crawl", lambda isbn, use_cache=True: {}),
+        ("kpipa", _blocked),
+    ))
+    outcome = convert_isbn_hedged("9788936434120")
+    assert outcome["requeue"] is True
+    assert outcome["result"] is None
+
+
+def test_blocked_aladin_requeues_for_any_missing_field(monkeypatch):
+    _use(monkeypatch, (
+        ("aladin_api", lambda isbn, use_cache=True: {"title": "소년이 온다", "publisher": "창비"}),
+        ("aladin_crawl", _blocked),
+        ("kpipa", lambda isbn, use_cache=True: {}),
+    ))
+    assert convert_isbn_hedged("9788936434120")["requeue"] is True
@@ -0,0 +1,56 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import host_throttle  # noqa: E402
+from host_throttle import HostThrottle  # noqa: E402
+
+
+def open_then_expire(throttle):
+    throttle.on_block("캡차")
+    throttle.open_until = time.monotonic() - 0.01  # 멈춤 시간이 막 지난 상태
+
+
+def test_requests_wait_for_trial_then_pass():
+    throttle = HostThrottle("example.test", rate=100)
+    open_then_expire(throttle)
+    assert throttle.acquire() == 0  # 시험 요청
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(throttle.acquire()))
+    waiter.start()
+    time.sleep(0.1)
+    assert not results  # 거절하지 않고 시험 요청 결과를 기다림
+    throttle.on_success()
+    waiter.join(2)
+    assert results == [0]
+    assert throttle.stats()["rejected"] == 0
+
+
+def test_requests_rejected_when_trial_fails():
+    throttle = HostThrottle("example.test", rate=100)
+    open_then_expire(throttle)
+    assert throttle.acquire() == 0
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(throttle.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    throttle.on_block("캡차")
+    waiter.join(2)
+    assert results and results[0] > 0
+
+
+def test_wait_for_hosts_waits_for_trial_in_flight(monkeypatch):
+    throttle = HostThrottle("example.test", rate=100)
+    monkeypatch.setattr(host_throttle, "_throttles", {"example.test": throttle})
+    open_then_expire(throttle)
+    assert throttle.acquire() == 0
+
+    threading.Timer(0.3, throttle.on_success).start()
+    waited = host_throttle.wait_for_hosts(max_wait=5)
+    assert waited >= 0.25
+    assert throttle.settle_time() == 0.0
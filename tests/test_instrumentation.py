@@ -0,0 +1,19 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrumentation import percentile  # noqa: E402
+
+
+def test_percentile_nearest_rank():
+    assert percentile(range(20), 95) == 18
+    assert percentile(range(20), 50) == 9
+    assert percentile([1, 2], 50) == 1
+    assert percentile(range(100), 7) == 6
+    assert percentile([5, 1, 3], 100) == 5
+    assert percentile([5, 1, 3], 0) == 1
+
+
+def test_percentile_empty():
+    assert percentile([], 95) == 0.0
@@ -0,0 +1,97 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import job_store  # noqa: E402
+from job_store import JobStore  # noqa: E402
+
+ISBNS = ["9788936434120", "9788937460449", "9788954682152"]
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _stores(tmp_path, monkeypatch, timeout=60):
+    clock = Clock()
+    monkeypatch.setattr(job_store.time, "time", clock)
+    path = str(tmp_path / "jobs.sqlite3")
+    # 같은 파일을 연 두 작업 프로세스
+    return clock, JobStore(path, claim_timeout=timeout), JobStore(path, claim_timeout=timeout)
+
+
+def test_stale_running_item_is_reclaimed_after_timeout(tmp_path, monkeypatch):
+    clock, first, second = _stores(tmp_path, monkeypatch)
+    job_id = first.create_job(ISBNS)
+
+    assert first.claim(job_id, "worker-1", 1) == [(1, ISBNS[0])]
+    clock.now += 30
+    assert second.claim(job_id, "worker-2", 1) == [(2, ISBNS[1])]  # 아직 처리 중인 항목은 건너뜀
+
+    clock.now += 31  # worker-1이 가져간 지 61초: 죽은 것으로 봄
+    assert second.claim(job_id, "worker-2", 5) == [(1, ISBNS[0]), (3, ISBNS[2])]
+    assert second.counts(job_id)["running"] == 3
+
+    # 늦게 끝난 worker-1과 다시 가져간 worker-2가 겹쳐도 먼저 완료된 결과를 덮어쓰지 않음
+    second.complete(job_id, 1, {"245": "worker-2"})
+    first.fail(job_id, 1, "늦은 실패")
+    assert list(first.iter_items(job_id, "done")) == [(1, ISBNS[0], None, {"245": "worker-2"})]
+
+
+def test_failed_items_are_not_reclaimed(tmp_path, monkeypatch):
+    clock, store, _ = _stores(tmp_path, monkeypatch)
+    job_id = store.create_job(ISBNS[:2])
+
+    store.claim(job_id, "worker-1", 2)
+    store.fail(job_id, 1, "도서 정보를 찾을 수 없습니다.")
+    store.complete(job_id, 2, {"245": "ok"})
+
+    clock.now += 3600
+    assert store.claim(job_id, "worker-2", 5) == []
+    assert list(store.iter_items(job_id, "failed")) == [(1, ISBNS[0], "도서 정보를 찾을 수 없습니다.", None)]
+
+    assert store.retry_failed(job_id) == 1
+    assert store.claim(job_id, "worker-2", 5) == [(1, ISBNS[0])]
+
+
+def test_release_returns_only_own_items(tmp_path, monkeypatch):
+    _, store, _ = _stores(tmp_path, monkeypatch)
+    job_id = store.create_job(ISBNS)
+    store.claim(job_id, "worker-1", 1)
+    store.claim(job_id, "worker-2", 1)
+
+    store.release(job_id, "worker-1")
+    assert store.counts(job_id) == {"pending": 2, "running": 1, "done": 0, "failed": 0}
+    assert store.claim(job_id, "worker-3", 5) == [(1, ISBNS[0]), (3, ISBNS[2])]
+
+
+def test_completed_isbns_are_reused_across_jobs(tmp_path, monkeypatch):
+    clock, store, _ = _stores(tmp_path, monkeypatch)
+    first_job = store.create_job(ISBNS[:2])
+    store.claim(first_job, "worker-1", 2)
+    store.complete(first_job, 1, {"245": "첫 작업"})
+    store.fail(first_job, 2, "차단")
+
+    clock.now += 10
+    second_job = store.create_job([ISBNS[1], ISBNS[0], ISBNS[2]])
+    assert store.counts(second_job) == {"pending": 2, "running": 0, "done": 1, "failed": 0}
+    assert list(store.iter_items(second_job, "done")) == [(2, ISBNS[0], "이전 작업 결과 사용", {"245": "첫 작업"})]
+    assert store.claim(second_job, "worker-1", 5) == [(1, ISBNS[1]), (3, ISBNS[2])]
+
+
+def test_reuse_takes_latest_completed_result(tmp_path, monkeypatch):
+    clock, store, _ = _stores(tmp_path, monkeypatch)
+    # 같은 ISBN을 가진 두 작업이 함께 돌다가 차례로 완료
+    jobs = [store.create_job(ISBNS[:1]), store.create_job(ISBNS[:1])]
+    for job_id, title in zip(jobs, ("오래된 결과", "최신 결과")):
+        store.claim(job_id, "worker-1", 1)
+        clock.now += 10
+        store.complete(job_id, 1, {"245": title})
+
+    job_id = store.create_job(ISBNS[:1])
+    assert list(store.iter_items(job_id, "done"))[0][3] == {"245": "최신 결과"}
@@ -0,0 +1,125 @@
+import os
+import sys
+import xml.etree.ElementTree as ET
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from marc_record import (  # noqa: E402
+    FIELD_TERMINATOR, LEADER_LENGTH, RECORD_TERMINATOR, SUBFIELD_DELIMITER, Record, encode_iso2709, index_isbns,
+    iter_record_isbns, normalize_isbn
+)
+from marc_writers import MarcXmlWriter  # noqa: E402
+
+MARC_NS = "{http://www.loc.gov/MARC21/slim}"
+
+
+def _record(isbn, title="소년이 온다"):
+    record = Record()
+    record.add_control("008", "260101s2014    ggk           000 f kor  ")
+    record.add("020", "  ", [("a", isbn), ("g", "03810")])
+    record.add("245", "10", [("a", f"{title} /"), ("c", "한강 지음")])
+    record.add("260", "  ", [("a", "파주 :"), ("b", "창비,"), ("c", "2014")])
+    return record
+
+
+# 리더·디렉터리대로 다시 잘라 [(태그, 필드 bytes)] 로
+def _decode(data):
+    record_length = int(data[:5])
+    base_address = int(data[12:17])
+    directory = data[LEADER_LENGTH:base_address - 1]
+    fields = []
+    for i in range(0, len(directory), 12):
+        entry = directory[i:i + 12]
+        length, start = int(entry[3:7]), int(entry[7:12])
+        fields.append((entry[:3].decode("ascii"), data[base_address + start:base_address + start + length]))
+    return record_length, base_address, fields
+
+
+def _write_mrc(tmp_path, *chunks):
+    path = tmp_path / "records.mrc"
+    path.write_bytes(b"".join(chunks))
+    return str(path)
+
+
+def test_iso2709_round_trip_lengths():
+    record = _record("9788936434120")
+    data = encode_iso2709(record)
+    record_length, base_address, fields = _decode(data)
+
+    assert record_length == len(data)
+    assert data.endswith(RECORD_TERMINATOR)
+    assert data[base_address - 1:base_address] == FIELD_TERMINATOR
+    assert base_address == LEADER_LENGTH + 12 * len(record) + 1
+    assert data[5:12] == record.leader[5:12].encode("ascii")
+    assert data[17:24] == record.leader[17:24].encode("ascii")
+
+    assert [tag for tag, _ in fields] == ["008", "020", "245", "260"]
+    for (tag, body), field in zip(fields, record):
+        assert body.endswith(FIELD_TERMINATOR)
+        if field.is_control:
+            assert body[:-1].decode("utf-8") == field.data
+            continue
+        # 디렉터리 길이는 UTF-8 바이트 수 (한글이 글자 수와 다름)
+        indicators, *subfields = body[:-1].split(SUBFIELD_DELIMITER)
+        assert indicators.decode("ascii") == field.indicators
+        assert [(sub[:1].decode("ascii"), sub[1:].decode("utf-8")) for sub in subfields] == field.subfields
+
+
+def test_record_list_round_trip():
+    record = _record("9788936434120")
+    restored = Record.from_list(record.to_list(), leader=record.leader)
+    assert encode_iso2709(restored) == encode_iso2709(record)
+
+
+def test_index_reads_every_record(tmp_path):
+    path = _write_mrc(tmp_path, encode_iso2709(_record("9788936434120")), encode_iso2709(_record("9788937460449")))
+    assert list(iter_record_isbns(path)) == [["9788936434120"], ["9788937460449"]]
+
+
+def test_index_ignores_garbage_tail(tmp_path):
+    path = _write_mrc(
+        tmp_path,
+        encode_iso2709(_record("9788936434120")),
+        encode_iso2709(_record("9788937460449")),
+        b"\x00garbage after the last record 020 9791234567890",
+    )
+    assert index_isbns(path) == {"9788936434120", "9788937460449"}
+
+
+def test_index_recovers_from_broken_record_length(tmp_path):
+    broken = bytearray(encode_iso2709(_record("9788936434120")))
+    broken[:5] = b"99999"
+    path = _write_mrc(tmp_path, bytes(broken), encode_iso2709(_record("9788937460449")))
+    assert index_isbns(path) == {"9788936434120", "9788937460449"}
+
+
+def test_index_normalizes_isbn10(tmp_path):
+    path = _write_mrc(tmp_path, encode_iso2709(_record("89-364-3412-3 (set)")))
+    assert index_isbns(path) == {"9788936434120"}
+    assert normalize_isbn("8936434123") == "9788936434120"
+    assert normalize_isbn("979-11-6040-000-2") == "9791160400002"
+
+
+def test_empty_file(tmp_path):
+    assert index_isbns(_write_mrc(tmp_path)) == set()
+
+
+def test_marcxml_writer():
+    stream = StringIO()
+    writer = MarcXmlWriter(stream)
+    record = _record("9788936434120", title="A & B <특별판>")
+    writer.write("9788936434120", [], record)
+    writer.close()
+
+    root = ET.fromstring(stream.getvalue())
+    assert root.tag == f"{MARC_NS}collection"
+    (xml_record,) = root.findall(f"{MARC_NS}record")
+    assert xml_record.find(f"{MARC_NS}leader").text == record.leader
+    assert xml_record.find(f"{MARC_NS}controlfield").attrib == {"tag": "008"}
+
+    datafields = xml_record.findall(f"{MARC_NS}datafield")
+    assert [(f.get("tag"), f.get("ind1"), f.get("ind2")) for f in datafields] == [
+        ("020", " ", " "), ("245", "1", "0"), ("260", " ", " ")
+    ]
+    assert [(s.get("code"), s.text) for s in datafields[1]] == [("a", "A & B <특별판> /"), ("c", "한강 지음")]
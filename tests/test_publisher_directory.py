@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client  # noqa: E402
+import publisher_directory  # noqa: E402
+from publisher_directory import UnconfirmedEmptyResult, echoed_keyword, parse_directory_rows  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_parse_result_rows():
+    html = _fixture("bnk_directory_results.html")
+    assert parse_directory_rows(html, keyword="민음사") == [
+        ("민음사", "서울특별시", "출판사"),
+        ("(주) 민음인", "서울특별시", "출판사"),
+    ]
+
+
+def test_empty_result_confirmed_by_echoed_keyword():
+    html = _fixture("bnk_directory_empty.html")
+    assert echoed_keyword(html) == "없는출판사이름"
+    assert parse_directory_rows(html, keyword=" 없는출판사이름 ") == "검색 결과가 없습니다."
+
+
+def test_empty_result_for_other_keyword_is_unconfirmed():
+    html = _fixture("bnk_directory_empty.html")
+    with pytest.raises(UnconfirmedEmptyResult):
+        parse_directory_rows(html, keyword="민음사")
+
+
+def test_empty_result_without_keyword_echo_is_unconfirmed():
+    html = _fixture("bnk_directory_empty.html").replace(' value="없는출판사이름"', "")
+    with pytest.raises(UnconfirmedEmptyResult):
+        parse_directory_rows(html, keyword="없는출판사이름")
+
+
+def test_missing_result_table_raises():
+    with pytest.raises(http_client.FetchError):
+        parse_directory_rows("<html><body>점검 중입니다.</body></html>", keyword="민음사")
+
+
+def test_auto_mode_checks_unconfirmed_empty_with_browser(monkeypatch):
+    def unconfirmed(name):
+        raise UnconfirmedEmptyResult("검색어 없음")
+
+    monkeypatch.setattr(publisher_directory, "DIRECTORY_BACKEND", "auto")
+    monkeypatch.setattr(publisher_directory, "search_publisher_http", unconfirmed)
+    monkeypatch.setattr(publisher_directory, "search_publisher_selenium", lambda name: [(name, "서울특별시", "출판사")])
+    assert publisher_directory.search_publisher("민음사") == [("민음사", "서울특별시", "출판사")]
+
+    monkeypatch.setattr(publisher_directory, "DIRECTORY_BACKEND", "http")
+    assert publisher_directory.search_publisher("민음사").startswith("오류 발생")
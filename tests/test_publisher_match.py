@@ -0,0 +1,69 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sheet_db import AUTO_MATCH_THRESHOLD, UNKNOWN_LOCATION, PublisherIndex, normalize_publisher  # noqa: E402
+from trigram_index import TrigramIndex, trigrams  # noqa: E402
+
+SHEET = [
+    ("민음사", "서울"),
+    ("창비", "파주"),
+    ("문학과지성사", "서울"),
+    ("(주)한국교육방송공사", "고양"),
+    ("도서출판 열린책들", "파주"),
+]
+
+
+def _dice(a, b):
+    a, b = trigrams(a), trigrams(b)
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def _brute_force(names, query, k, threshold):
+    scored = [(_dice(query, name), idx) for idx, name in enumerate(names)]
+    scored = sorted((pair for pair in scored if pair[0] >= threshold), key=lambda pair: (-pair[0], pair[1]))
+    return [(names[idx], score) for score, idx in scored[:k]]
+
+
+def _index(rows=SHEET):
+    index = PublisherIndex()
+    index._by_normalized = {normalize_publisher(name): region for name, region in rows}
+    index._by_raw = {name: region for name, region in rows}
+    index._trigrams = TrigramIndex(index._by_normalized)
+    index._ensure_fresh = lambda: None
+    return index
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.5, AUTO_MATCH_THRESHOLD, 0.9])
+def test_prefix_filtered_search_matches_brute_force(threshold):
+    rng = random.Random(15)
+    alphabet = "민음사창비문학지성열린책들교육"
+    names = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))) for _ in range(400)]
+    index = TrigramIndex(names)
+
+    queries = names[:50] + ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))) for _ in range(100)]
+    for query in queries:
+        assert index.search(query, k=10, threshold=threshold) == _brute_force(names, query, 10, threshold), query
+
+
+def test_exact_match_after_normalization():
+    index = _index()
+    assert index.match("열린책들") == ("파주", "열린책들", 1.0)
+    assert index.match("  민음사 (주) ") == ("서울", "민음사", 1.0)
+
+
+def test_close_variant_is_auto_matched():
+    location, matched, score = _index().match("한국교육방송공")
+    assert (location, matched) == ("고양", "한국교육방송공사")
+    assert score >= AUTO_MATCH_THRESHOLD
+
+
+@pytest.mark.parametrize("query, sibling", [("민음인", "민음사"), ("창비교육", "창비"), ("문학과지성", "문학과지성사")])
+def test_sibling_imprints_are_only_suggested(query, sibling):
+    index = _index()
+    assert index.match(query) == (UNKNOWN_LOCATION, None, 0.0)
+    assert sibling in [name for name, _, _ in index.search(query, k=3)]
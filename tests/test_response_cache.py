@@ -0,0 +1,40 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import response_cache  # noqa: E402
+from response_cache import DAY, ResponseCache  # noqa: E402
+
+
+def _cache():
+    cache = ResponseCache(":memory:")
+    cache.enabled = True
+    return cache
+
+
+def _age(monkeypatch, seconds):
+    now = response_cache.time.time()
+    monkeypatch.setattr(response_cache.time, "time", lambda: now + seconds)
+
+
+def test_publisher_region_negative_expires_within_hours(monkeypatch):
+    cache = _cache()
+    cache.put("publisher_region", "없는출판사", None)
+    cache.put("publisher_region", "민음사", "서울")
+    assert cache.get("publisher_region", "없는출판사") == (True, None)
+
+    _age(monkeypatch, 3 * 60 * 60)
+    assert cache.get("publisher_region", "없는출판사") == (False, None)
+    assert cache.get("publisher_region", "민음사") == (True, "서울")
+
+
+def test_other_sources_keep_default_negative_ttl(monkeypatch):
+    cache = _cache()
+    cache.put("kpipa_search", "9788937460449", None)
+
+    _age(monkeypatch, 3 * 60 * 60)
+    assert cache.get("kpipa_search", "9788937460449") == (True, None)
+
+    _age(monkeypatch, DAY + 1)
+    assert cache.get("kpipa_search", "9788937460449") == (False, None)
@@ -0,0 +1,41 @@
+import os
+
+import streamlit as st
+
+from instrumentation import summarize, traces_to_csv, traces_to_json
+
+# 변환기 화면 공용: 조용한 모드 설정, 단계별 소요 시간 요약 패널 + 기록 내보내기
+
+QUIET_DEFAULT = os.environ.get("KOMARC_QUIET", "off").lower() in ("on", "1", "true")
+
+
+# 🔹 사이드바 "조용한 모드" (켜면 ISBN별 디버그·안내 메시지를 출력하지 않음)
+def quiet_mode_toggle():
+    return st.sidebar.checkbox("🤫 조용한 모드 (ISBN별 디버그 메시지 숨김)", value=QUIET_DEFAULT)
+
+
+# 🔹 단계별 p50/p95 요약 + JSON/CSV 내려받기
+def render_trace_summary(traces):
+    if not traces:
+        return
+
+    with st.expander(f"⏱️ 단계별 소요 시간 ({len(traces)}건)"):
+        st.table([
+            {
+                "단계": row["stage"],
+                "ISBN 수": row["isbns"],
+                "p50 (ms)": row["p50_ms"],
+                "p95 (ms)": row["p95_ms"],
+                "HTTP 요청": row["requests"],
+                "수신 KB": round(row["bytes"] / 1024, 1),
+            }
+            for row in summarize(traces)
+        ])
+        hits = sum(trace["cache"]["hit"] for trace in traces)
+        misses = sum(trace["cache"]["miss"] for trace in traces)
+        if hits + misses:
+            st.caption(f"응답 캐시 적중 {hits}건 / 누락 {misses}건 ({hits / (hits + misses):.0%})")
+
+        col_json, col_csv = st.columns(2)
+        col_json.download_button("📥 기록 JSON", traces_to_json(traces), file_name="kormarc_trace.json", mime="application/json")
+        col_csv.download_button("📥 기록 CSV", traces_to_csv(traces), file_name="kormarc_trace.csv", mime="text/csv")
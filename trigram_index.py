@@ -0,0 +1,54 @@
+import math
+
+# 문자 3-gram 색인 (출판사명 유사 검색용)
+# - 이름마다 앞뒤를 공백으로 채운 뒤 3글자씩 잘라 역색인(3-gram → 이름 번호) 구성
+# - 점수는 Dice 계수 2·|공통| / (|질의| + |이름|)
+# - 후보는 질의의 3-gram 중 드문 것들의 역색인에서만 모음 (prefix filtering)
+#   점수가 threshold 이상이려면 공통 3-gram이 최소 m개 필요 → 가장 흔한 (m-1)개는 후보 수집에서 빼도 누락 없음
+# - 한 번 만든 색인은 읽기 전용 → 여러 스레드에서 잠금 없이 조회
+
+DEFAULT_THRESHOLD = 0.5  # 후보 검색용 (지역으로 바로 쓰는 기준은 sheet_db.AUTO_MATCH_THRESHOLD)
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self, names):
+        self.names = list(names)
+        self._grams = []
+        postings = {}
+        for idx, name in enumerate(self.names):
+            grams = frozenset(trigrams(name))
+            self._grams.append(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(idx)
+        self._postings = postings
+
+    # 🔹 질의와 비슷한 이름 상위 k개 → [(이름, 점수), ...] (점수 0~1, threshold 미만은 제외)
+    def search(self, query, k=5, threshold=DEFAULT_THRESHOLD):
+        grams = trigrams(query)
+        if not grams:
+            return []
+
+        query_size = len(grams)
+        # 공통 m개일 때 최대 점수는 2m / (|질의| + m) → threshold 이상이 되는 최소 m
+        min_shared = max(1, math.ceil(threshold * query_size / (2 - threshold)))
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        candidates = set()
+        for ids in postings[:max(1, query_size - min_shared + 1)]:
+            candidates.update(ids)
+
+        scored = []
+        for idx in candidates:
+            name_grams = self._grams[idx]
+            score = 2 * len(grams & name_grams) / (query_size + len(name_grams))
+            if score >= threshold:
+                scored.append((score, idx))
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))  # 같은 점수면 시트 위쪽 행 우선
+        return [(self.names[idx], score) for score, idx in scored[:k]]
+
+    def __len__(self):
+        return len(self.names)
@@ -1,85 +1,49 @@
-import requests
-from bs4 import BeautifulSoup
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import streamlit as st
-import copy
+from batch_runner import DEFAULT_CONCURRENCY
+from kpipa import bulk_fill_publishers, update_sheet_with_publisher
+from response_cache import get_response_cache
+from session_results import cache_bypass_toggle
 
-# ✅ Google Sheets 연결 함수
-def connect_to_sheet():
-    json_key = copy.deepcopy(st.secrets["gspread"])
-    json_key["private_key"] = json_key["private_key"].replace('\\n', '\n')
-    
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(json_key, scope)
-    client = gspread.authorize(creds)
-    sheet = client.open("출판사 DB").worksheet("시트3")
-    return sheet
-
-# 🔍 BNK 검색 결과 → 출판사/인프린트 정보 추출
-def get_publisher_from_kpipa(isbn):
-    search_url = "https://bnk.kpipa.or.kr/front/search/bookSearchListAjax.do"
-    detail_url_base = "https://bnk.kpipa.or.kr/front/search/bookDetailView.do?book_seq="
-
-    headers = {
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Referer": "https://bnk.kpipa.or.kr/html/searchList.php",
-        "User-Agent": "Mozilla/5.0"
-    }
-
-    data = {
-        "searchKeyword": isbn,
-        "searchType": "isbn",
-        "page": "1"
-    }
-
-    response = requests.post(search_url, headers=headers, data=data)
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    first_result = soup.select_one("li.book_list > a")
-    if not first_result:
-        return "검색 결과 없음"
-
-    href = first_result["href"]
-    # href = "/front/search/bookDetailView.do?book_seq=123456"
-    if "book_seq=" not in href:
-        return "상세페이지 링크 없음"
-
-    book_seq = href.split("book_seq=")[-1]
-    detail_url = detail_url_base + book_seq
-
-    # 상세 페이지 접근
-    detail_response = requests.get(detail_url)
-    detail_soup = BeautifulSoup(detail_response.text, "html.parser")
-
-    th = detail_soup.find("th", string="출판사/인프린트")
-    if not th:
-        return "출판사 정보 없음"
-
-    publisher = th.find_next_sibling("td").get_text(strip=True)
-    return publisher
-
-# 📝 Google Sheet 업데이트 (C열: 출판사명)
-def update_sheet_with_publisher(isbn):
-    sheet = connect_to_sheet()
-    isbn_list = sheet.col_values(1)  # A열: ISBN 리스트
-
-    for idx, val in enumerate(isbn_list[1:], start=2):  # 첫 행 제외
-        if val == isbn:
-            publisher = get_publisher_from_kpipa(isbn)
-            sheet.update_cell(idx, 3, publisher)  # C열 = 3번째 열
-            return f"✅ ISBN {isbn} → 출판사명: {publisher}"
-    return f"❌ ISBN {isbn} 이(가) 시트에서 발견되지 않음"
-# 
-import streamlit as st
+# (BNK 조회·시트 반영 로직은 kpipa.py)
 
 st.title("📚 ISBN으로 출판사명 추출 (BNK + Google Sheets)")
 
+cache = get_response_cache()
+use_cache = cache_bypass_toggle()
+if st.sidebar.button("🧹 응답 캐시 비우기"):
+    cache.clear()
+    st.sidebar.success("응답 캐시를 비웠습니다.")
+
 isbn_input = st.text_input("ISBN 입력")
 
 if st.button("출판사명 추출 및 시트 반영"):
     if isbn_input:
-        result = update_sheet_with_publisher(isbn_input.strip())
+        result = update_sheet_with_publisher(isbn_input.strip(), use_cache)
         st.success(result)
     else:
         st.warning("ISBN을 입력해주세요.")
+
+st.divider()
+st.subheader("📦 시트3 일괄 채우기")
+st.caption("C열(출판사명)이 비어 있는 행을 모두 조회해 한 번에 반영합니다. 중간에 멈추면 다시 실행할 때 남은 행부터 이어서 진행합니다.")
+
+concurrency = st.number_input("동시 조회 수", min_value=1, max_value=16, value=DEFAULT_CONCURRENCY)
+
+if st.button("빈 행 일괄 채우기"):
+    progress_bar = st.progress(0.0)
+    status = st.empty()
+
+    def report(done, summary):
+        total = summary["total"] or 1
+        progress_bar.progress(min(done / total, 1.0))
+        status.text(f"{done}/{summary['total']}건 조회 · 시트 반영 {summary['written']}건 · 보류 {summary['skipped']}건")
+
+    try:
+        summary = bulk_fill_publishers(int(concurrency), progress=report, use_cache=use_cache)
+    except Exception as e:
+        st.error(f"❌ 일괄 반영 중단: {e} (다시 실행하면 남은 행부터 이어서 진행)")
+    else:
+        if summary["total"] == 0:
+            st.info("C열이 비어 있는 행이 없습니다.")
+        else:
+            st.success(f"✅ {summary['written']}건 반영 완료 (조회 오류로 보류 {summary['skipped']}건)")